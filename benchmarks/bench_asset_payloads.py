@@ -0,0 +1,99 @@
+"""
+/all-assets and /all-dependencies payloads: the column-level get_grouped_assets() and
+get_all_dependencies() against the previous row-by-row versions (kept here as reference),
+checking that both produce the same output.
+
+    python benchmarks/bench_asset_payloads.py [rows]
+"""
+import argparse
+import os
+import sys
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from benchmarks.synthetic_cmdb import generate_frame
+from data_extractor import get_all_dependencies, get_grouped_assets
+
+
+def grouped_assets_rows(data: pd.DataFrame) -> dict:
+    """get_grouped_assets() as it was, one iterrows() pass plus a dict of per-row entries."""
+    all_entries = []
+    for _, row in data.iterrows():
+        ci_type = row['CI_Type'] if pd.notna(row['CI_Type']) else 'Unknown'
+        all_entries.append({'name': row['CI_Name'], 'type': ci_type})
+        dep_type = row['Dependency_Type'] if pd.notna(row['Dependency_Type']) else 'Unknown'
+        all_entries.append({'name': row['Dependency_Name'], 'type': dep_type})
+
+    asset_to_type = {}
+    for item in all_entries:
+        name, typ = item['name'], item['type']
+        if name not in asset_to_type:
+            asset_to_type[name] = typ
+        elif asset_to_type[name] == 'Unknown' and typ != 'Unknown':
+            asset_to_type[name] = typ
+
+    grouped = defaultdict(list)
+    for name, typ in asset_to_type.items():
+        grouped[typ].append(name)
+    for typ in grouped:
+        grouped[typ].sort()
+    return dict(grouped)
+
+
+def all_dependencies_rows(data: pd.DataFrame) -> list:
+    """get_all_dependencies() as it was, a Python loop over the rows."""
+    dep_types = data['Dependency_Type'].astype(str).str.strip()
+    dep_descrips = data['Dependency_Descrip'].fillna('').astype(str).str.strip()
+    seen_names = set()
+    results = []
+    for dep_name, dep_type, dep_descrip in zip(data['Dependency_Name'], dep_types, dep_descrips):
+        name_lower = dep_name.lower()
+        if name_lower in seen_names:
+            continue
+        seen_names.add(name_lower)
+        results.append({"Dependency_Type": dep_type, "Dependency_Name": dep_name, "Dependency_Descrip": dep_descrip})
+    return results
+
+
+def with_gaps(data: pd.DataFrame, seed: int = 0) -> pd.DataFrame:
+    """Blank out some types/descriptions and upper-case some names, like a hand-edited workbook."""
+    rng = np.random.default_rng(seed)
+    data = data.copy()
+    for column in ('CI_Type', 'Dependency_Type', 'Dependency_Descrip'):
+        data.loc[rng.random(len(data)) < 0.05, column] = np.nan
+    shouted = rng.random(len(data)) < 0.05
+    data.loc[shouted, 'Dependency_Name'] = data.loc[shouted, 'Dependency_Name'].str.upper()
+    return data
+
+
+def timed(fn, data, repeat: int) -> tuple:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(data=data) if fn in (get_grouped_assets, get_all_dependencies) else fn(data)
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000, result
+
+
+def main(rows: int):
+    data = with_gaps(generate_frame(rows=rows, skew=1.0))
+    print(f"rows: {rows:,}")
+    for label, before, after, repeat in (
+        ("get_grouped_assets", grouped_assets_rows, get_grouped_assets, 1),
+        ("get_all_dependencies", all_dependencies_rows, get_all_dependencies, 3),
+    ):
+        before_ms, expected = timed(before, data, repeat)
+        after_ms, result = timed(after, data, repeat)
+        same = result == expected and list(result) == list(expected)
+        print(f"{label:<22} rows: {before_ms:>9,.1f} ms   columns: {after_ms:>8,.1f} ms   "
+              f"x{before_ms / after_ms:,.0f}   same output: {same}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("rows", nargs="?", type=int, default=100_000)
+    main(parser.parse_args().rows)
@@ -0,0 +1,159 @@
+"""
+Latency, peak memory and result size of build_hierarchy() and the asset payloads
+on a synthetic CMDB (or on a given workbook).
+
+    python benchmarks/bench_hierarchy.py [--rows N] [--types T] [--skew S] [--fan-out F]
+                                         [--depths 2 3 4] [--repeat R] [--workbook path.xlsx]
+                                         [--json results.json]
+
+Scenarios are (activeNode, depth) pairs for a hub, a median and a leaf CI (by degree)
+and for the most and least populated types. Each is run 'repeat' times against the same
+prebuilt GraphIndex, like requests against a loaded snapshot; peak memory comes from a
+separate traced run. --json writes the results so runs can be compared over time.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from benchmarks.synthetic_cmdb import generate_frame
+from data_extractor import build_hierarchy, get_all_dependencies, get_grouped_assets
+from graph_index import GraphIndex
+from graph_store import read_workbook
+
+
+def percentile(samples: list, q: float) -> float:
+    """Nearest-rank percentile of 'samples' (q in 0..100)."""
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, round(q / 100 * len(ordered) + 0.5) - 1))
+    return ordered[rank]
+
+
+def measure(fn, repeat: int) -> dict:
+    """Time 'repeat' calls of fn(), then trace one more for peak memory."""
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - started) * 1000)
+
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "p50_ms": percentile(timings, 50),
+        "p90_ms": percentile(timings, 90),
+        "p99_ms": percentile(timings, 99),
+        "max_ms": max(timings),
+        "mean_ms": statistics.fmean(timings),
+        "peak_mib": peak / 2**20,
+        "result": result,
+    }
+
+
+def pick_scenario_nodes(data: pd.DataFrame) -> list:
+    """[(label, node name, is_type)] for a hub, median and leaf CI and the largest/smallest type."""
+    degree = pd.concat([data['CI_Name'], data['Dependency_Name']]).value_counts()
+    types = pd.concat([data['CI_Type'], data['Dependency_Type']]).dropna().value_counts()
+    # Type names that are also CI names are expanded as CIs, so they are not type scenarios
+    types = types[~types.index.isin(degree.index)]
+
+    nodes = [
+        ("hub CI", degree.index[0], False),
+        ("median CI", degree.index[len(degree) // 2], False),
+        ("leaf CI", degree.index[-1], False),
+    ]
+    if len(types):
+        nodes.append(("largest type", types.index[0], True))
+        nodes.append(("smallest type", types.index[-1], True))
+    return nodes
+
+
+def run(data: pd.DataFrame, depths: list, repeat: int) -> dict:
+    started = time.perf_counter()
+    index = GraphIndex(data)
+    index_ms = (time.perf_counter() - started) * 1000
+
+    scenarios = []
+    for label, node, is_type in pick_scenario_nodes(data):
+        for depth in depths:
+            stats = measure(lambda: build_hierarchy(data, depth, node, index), repeat)
+            hierarchy = stats.pop("result")
+            scenarios.append({
+                "scenario": label, "activeNode": node, "typeNode": is_type, "depth": depth,
+                "nodes": hierarchy.get("totalNodesDisplayed", 0), **stats,
+            })
+
+    payloads = []
+    for name, fn in (("get_grouped_assets", lambda: get_grouped_assets(data=data)),
+                     ("get_all_dependencies", lambda: get_all_dependencies(data=data))):
+        stats = measure(fn, max(1, repeat // 5))
+        result = stats.pop("result")
+        items = sum(len(v) for v in result.values()) if isinstance(result, dict) else len(result)
+        payloads.append({"function": name, "items": items, **stats})
+
+    return {"rows": len(data), "index_build_ms": index_ms, "scenarios": scenarios, "payloads": payloads}
+
+
+def print_report(results: dict):
+    print(f"rows: {results['rows']:,}   index build: {results['index_build_ms']:,.1f} ms")
+    print()
+    print(f"{'scenario':<14} {'depth':>5} {'nodes':>9} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'peak MiB':>9}  activeNode")
+    for s in results["scenarios"]:
+        print(f"{s['scenario']:<14} {s['depth']:>5} {s['nodes']:>9,} {s['p50_ms']:>9.2f} {s['p90_ms']:>9.2f} "
+              f"{s['p99_ms']:>9.2f} {s['peak_mib']:>9.2f}  {s['activeNode']}")
+    print()
+    print(f"{'payload':<22} {'items':>9} {'p50 ms':>9} {'p90 ms':>9} {'peak MiB':>9}")
+    for p in results["payloads"]:
+        print(f"{p['function']:<22} {p['items']:>9,} {p['p50_ms']:>9.2f} {p['p90_ms']:>9.2f} {p['peak_mib']:>9.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--types", type=int, default=8)
+    parser.add_argument("--nodes", type=int, default=None)
+    parser.add_argument("--skew", type=float, default=1.0)
+    parser.add_argument("--fan-out", type=float, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--depths", type=int, nargs="+", default=[2, 3, 4])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--workbook", help="benchmark this workbook instead of a generated frame")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    if args.workbook:
+        data = read_workbook(args.workbook)
+        source = {"workbook": args.workbook}
+    else:
+        data = generate_frame(rows=args.rows, types=args.types, nodes=args.nodes, seed=args.seed,
+                              skew=args.skew, fan_out=args.fan_out)
+        source = {"rows": args.rows, "types": args.types, "nodes": args.nodes, "seed": args.seed,
+                  "skew": args.skew, "fan_out": args.fan_out}
+
+    results = run(data, args.depths, args.repeat)
+    print_report(results)
+
+    if args.json:
+        results["source"] = source
+        results["python"] = platform.python_version()
+        results["pandas"] = pd.__version__
+        results["timestamp"] = time.strftime("%Y-%m-%dT%H:%M:%S%z")
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2, default=str)
+
+
+if __name__ == "__main__":
+    main()
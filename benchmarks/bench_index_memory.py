@@ -0,0 +1,153 @@
+"""
+Memory used by GraphIndex (the per-worker graph structures) for a synthetic CMDB,
+against the dict-of-tuples index it replaced (kept here as reference).
+
+    python benchmarks/bench_index_memory.py [rows]
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from benchmarks.synthetic_cmdb import generate_frame
+from graph_index import GraphIndex
+
+NO_DESCRIPTION = "No description available."
+
+
+def _grouped(buckets: dict) -> dict:
+    result = {}
+    for name, by_type in buckets.items():
+        result[name] = [
+            (group_type, members[0][2], members)
+            for group_type, members in sorted(by_type.items())
+        ]
+    return result
+
+
+class DictGraphIndex:
+    """
+    GraphIndex as it was before node names were interned: adjacency lists keyed by name,
+    with a (name, description, relationship) tuple per member and a dict entry per node
+    for its type and attributes. Only the build is kept, which is all this benchmark measures.
+    """
+
+    def __init__(self, data: pd.DataFrame):
+        ci_names = data['CI_Name'].tolist()
+        ci_types = data['CI_Type'].tolist()
+        ci_descs = data['CI_Descrip'].tolist()
+        rel_types = data['Rel_Type'].tolist()
+        dep_types = data['Dependency_Type'].tolist()
+        dep_names = data['Dependency_Name'].tolist()
+        dep_descs = data['Dependency_Descrip'].tolist()
+
+        self.all_types = set(
+            data['CI_Type'].dropna().unique().tolist() +
+            data['Dependency_Type'].dropna().unique().tolist()
+        )
+
+        self.dependency_to_cis = defaultdict(list)
+
+        parents_by_type = defaultdict(lambda: defaultdict(list))
+        children_by_type = defaultdict(lambda: defaultdict(list))
+        type_parents_by_type = defaultdict(lambda: defaultdict(list))
+        ci_side_members = defaultdict(list)
+        dep_side_members = defaultdict(list)
+
+        rows = zip(ci_names, ci_types, ci_descs, rel_types, dep_types, dep_names, dep_descs)
+        for ci_name, ci_type, ci_desc, rel, dep_type, dep_name, dep_desc in rows:
+            rel = rel or None
+            ci_type_known = pd.notna(ci_type)
+            dep_type_known = pd.notna(dep_type)
+            ci_group = ci_type if ci_type_known else "Unknown"
+            dep_group = dep_type if dep_type_known else "Unknown"
+            ci_member = (ci_name, ci_desc if pd.notna(ci_desc) else NO_DESCRIPTION, rel)
+            dep_member = (dep_name, dep_desc if pd.notna(dep_desc) else NO_DESCRIPTION, rel)
+
+            self.dependency_to_cis[dep_name].append(ci_name)
+            parents_by_type[dep_name][ci_group].append(ci_member)
+            children_by_type[ci_name][dep_group].append(dep_member)
+
+            if ci_type_known:
+                ci_side_members[ci_type].append((ci_name, ci_desc, rel))
+            if dep_type_known:
+                type_parents_by_type[dep_type][ci_group].append(ci_member)
+                if ci_type_known and ci_type == dep_type:
+                    dep_side_members[dep_type].append((ci_name, ci_desc, rel))
+                else:
+                    dep_side_members[dep_type].append((dep_name, dep_desc, rel))
+
+        self.dependency_to_cis = dict(self.dependency_to_cis)
+        self.parent_groups = _grouped(parents_by_type)
+        self.child_groups = _grouped(children_by_type)
+        self.type_parent_groups = _grouped(type_parents_by_type)
+        self.type_members = {
+            type_name: ci_side_members.get(type_name, []) + dep_side_members.get(type_name, [])
+            for type_name in set(ci_side_members) | set(dep_side_members)
+        }
+
+        ci_first = data.drop_duplicates('CI_Name')
+        dep_first = data.drop_duplicates('Dependency_Name')
+
+        ci_type_by_name = pd.Series(ci_first['CI_Type'].tolist(), index=ci_first['CI_Name'].tolist(), dtype=object)
+        dep_type_by_name = pd.Series(dep_first['Dependency_Type'].tolist(), index=dep_first['Dependency_Name'].tolist(), dtype=object)
+        resolved = ci_type_by_name.combine_first(dep_type_by_name)
+        names = resolved.index.to_series()
+        fallback = names.where(names.isin(self.all_types), "Unknown")
+        self.node_types = resolved.where(resolved.isna(), resolved.astype(str)).fillna(fallback).to_dict()
+
+        self.node_attributes = {}
+        sides = (
+            (dep_first, 'Dependency_Name', 'Dependency_Type', 'Dependency_Descrip'),
+            (ci_first, 'CI_Name', 'CI_Type', 'CI_Descrip'),
+        )
+        for rows, name_col, type_col, desc_col in sides:
+            columns = zip(rows[name_col], rows[type_col], rows[desc_col], rows['Rel_Type'])
+            for name, n_type, n_desc, n_rel in columns:
+                self.node_attributes[name] = (
+                    n_type if pd.notna(n_type) else name,
+                    n_desc if pd.notna(n_desc) else NO_DESCRIPTION,
+                    n_rel or None,
+                )
+
+
+def measure(build, data: pd.DataFrame) -> tuple:
+    """(build time in seconds, bytes retained by the index, peak bytes while building)."""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    index = build(data)
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del index
+    return elapsed, retained, peak
+
+
+def main(rows: int):
+    data = generate_frame(rows=rows)
+    results = {
+        "dict index": measure(DictGraphIndex, data),
+        "GraphIndex": measure(GraphIndex, data),
+    }
+
+    print(f"rows: {rows:,}")
+    print(f"{'':<12} {'build ms':>10} {'retained MiB':>13} {'peak MiB':>10}")
+    for name, (elapsed, retained, peak) in results.items():
+        print(f"{name:<12} {elapsed * 1000:>10,.1f} {retained / 2**20:>13,.1f} {peak / 2**20:>10,.1f}")
+    reference, current = results["dict index"][1], results["GraphIndex"][1]
+    print(f"GraphIndex retains {current / reference:.1%} of the dict index's memory")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("rows", nargs="?", type=int, default=100_000)
+    main(parser.parse_args().rows)
@@ -0,0 +1,113 @@
+"""
+Memory and latency of the graph backends ("memory", "sqlite" and "shared", see graph_store.py)
+on a synthetic workbook: load time, memory held by one loaded snapshot, hierarchy
+latency around a hub and a median node, and the asset payloads.
+
+With --workers N (Linux only), N forked processes also each load the snapshot and build
+the hub's views, the way gunicorn workers do after a reload, and the private memory
+(pages not shared with any other process) each of them ends up with is reported.
+Pages the backends map from their files are shared, so they do not count.
+
+    python benchmarks/bench_storage_backends.py [rows] [--repeat N] [--workers N]
+"""
+import argparse
+import gc
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic_cmdb import write_workbook
+from data_extractor import build_hierarchy, get_all_dependencies, get_grouped_assets
+from graph_store import GRAPH_BACKENDS, GraphStore
+
+
+def _timed(fn, repeat: int) -> float:
+    """Median milliseconds of 'repeat' calls."""
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - started) * 1000)
+    return statistics.median(times)
+
+
+def _private_bytes() -> int:
+    """Private_Clean + Private_Dirty of this process, from /proc/self/smaps_rollup."""
+    total = 0
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            if line.startswith(("Private_Clean:", "Private_Dirty:")):
+                total += int(line.split()[1]) * 1024
+    return total
+
+
+def _worker(workbook: str, backend: str, hub, results):
+    before = _private_bytes()
+    snapshot = GraphStore(workbook, backend=backend).get()
+    for depth in (2, 3):
+        build_hierarchy(snapshot.data, depth, hub, snapshot.index)
+    results.put(_private_bytes() - before)
+
+
+def worker_memory(workbook: str, backend: str, hub, workers: int) -> float:
+    """Median private memory (MiB) that loading and traversing added to each of 'workers' forked processes."""
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    processes = [context.Process(target=_worker, args=(workbook, backend, hub, results)) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    added = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return statistics.median(added) / 2**20
+
+
+def run(workbook: str, backend: str, hub, median, repeat: int, workers: int):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    snapshot = GraphStore(workbook, backend=backend).get()
+    load_ms = (time.perf_counter() - started) * 1000
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{backend}:")
+    print(f"  load:              {load_ms:,.0f} ms")
+    print(f"  snapshot retained: {retained / 2**20:,.1f} MiB")
+    for label, node in (("hub", hub), ("median", median)):
+        for depth in (2, 3):
+            elapsed = _timed(lambda: build_hierarchy(snapshot.data, depth, node, snapshot.index), repeat)
+            print(f"  {label} depth {depth}:       {elapsed:,.1f} ms")
+    print(f"  /all-assets:       {_timed(lambda: get_grouped_assets(data=snapshot.data), repeat):,.1f} ms")
+    print(f"  /all-dependencies: {_timed(lambda: get_all_dependencies(data=snapshot.data), repeat):,.1f} ms")
+    if workers:
+        print(f"  private per worker: {worker_memory(workbook, backend, hub, workers):,.1f} MiB ({workers} workers)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("rows", nargs="?", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        workbook = os.path.join(directory, "cmdb.xlsx")
+        frame = write_workbook(workbook, rows=args.rows, skew=1.0)
+        degree = frame['CI_Name'].value_counts()
+        hub, median = degree.index[0], degree.index[len(degree) // 2]
+        del frame, degree
+        print(f"rows: {args.rows:,}")
+        for backend in GRAPH_BACKENDS:
+            run(workbook, backend, hub, median, args.repeat, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Seeded generator of CMDB-shaped frames for the benchmarks in this folder.
+The frames use the same columns as data/network_diagram.xlsx, and can be written
+out as workbooks so the whole load path (Excel parsing, snapshot, index) is exercised:
+
+    python benchmarks/synthetic_cmdb.py out.xlsx [--rows N] [--types T] [--skew S] [--fan-out F] [--seed X]
+"""
+import argparse
+import itertools
+import random
+import pandas as pd
+
+COLUMNS = ['CI_Type', 'CI_Name', 'CI_Descrip', 'Rel_Type', 'Dependency_Type', 'Dependency_Name', 'Dependency_Descrip']
+
+REL_TYPES = ["Depends On", "Runs On", "Owned By", "Uses", "Hosted In"]
+
+
+def _picker(rng: random.Random, count: int, skew: float):
+    """
+    Function returning a random id below 'count'. With skew > 0 ids follow a Zipf-like
+    law (id k drawn with weight 1 / (k + 1) ** skew), so low ids become hubs.
+    """
+    if not skew:
+        return lambda: rng.randrange(count)
+    cum_weights = list(itertools.accumulate(1 / (k + 1) ** skew for k in range(count)))
+    population = range(count)
+    return lambda: rng.choices(population, cum_weights=cum_weights)[0]
+
+
+def generate_frame(rows: int = 100_000, types: int = 8, nodes: int = None, seed: int = 0,
+                   skew: float = 0.0, fan_out: float = None, rel_types: int = 1) -> pd.DataFrame:
+    """
+    Build a frame of 'rows' edges between 'nodes' CIs (default: rows // 5) spread over 'types' types.
+    Every cell gets its own string object, like a parsed and stripped workbook.
+
+    skew:      > 0 makes dependencies concentrate on a few hub CIs (Zipf exponent, ~1 is strong)
+    fan_out:   mean dependencies per CI that has any; by default every CI may depend on others
+    rel_types: how many distinct Rel_Type values to use (from REL_TYPES)
+    """
+    rng = random.Random(seed)
+    nodes = nodes or max(rows // 5, 2)
+    type_names = [f"Type {t}" for t in range(types)]
+    node_types = [type_names[rng.randrange(types)] for _ in range(nodes)]
+    relationships = REL_TYPES[:max(1, min(rel_types, len(REL_TYPES)))]
+
+    # CIs with outgoing edges: all of them, or the first rows / fan_out
+    sources = nodes if not fan_out else max(1, min(nodes, round(rows / fan_out)))
+    pick_dependency = _picker(rng, nodes, skew)
+
+    records = []
+    for _ in range(rows):
+        ci, dep = rng.randrange(sources), pick_dependency()
+        relationship = relationships[0] if len(relationships) == 1 else rng.choice(relationships)
+        records.append((
+            node_types[ci], f"{node_types[ci]} CI {ci}", f"Description of CI {ci}",
+            relationship,
+            node_types[dep], f"{node_types[dep]} CI {dep}", f"Description of CI {dep}",
+        ))
+    return pd.DataFrame(records, columns=COLUMNS)
+
+
+def write_workbook(path: str, **options) -> pd.DataFrame:
+    """Generate a frame (see generate_frame for 'options') and save it as an .xlsx workbook."""
+    data = generate_frame(**options)
+    data.to_excel(path, index=False)
+    return data
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a synthetic CMDB workbook.")
+    parser.add_argument("path")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--types", type=int, default=8)
+    parser.add_argument("--nodes", type=int, default=None)
+    parser.add_argument("--skew", type=float, default=0.0)
+    parser.add_argument("--fan-out", type=float, default=None)
+    parser.add_argument("--rel-types", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    write_workbook(
+        args.path, rows=args.rows, types=args.types, nodes=args.nodes, seed=args.seed,
+        skew=args.skew, fan_out=args.fan_out, rel_types=args.rel_types,
+    )
+    print(f"Wrote {args.rows:,} rows to {args.path}")
@@ -1,551 +1,689 @@
-import os
-import pandas as pd
-from collections import deque
-import itertools
-from collections import defaultdict
-
-def fetch_graph_data(excel_file='data/network_diagram.xlsx') -> tuple:
-    try:
-        if not os.path.exists(excel_file):
-            raise FileNotFoundError(f"{excel_file} not found.")
-        
-        data = pd.read_excel(excel_file)
-        # Normalize 'CI_Name' and 'Dependency_Name' by stripping spaces
-        data['CI_Name'] = data['CI_Name'].astype(str).str.strip()
-        data['Dependency_Name'] = data['Dependency_Name'].astype(str).str.strip()
-        active_node = data.loc[0, 'CI_Name']
-        return data, active_node
-    except Exception as e:
-        print(f"An error occurred: {e}")
-        return None, None
-
-def build_hierarchy(data: pd.DataFrame, depth: int, active_node: str):
-    """
-    Build the hierarchy (as a nested dict) for the given active_node, up to 'depth' levels.
-    This version also attaches { "name": ..., "type": ... } objects for indirectRelationships,
-    ensuring that indirectly related nodes can be colored properly.
-    """
-
-    # ---------------------------------------
-    # 1) Preprocessing & normalizing
-    # ---------------------------------------
-    data['CI_Name'] = data['CI_Name'].astype(str).str.strip()
-    data['Dependency_Name'] = data['Dependency_Name'].astype(str).str.strip()
-    
-    # Precompute the mapping of Dependency_Name -> [list of CI_Names that depend on it]
-    dependency_to_cis = data.groupby('Dependency_Name')['CI_Name'].apply(list).to_dict()
-    
-    # Gather all known type names by combining CI_Type and Dependency_Type
-    all_types = set(
-        data['CI_Type'].dropna().unique().tolist() +
-        data['Dependency_Type'].dropna().unique().tolist()
-    )
-
-    # ---------------------------------------
-    # 2) Helper: get node type from name
-    # ---------------------------------------
-    def get_node_type(node_name: str) -> str:
-        """
-        Given node_name, return the best guess for its 'type' from the DataFrame, else 'Unknown'.
-        """
-        # 1) Check if it’s in CI_Name
-        row_ci = data[data['CI_Name'] == node_name]
-        if not row_ci.empty:
-            if pd.notna(row_ci.iloc[0]['CI_Type']):
-                return str(row_ci.iloc[0]['CI_Type'])
-        
-        # 2) Check if it’s in Dependency_Name
-        row_dep = data[data['Dependency_Name'] == node_name]
-        if not row_dep.empty:
-            if pd.notna(row_dep.iloc[0]['Dependency_Type']):
-                return str(row_dep.iloc[0]['Dependency_Type'])
-        
-        # 3) If node_name is literally a known “type” in the dataset
-        if node_name in all_types:
-            return node_name
-        
-        return "Unknown"
-
-    # ---------------------------------------
-    # 3) Helper: build list of { name, type } for indirectRelationships
-    # ---------------------------------------
-    def gather_indirect_relationships(node_name: str) -> list | None:
-        """
-        For a given node_name, if it has multiple parents in dependency_to_cis,
-        return a list of { 'name': X, 'type': Y } for each, or None if none found.
-        """
-        if node_name not in dependency_to_cis:
-            return None
-        
-        related_list = dependency_to_cis[node_name]
-        # If fewer than 2 references, we’re not marking it as “indirectRelationships”
-        if len(related_list) <= 1:
-            return None
-
-        # Build the array of { 'name', 'type' } for each indirectly related node
-        results = []
-        for related_name in related_list:
-            # Avoid listing ourselves
-            if related_name == node_name:
-                continue
-            i_type = get_node_type(related_name)
-            results.append({"name": related_name, "type": i_type})
-
-        return results if results else None
-
-    # ---------------------------------------
-    # 4) Identify if active_node is a type node or normal node
-    # ---------------------------------------
-    if active_node in data['CI_Name'].values:
-        row = data[data['CI_Name'] == active_node].iloc[0]
-        node_type = row['CI_Type'] if pd.notna(row['CI_Type']) else active_node
-        node_desc = row['CI_Descrip'] if pd.notna(row['CI_Descrip']) else "No description available."
-        node_rel  = row['Rel_Type'] or None
-        is_type_node = False
-
-    elif active_node in data['Dependency_Name'].values:
-        row = data[data['Dependency_Name'] == active_node].iloc[0]
-        node_type = row['Dependency_Type'] if pd.notna(row['Dependency_Type']) else active_node
-        node_desc = row['Dependency_Descrip'] if pd.notna(row['Dependency_Descrip']) else "No description available."
-        node_rel  = row['Rel_Type'] or None
-        is_type_node = False
-
-    elif active_node in all_types:
-        # If active_node is literally a known Type (like "Procurements", "People", etc.)
-        node_type = active_node
-        node_desc = f"{active_node}"
-        node_rel  = None
-        is_type_node = True
-
-    else:
-        return {"error": f"No data found for active node: {active_node}"}
-
-    # ---------------------------------------
-    # 5) Top-level node
-    # ---------------------------------------
-    if not is_type_node:
-        # If it’s not a type node, find who depends on it
-        parent_rows = data[data['Dependency_Name'] == active_node]
-        parent_names = parent_rows['CI_Name'].unique().tolist()
-    else:
-        parent_names = []
-
-    active_node_relationships = {
-        "name": active_node,
-        "type": node_type,
-        "relationship": node_rel,
-        "directRelationship": True,
-        "description": node_desc,
-        "parent": parent_names if parent_names else None,
-        "children": []
-    }
-
-    # Attach indirectRelationships (now as array of { name, type })
-    indirects = gather_indirect_relationships(active_node)
-    if indirects is not None:
-        active_node_relationships["indirectRelationships"] = indirects
-
-    # If user asked for depth=1, return just the single node
-    if depth == 1:
-        active_node_relationships["totalNodesDisplayed"] = 1
-        return active_node_relationships
-
-    visited = set([active_node])
-    total_count = 1
-
-    # Each queue item => (dict_for_node, node_name, current_depth, is_type_node_bool)
-    queue = deque([(active_node_relationships, active_node, depth, is_type_node)])
-
-    # ---------------------------------------
-    # 6) BFS through the relationships
-    # ---------------------------------------
-    while queue:
-        current_dict, current_name, current_depth, current_is_type_node = queue.popleft()
-        expand_further = (current_depth > 2)
-
-        if current_is_type_node:
-            # 6a) Handling “group” (type) nodes
-            #     This logic is your existing approach, just updated for gather_indirect_relationships
-            child_rows_ci = data[(data['CI_Type'] == current_name) & (data['CI_Name'] != current_name)]
-            child_rows_dep = data[(data['Dependency_Type'] == current_name) & (data['Dependency_Name'] != current_name)]
-
-            # If depth <= 2 => skip parents, gather children only
-            if current_depth >= 1:
-                child_rows_ci  = data[(data['CI_Type'] == current_name)]
-                child_rows_dep = data[(data['Dependency_Type'] == current_name)]
-                combined_children_rows = pd.concat([child_rows_ci, child_rows_dep], ignore_index=True)
-
-                if not combined_children_rows.empty:
-                    child_info = []
-                    for _, c_row in combined_children_rows.iterrows():
-                        # figure out which side the type is on
-                        if pd.notna(c_row['CI_Type']) and c_row['CI_Type'] == current_name:
-                            c_name = str(c_row['CI_Name'])
-                            c_type = str(c_row['CI_Type'])
-                            c_desc = str(c_row['CI_Descrip']) if pd.notna(c_row['CI_Descrip']) else "No description available."
-                            c_rel  = c_row['Rel_Type'] or None
-                        elif pd.notna(c_row['Dependency_Type']) and c_row['Dependency_Type'] == current_name:
-                            c_name = str(c_row['Dependency_Name'])
-                            c_type = str(c_row['Dependency_Type'])
-                            c_desc = str(c_row['Dependency_Descrip']) if pd.notna(c_row['Dependency_Descrip']) else "No description available."
-                            c_rel  = c_row['Rel_Type'] or None
-                        else:
-                            continue
-                        child_info.append({
-                            "groupType": c_type, 
-                            "name": c_name,
-                            "description": c_desc,
-                            "relationship": c_rel
-                        })
-
-                    if child_info:
-                        child_info.sort(key=lambda x: x["groupType"])
-                        for group_type, items_in_group in itertools.groupby(child_info, key=lambda x: x["groupType"]):
-                            group_type = group_type if group_type else "Unknown"
-                            items_in_group = list(items_in_group)
-                            relationship_val = items_in_group[0]["relationship"]
-
-                            new_group = {
-                                "groupType": group_type,
-                                "relationship": relationship_val,
-                                "children": []
-                            }
-                            for obj in items_in_group:
-                                c_name = obj["name"]
-                                if c_name not in visited:
-                                    visited.add(c_name)
-                                    c_desc = obj["description"]
-                                    c_rel  = obj["relationship"]
-                                    c_node_is_type = (c_name in all_types)
-
-                                    # Build the child node
-                                    c_node = {
-                                        "name": c_name,
-                                        "parent": current_dict["name"],
-                                        "type": group_type,
-                                        "relationship": c_rel,
-                                        "description": c_desc,
-                                        "children": []
-                                    }
-                                    # Attach indirect info
-                                    c_indirects = gather_indirect_relationships(c_name)
-                                    if c_indirects is not None:
-                                        c_node["indirectRelationships"] = c_indirects
-
-                                    new_group["children"].append(c_node)
-                                    total_count += 1
-                                    if expand_further:
-                                        queue.append((c_node, c_name, current_depth - 1, c_node_is_type))
-                            
-                            if new_group["children"]:
-                                current_dict["children"].append(new_group)
-
-            else:
-                # If current_depth > 2 => gather both parents & children
-                # (existing logic)
-                parent_rows = data[data['Dependency_Type'] == current_name]
-                if not parent_rows.empty:
-                    parents_by_type = parent_rows.groupby(parent_rows['CI_Type'].fillna("Unknown"))
-                    for p_type, p_group in parents_by_type:
-                        parent_group = {
-                            "groupType": p_type,
-                            "relationship": p_group.iloc[0]['Rel_Type'] or None,
-                            "children": []
-                        }
-                        for _, p_row in p_group.iterrows():
-                            p_name = p_row['CI_Name']
-                            if pd.notna(p_name):
-                                p_name = str(p_name)
-                                if p_name not in visited:
-                                    visited.add(p_name)
-                                    p_desc = p_row['CI_Descrip'] if pd.notna(p_row['CI_Descrip']) else "No description available."
-                                    p_rel  = p_row['Rel_Type'] or None
-                                    p_node_type = p_row['CI_Type'] if pd.notna(p_row['CI_Type']) else "Unknown"
-                                    is_parent_type_node = (p_name in all_types)
-
-                                    p_node = {
-                                        "name": p_name,
-                                        "parent": current_dict["name"],
-                                        "type": p_node_type,
-                                        "relationship": p_rel,
-                                        "description": p_desc,
-                                        "children": []
-                                    }
-                                    # Attach indirect info
-                                    p_indirects = gather_indirect_relationships(p_name)
-                                    if p_indirects is not None:
-                                        p_node["indirectRelationships"] = p_indirects
-
-                                    parent_group["children"].append(p_node)
-                                    total_count += 1
-
-                                    if expand_further:
-                                        queue.append((p_node, p_name, current_depth - 1, is_parent_type_node))
-                        
-                        if parent_group["children"]:
-                            current_dict["children"].append(parent_group)
-
-                child_rows_ci  = data[(data['CI_Type'] == current_name)]
-                child_rows_dep = data[(data['Dependency_Type'] == current_name)]
-                combined_children_rows = pd.concat([child_rows_ci, child_rows_dep], ignore_index=True)
-
-                if not combined_children_rows.empty:
-                    child_info = []
-                    for _, c_row in combined_children_rows.iterrows():
-                        if pd.notna(c_row['CI_Type']) and c_row['CI_Type'] == current_name:
-                            c_name = str(c_row['CI_Name'])
-                            c_type = str(c_row['CI_Type'])
-                            c_desc = c_row['CI_Descrip'] if pd.notna(c_row['CI_Descrip']) else "No description available."
-                            c_rel  = c_row['Rel_Type'] or None
-                        elif pd.notna(c_row['Dependency_Type']) and c_row['Dependency_Type'] == current_name:
-                            c_name = str(c_row['Dependency_Name'])
-                            c_type = str(c_row['Dependency_Type'])
-                            c_desc = c_row['Dependency_Descrip'] if pd.notna(c_row['Dependency_Descrip']) else "No description available."
-                            c_rel  = c_row['Rel_Type'] or None
-                        else:
-                            continue
-                        child_info.append({
-                            "groupType": c_type, 
-                            "name": c_name,
-                            "description": c_desc,
-                            "relationship": c_rel
-                        })
-
-                    if child_info:
-                        child_info.sort(key=lambda x: x["groupType"])
-                        for group_type, items_in_group in itertools.groupby(child_info, key=lambda x: x["groupType"]):
-                            group_type = group_type if group_type else "Unknown"
-                            items_in_group = list(items_in_group)
-                            relationship_val = items_in_group[0]["relationship"]
-
-                            new_group = {
-                                "groupType": group_type,
-                                "relationship": relationship_val,
-                                "children": []
-                            }
-                            for obj in items_in_group:
-                                c_name = obj["name"]
-                                if c_name not in visited:
-                                    visited.add(c_name)
-                                    c_desc = obj["description"]
-                                    c_rel  = obj["relationship"]
-                                    c_node_is_type = (c_name in all_types)
-
-                                    c_node = {
-                                        "name": c_name,
-                                        "parent": current_dict["name"],
-                                        "type": group_type,
-                                        "relationship": c_rel,
-                                        "description": c_desc,
-                                        "children": []
-                                    }
-                                    # Attach indirect info
-                                    c_indirects = gather_indirect_relationships(c_name)
-                                    if c_indirects is not None:
-                                        c_node["indirectRelationships"] = c_indirects
-
-                                    new_group["children"].append(c_node)
-                                    total_count += 1
-
-                                    if expand_further:
-                                        queue.append((c_node, c_name, current_depth - 1, c_node_is_type))
-                            
-                            if new_group["children"]:
-                                current_dict["children"].append(new_group)
-
-        else:
-            # 6b) Normal node BFS (non-type)
-            parent_data = data[data['Dependency_Name'] == current_name]
-            child_data  = data[data['CI_Name'] == current_name]
-
-            # --- Parents ---
-            if not parent_data.empty:
-                parents_by_type = parent_data.groupby(parent_data['CI_Type'].fillna("Unknown"))
-                for p_type, p_group in parents_by_type:
-                    parent_group = {
-                        "groupType": p_type,
-                        "relationship": p_group.iloc[0]['Rel_Type'] or None,
-                        "children": []
-                    }
-                    for _, p_row in p_group.iterrows():
-                        p_name = str(p_row['CI_Name'])
-                        if p_name not in visited:
-                            visited.add(p_name)
-                            p_desc = p_row['CI_Descrip'] if pd.notna(p_row['CI_Descrip']) else "No description available."
-                            p_rel  = p_row['Rel_Type'] or None
-                            p_node_is_type = (p_name in all_types)
-
-                            p_node = {
-                                "name": p_name,
-                                "parent": current_dict["name"],
-                                "type": p_type,
-                                "relationship": p_rel,
-                                "description": p_desc,
-                                "children": []
-                            }
-                            # Attach indirect info
-                            p_indirects = gather_indirect_relationships(p_name)
-                            if p_indirects is not None:
-                                p_node["indirectRelationships"] = p_indirects
-
-                            parent_group["children"].append(p_node)
-                            total_count += 1
-
-                            if expand_further:
-                                queue.append((p_node, p_name, current_depth - 1, p_node_is_type))
-                    
-                    if parent_group["children"]:
-                        current_dict["children"].append(parent_group)
-
-            # --- Children ---
-            if not child_data.empty:
-                children_by_type = child_data.groupby(child_data['Dependency_Type'].fillna("Unknown"))
-                for c_type, c_group in children_by_type:
-                    child_group = {
-                        "groupType": c_type,
-                        "relationship": c_group.iloc[0]['Rel_Type'] or None,
-                        "children": []
-                    }
-                    for _, c_row in c_group.iterrows():
-                        c_name = str(c_row['Dependency_Name'])
-                        if c_name not in visited:
-                            visited.add(c_name)
-                            c_desc = c_row['Dependency_Descrip'] if pd.notna(c_row['Dependency_Descrip']) else "No description available."
-                            c_rel  = c_row['Rel_Type'] or None
-                            c_node_is_type = (c_name in all_types)
-
-                            c_node = {
-                                "name": c_name,
-                                "parent": current_dict["name"],
-                                "type": c_type,
-                                "relationship": c_rel,
-                                "description": c_desc,
-                                "children": []
-                            }
-                            # Attach indirect info
-                            c_indirects = gather_indirect_relationships(c_name)
-                            if c_indirects is not None:
-                                c_node["indirectRelationships"] = c_indirects
-
-                            child_group["children"].append(c_node)
-                            total_count += 1
-
-                            if expand_further:
-                                queue.append((c_node, c_name, current_depth - 1, c_node_is_type))
-                    
-                    if child_group["children"]:
-                        current_dict["children"].append(child_group)
-
-    active_node_relationships["totalNodesDisplayed"] = total_count
-    return active_node_relationships
-
-def get_all_assets(excel_file='data/network_diagram.xlsx'):
-    """
-    Retrieves all unique assets from both 'CI_Name' and 'Dependency_Name' columns.
-    Think of this like merging two baskets (one for CI_Names and one for Dependency_Names)
-    and removing duplicates to get a complete list of unique assets.
-    """
-    data, _ = fetch_graph_data(excel_file)
-    if data is None:
-        return []
-
-    # Normalize the asset names (this ensures that any leading/trailing spaces are removed)
-    data['CI_Name'] = data['CI_Name'].astype(str).str.strip()
-    data['Dependency_Name'] = data['Dependency_Name'].astype(str).str.strip()
-    
-    # Extract assets from each column and use a set to remove duplicates
-    ci_assets = set(data['CI_Name'].tolist())
-    dependency_assets = set(data['Dependency_Name'].tolist())
-    
-    # Combine the two sets (like merging two lists and removing duplicate items)
-    all_assets_set = ci_assets.union(dependency_assets)
-    
-    # Convert back to a list (or keep as a set if order is not important)
-    return list(all_assets_set)
-
-# print(get_all_assets())
-
-def get_grouped_assets(excel_file='data/network_diagram.xlsx'):
-    """
-    Return a dict grouping asset names by their type. E.g.:
-    {
-        "Applications": ["IT Service Management System", "Help Desk ..."],
-        "Data": [...],
-        ...
-    }
-    """
-    data, _ = fetch_graph_data(excel_file)
-    if data is None:
-        return {}
-
-    # Ensure columns are strings, strip whitespace
-    data['CI_Name'] = data['CI_Name'].astype(str).str.strip()
-    data['Dependency_Name'] = data['Dependency_Name'].astype(str).str.strip()
-
-    # Build a unified list of { name, type } for both CI and Dependency
-    all_entries = []
-    for _, row in data.iterrows():
-        ci_name = row['CI_Name']
-        ci_type = row['CI_Type'] if pd.notna(row['CI_Type']) else 'Unknown'
-        all_entries.append({'name': ci_name, 'type': ci_type})
-
-        dep_name = row['Dependency_Name']
-        dep_type = row['Dependency_Type'] if pd.notna(row['Dependency_Type']) else 'Unknown'
-        all_entries.append({'name': dep_name, 'type': dep_type})
-
-    # Deduplicate by picking a single type for each asset name
-    # (If the same name appears under multiple types, we use whichever is not "Unknown")
-    asset_to_type = {}
-    for item in all_entries:
-        name = item['name']
-        typ  = item['type']
-        if name not in asset_to_type:
-            asset_to_type[name] = typ
-        else:
-            # If the stored type is 'Unknown' but new type is better, replace
-            if asset_to_type[name] == 'Unknown' and typ != 'Unknown':
-                asset_to_type[name] = typ
-
-    # Group assets by their final type
-    grouped = defaultdict(list)
-    for name, typ in asset_to_type.items():
-        grouped[typ].append(name)
-
-    # Sort the asset names in each group
-    for typ in grouped:
-        grouped[typ].sort()
-
-    return dict(grouped)
-
-def get_all_dependencies(excel_file='data/network_diagram.xlsx'):
-    """
-    Reads the Excel file and returns a distinct list of dependency objects.
-    Each object contains "Dependency_Type", "Dependency_Name", and "Dependency_Descrip".
-    Uniqueness is determined by Dependency_Name (case-insensitive).
-    """
-    data, _ = fetch_graph_data(excel_file)
-    if data is None:
-        return []
-
-    # Ensure columns are strings and remove extra whitespace
-    data['Dependency_Name'] = data['Dependency_Name'].astype(str).str.strip()
-    data['Dependency_Type'] = data['Dependency_Type'].astype(str).str.strip()
-    data['Dependency_Descrip'] = data['Dependency_Descrip'].fillna('').astype(str).str.strip()
-
-    seen_names = set()
-    results = []
-
-    for _, row in data.iterrows():
-        name_lower = row['Dependency_Name'].lower()
-        if name_lower in seen_names:
-            continue  # Skip this row because we've already processed this dependency
-        seen_names.add(name_lower)
-        results.append({
-            "Dependency_Type": row['Dependency_Type'],
-            "Dependency_Name": row['Dependency_Name'],
-            "Dependency_Descrip": row['Dependency_Descrip']
-        })
-
-    return results
-
-
+import numpy as np
+import pandas as pd
+from collections import deque
+from graph_index import GraphIndex
+from graph_store import DEFAULT_EXCEL_FILE, get_graph_store
+from hierarchy_filter import NO_FILTER, HierarchyFilter
+from pagination import decode_cursor, encode_cursor, encode_frontier_token
+from request_timing import count, stage
+
+def fetch_graph_snapshot(excel_file=DEFAULT_EXCEL_FILE):
+    """
+    Return the current GraphSnapshot (data, index, default active node, version),
+    or None if the workbook could not be loaded.
+    """
+    with stage("load"):
+        return get_graph_store(excel_file).get()
+
+def fetch_graph_data(excel_file=DEFAULT_EXCEL_FILE) -> tuple:
+    """
+    Return (data, default_active_node) from the shared in-memory graph store.
+    The workbook is only parsed on first use and whenever the file changes on disk.
+    The returned DataFrame is shared between requests, so callers must not modify it.
+    (With GRAPH_BACKEND=sqlite, data is the SqliteWorkbook instead, with GRAPH_BACKEND=shared the SharedGraph;
+    both answer the row queries below themselves, through asset_types() and dependency_rows().)
+    """
+    snapshot = fetch_graph_snapshot(excel_file)
+    if snapshot is None:
+        return None, None
+    return snapshot.data, snapshot.active_node
+
+def resolve_active_node(index: GraphIndex, active_node: str, indirect: bool = True) -> tuple | None:
+    """
+    Return (active_id, is_type_node, top_level_node_dict) for active_node, or None if it is
+    neither a CI/dependency name nor a known type. The dict's "children" list starts empty.
+    indirect=False leaves out its indirectRelationships.
+    """
+    # ---------------------------------------
+    # Identify if active_node is a type node or normal node
+    # ---------------------------------------
+    node_attributes = index.node_attributes_of(active_node)
+    if node_attributes is not None:
+        node_type, node_desc, node_rel = node_attributes
+        is_type_node = False
+
+    elif active_node in index.all_types:
+        # If active_node is literally a known Type (like "Procurements", "People", etc.)
+        node_type = active_node
+        node_desc = f"{active_node}"
+        node_rel  = None
+        is_type_node = True
+
+    else:
+        return None
+
+    active_id = index.node_id(active_node)
+    if not is_type_node:
+        # If it’s not a type node, find who depends on it
+        parent_names = list(dict.fromkeys(index.parent_names(active_id)))
+    else:
+        parent_names = []
+
+    active_node_relationships = {
+        "name": active_node,
+        "type": node_type,
+        "relationship": node_rel,
+        "directRelationship": True,
+        "description": node_desc,
+        "parent": parent_names if parent_names else None,
+        "children": []
+    }
+
+    # Attach indirectRelationships (now as array of { name, type })
+    indirects = index.indirect_relationships(active_id) if indirect else None
+    if indirects is not None:
+        active_node_relationships["indirectRelationships"] = indirects
+
+    return active_id, is_type_node, active_node_relationships
+
+def node_groups(index: GraphIndex, node_id: int, is_type_node: bool, current_depth: int,
+                edge_filter=None) -> list:
+    """
+    The groups the traversal expands for a node, as
+    [(kind, group_type, relationship, member_ids, description_ids, relationship_ids, describe), ...]
+    where kind says which list the group comes from (see pagination.GROUP_KINDS), the members
+    are id slices of the index in display order and describe(description_id) gives a
+    member's description. 'edge_filter' (see hierarchy_filter.EdgeFilter) drops edges and
+    groups filtered out of the view.
+    """
+    describe = index.labels.__getitem__
+    if is_type_node:
+        # Handling “group” (type) nodes
+        members = index.members_of_type(node_id, edge_filter)
+        if edge_filter is not None and not edge_filter.allows_type(node_id):
+            members = []
+        if type_members_only(current_depth):
+            groups = []
+            describe = _str_label(describe)
+        else:
+            # Deeper views (and depth <= 0) also show who depends on something of the type
+            groups = [("type-parents", *group, describe) for group in index.parents_of_type(node_id, edge_filter)]
+
+        # Every member of the type ends up in a single group named after it
+        for _, relationship_val, *columns in members:
+            groups.append(("members", str(index.name(node_id)) or "Unknown", relationship_val, *columns, describe))
+        return groups
+
+    # Normal node BFS (non-type): parents first, then children
+    return (
+        [("parents", *group, describe) for group in index.parents_of(node_id, edge_filter)] +
+        [("children", *group, describe) for group in index.children_of(node_id, edge_filter)]
+    )
+
+def type_members_only(current_depth: int) -> bool:
+    """
+    Whether a type node expanded with 'current_depth' levels to go shows only its members:
+    when they are the last level of the view. Otherwise (current_depth > 2, or a depth <= 0
+    request) the CIs depending on something of the type are listed first.
+    """
+    return 1 <= current_depth <= 2
+
+def _str_label(label):
+    return lambda label_id: str(label(label_id))
+
+# Groups with more members than this pick out their unvisited members with array
+# operations; smaller ones are cheaper to scan one member at a time
+VECTORIZE_GROUPS_OVER = 32
+
+def new_visited(index: GraphIndex, visited_ids=()) -> tuple:
+    """
+    A visited mark per node of 'index' (set for 'visited_ids'), as (bytearray, bool array):
+    two views of the same memory, one fast to index from Python, one for array operations.
+    """
+    seen = bytearray(len(index.names))
+    seen_mask = np.frombuffer(seen, dtype=bool)
+    seen_mask[visited_ids] = True
+    return seen, seen_mask
+
+def unvisited_members(member_ids: np.ndarray, seen: bytearray, seen_mask: np.ndarray) -> tuple:
+    """
+    ([position, ...], [member id, ...]) of the members in 'member_ids' not marked visited,
+    in order, counting each member only the first time it is listed.
+    """
+    if len(member_ids) <= VECTORIZE_GROUPS_OVER:
+        positions, ids = [], []
+        for position, m_id in enumerate(member_ids.tolist()):
+            if not seen[m_id] and m_id not in ids:
+                positions.append(position)
+                ids.append(m_id)
+        return positions, ids
+    positions = np.flatnonzero(~seen_mask[member_ids])
+    if len(positions) > 1:
+        _, first = np.unique(member_ids[positions], return_index=True)
+        if len(first) < len(positions):
+            positions = positions[np.sort(first)]
+    return positions.tolist(), member_ids[positions].tolist()
+
+class Frontier:
+    """
+    Where a walk stopped: the nodes it reached without expanding them (in BFS order), every
+    node it visited (an id array) and how many there were. The view one level deeper is
+    usually exactly this walk continued from here, so a deeper view can resume from it
+    (expand_frontier) instead of walking the shallower levels again.
+    Shared between requests once cached: read-only.
+    """
+
+    def __init__(self):
+        self.nodes = []  # (node_id, is_type_node) per unexpanded node
+        self.visited = np.empty(0, dtype=np.int64)
+        self.total_count = 1
+        self.truncated = False
+        # Set when the walk expanded a type node one level above the leaves: one level
+        # deeper that node lists its parents too, so the deeper view is not a continuation
+        self.type_parents_deferred = False
+
+def walk_hierarchy(index: GraphIndex, depth: int, active_id: int, active_is_type_node: bool,
+                   root_children: list, new_group, new_node,
+                   max_nodes: int = None, group_limit: int = None, mark_more=None,
+                   filters: HierarchyFilter = NO_FILTER, frontier: Frontier = None) -> tuple:
+    """
+    BFS from the active node (as resolved by resolve_active_node) up to 'depth' levels,
+    appending its groups to 'root_children'.
+    Returns (number of nodes reached, whether max_nodes cut the traversal short).
+
+    The containers are created by the callers' factories, so the same traversal can build
+    nested dicts (build_hierarchy) or compact tuples (stream_hierarchy):
+        new_group(group_type, relationship) -> (group, group_children)
+        new_node(name, parent_name, type, relationship, description, indirects) -> (node, node_children)
+
+    Optional budget: at most 'max_nodes' nodes in total and 'group_limit' new nodes per group.
+    When a group is cut short, mark_more(group, parent_name, kind, group_type, offset) is called
+    with the position in the group's member list where a next page would resume.
+
+    'filters' decides which edges, groups and indirectRelationships the view keeps;
+    whatever it drops is never visited.
+    If 'frontier' is given, the walk records where it stopped into it.
+    """
+    queue = deque([(root_children, index.name(active_id), active_id, depth, active_is_type_node)])
+    return _walk(index, queue, new_visited(index, [active_id]), 1, new_group, new_node,
+                 max_nodes, group_limit, mark_more, filters, frontier)
+
+def expand_frontier(index: GraphIndex, frontier: Frontier, levels: int, new_group, new_node,
+                    max_nodes: int = None, group_limit: int = None, mark_more=None,
+                    filters: HierarchyFilter = NO_FILTER, next_frontier: Frontier = None) -> tuple:
+    """
+    Continue the walk that recorded 'frontier' for 'levels' more levels, with the same
+    budget and filters. Returns ([(name, children), ...] for each frontier node that got
+    children, total number of nodes, whether max_nodes cut the traversal short).
+    'next_frontier', if given, records where the continued walk stopped.
+    """
+    if frontier.truncated:
+        # The shallower view already ran out of budget: a deeper one shows nothing more
+        if next_frontier is not None:
+            next_frontier.visited, next_frontier.total_count, next_frontier.truncated = (
+                frontier.visited, frontier.total_count, True
+            )
+        return [], frontier.total_count, True
+
+    # Frontier nodes are the leaves of the shallower view: had it been 'levels' deeper,
+    # they would have been queued with current_depth levels + 1
+    expansions = []
+    queue = deque()
+    for node_id, is_type_node in frontier.nodes:
+        children = []
+        name = index.name(node_id)
+        expansions.append((name, children))
+        queue.append((children, name, node_id, levels + 1, is_type_node))
+
+    visited = new_visited(index, frontier.visited)
+    total_count, truncated = _walk(index, queue, visited, frontier.total_count, new_group, new_node,
+                                   max_nodes, group_limit, mark_more, filters, next_frontier)
+    return [(name, children) for name, children in expansions if children], total_count, truncated
+
+def _walk(index: GraphIndex, queue: deque, visited: tuple, total_count: int, new_group, new_node,
+          max_nodes, group_limit, mark_more, filters: HierarchyFilter, frontier: Frontier) -> tuple:
+    # Node types and indirectRelationships lists come precomputed from the index.
+    # The traversal works on interned node ids, marked in 'visited' (see new_visited()) once
+    # reached; names and labels are only looked up for the nodes it emits.
+    gather_indirect_relationships = index.indirect_relationships if filters.indirect else _no_indirects
+    edge_filter = filters.edge_filter(index)
+    node_name = index.name
+    label = index.labels.__getitem__
+    is_type_node = index.is_type_node
+    seen, seen_mask = visited
+    truncated = False
+
+    # Each queue item => (children_of_node, node_name, node_id, current_depth, is_type_node_bool)
+    while queue and not truncated:
+        current_children, current_name, current_id, current_depth, current_is_type_node = queue.popleft()
+        expand_further = (current_depth > 2)
+        if frontier is not None and current_is_type_node and current_depth == 2:
+            frontier.type_parents_deferred = True
+
+        for kind, group_type, relationship_val, member_ids, desc_ids, rel_ids, describe in node_groups(
+            index, current_id, current_is_type_node, current_depth, edge_filter
+        ):
+            positions, new_ids = unvisited_members(member_ids, seen, seen_mask)
+            if not positions:
+                continue
+            group, group_children = new_group(group_type, relationship_val)
+
+            # Out of budget: leave a cursor to the rest of this group
+            room = len(positions)
+            if group_limit is not None:
+                room = min(room, group_limit)
+            if max_nodes is not None:
+                room = min(room, max_nodes - total_count)
+            if room < len(positions):
+                truncated = max_nodes is not None and total_count + room >= max_nodes
+                if mark_more is not None:
+                    mark_more(group, current_name, kind, group_type, positions[room])
+                del positions[room:]
+
+            for position, m_id in zip(positions, new_ids):
+                seen[m_id] = True
+                m_name = node_name(m_id)
+                # Build the related node, with its indirect info
+                m_node, m_children = new_node(
+                    m_name, current_name, group_type, label(rel_ids[position]), describe(desc_ids[position]),
+                    gather_indirect_relationships(m_id)
+                )
+                group_children.append(m_node)
+
+                if expand_further:
+                    queue.append((m_children, m_name, m_id, current_depth - 1, is_type_node(m_id)))
+                elif frontier is not None:
+                    frontier.nodes.append((m_id, is_type_node(m_id)))
+            total_count += len(positions)
+
+            if group_children:
+                current_children.append(group)
+            if truncated:
+                break
+
+    if frontier is not None:
+        frontier.visited, frontier.total_count, frontier.truncated = np.flatnonzero(seen_mask), total_count, truncated
+    return total_count, truncated
+
+def _no_indirects(node_id):
+    return None
+
+def group_children_page(index: GraphIndex, parent_name, kind: str, group_type, offset: int, limit: int,
+                        new_node, filters: HierarchyFilter = NO_FILTER, visited_ids=()) -> tuple:
+    """
+    Up to 'limit' distinct nodes of one group of 'parent_name', starting at member 'offset'
+    (as recorded in a cursor by walk_hierarchy, under the same 'filters'), leaving out
+    'visited_ids' (the nodes the view already shows) and the members before 'offset'.
+    Returns (group_relationship, nodes, next_offset), with next_offset None once the group
+    is exhausted, or None if the group does not exist.
+    """
+    parent_id = index.node_id(parent_name)
+    if parent_id is None:
+        return None
+    # The kind tells which expansion the group came from
+    is_type_node = kind in ("type-parents", "members")
+    # Parents of a type node only exist when it is not expanded as a last level
+    current_depth = 0 if kind == "type-parents" else 1
+    edge_filter = filters.edge_filter(index)
+    gather_indirect_relationships = index.indirect_relationships if filters.indirect else _no_indirects
+    for group_kind, g_type, relationship_val, member_ids, desc_ids, rel_ids, describe in node_groups(
+        index, parent_id, is_type_node, current_depth, edge_filter
+    ):
+        if group_kind != kind or g_type != group_type:
+            continue
+        seen, seen_mask = new_visited(index, visited_ids)
+        seen_mask[member_ids[:offset]] = True
+        seen[parent_id] = True
+        positions, new_ids = unvisited_members(member_ids[offset:], seen, seen_mask)
+        nodes = []
+        for position, m_id in zip(positions[:limit], new_ids):
+            m_node, _ = new_node(
+                index.name(m_id), parent_name, g_type, index.labels[rel_ids[offset + position]],
+                describe(desc_ids[offset + position]), gather_indirect_relationships(m_id)
+            )
+            nodes.append(m_node)
+        # A full page resumes right after its last node
+        next_offset = offset + positions[limit - 1] + 1 if len(positions) >= limit else None
+        if next_offset is not None and next_offset >= len(member_ids):
+            next_offset = None
+        return relationship_val, nodes, next_offset
+    return None
+
+def _dict_group(group_type, relationship):
+    group = {
+        "groupType": group_type,
+        "relationship": relationship,
+        "children": []
+    }
+    return group, group["children"]
+
+def _dict_node(name, parent_name, node_type, relationship, description, indirects):
+    node = {
+        "name": name,
+        "parent": parent_name,
+        "type": node_type,
+        "relationship": relationship,
+        "description": description,
+        "children": []
+    }
+    if indirects is not None:
+        node["indirectRelationships"] = indirects
+    return node, node["children"]
+
+def build_hierarchy(data: pd.DataFrame, depth: int, active_node: str, index: GraphIndex = None,
+                    max_nodes: int = None, group_limit: int = None, data_tag: str = "",
+                    filters: HierarchyFilter = NO_FILTER, frontier: Frontier = None):
+    """
+    Build the hierarchy (as a nested dict) for the given active_node, up to 'depth' levels.
+    This version also attaches { "name": ..., "type": ... } objects for indirectRelationships,
+    ensuring that indirectly related nodes can be colored properly.
+    Pass the snapshot's prebuilt 'index' so the traversal does dictionary lookups
+    instead of scanning the DataFrame for every visited node.
+
+    'max_nodes' / 'group_limit' bound the size of the result. A group that was cut short
+    gets a "more" cursor (tied to 'data_tag') for fetching the rest of its children, and
+    the top-level node gets "truncated": true if max_nodes stopped the traversal.
+
+    'filters' (see hierarchy_filter.py) restricts the view to some Rel_Types / node types
+    and can leave out indirectRelationships; it is applied during the traversal.
+    'frontier', if given, records where the traversal stopped (see build_hierarchy_delta).
+    """
+    # 'data' comes from fetch_graph_data(), which already normalized the name columns.
+    # It is shared across requests, so it is only read here, never modified.
+    # Adjacency lists are built once per data load (see graph_index.py);
+    # only built here when the caller did not pass the snapshot's index.
+    if index is None:
+        index = GraphIndex(data)
+
+    with stage("lookup"):
+        resolved = resolve_active_node(index, active_node, filters.indirect)
+    if resolved is None:
+        return {"error": f"No data found for active node: {active_node}"}
+    active_id, is_type_node, active_node_relationships = resolved
+
+    # If user asked for depth=1, return just the single node
+    if depth == 1:
+        if frontier is not None:
+            frontier.nodes.append((active_id, is_type_node))
+            frontier.visited = np.array([active_id])
+        count("nodes", 1)
+        active_node_relationships["totalNodesDisplayed"] = 1
+        return active_node_relationships
+
+    view = [active_node, depth, max_nodes, group_limit]
+
+    def mark_more(group, parent_name, kind, group_type, offset):
+        group["more"] = encode_cursor(
+            data_tag, parent_name, kind, group_type, offset, group_limit or max_nodes, filters.to_json(), view
+        )
+
+    with stage("traversal"):
+        total_count, truncated = walk_hierarchy(
+            index, depth, active_id, is_type_node, active_node_relationships["children"], _dict_group, _dict_node,
+            max_nodes=max_nodes, group_limit=group_limit, mark_more=mark_more, filters=filters,
+            frontier=frontier
+        )
+    count("nodes", total_count)
+    if truncated:
+        active_node_relationships["truncated"] = True
+    active_node_relationships["totalNodesDisplayed"] = total_count
+    return active_node_relationships
+
+def build_hierarchy_delta(data: pd.DataFrame, depth: int, active_node: str, from_depth: int,
+                          index: GraphIndex = None, frontier: Frontier = None, max_nodes: int = None,
+                          group_limit: int = None, data_tag: str = "", filters: HierarchyFilter = NO_FILTER) -> tuple:
+    """
+    What the view of 'active_node' at 'depth' adds to the same view at 'from_depth'
+    (1 <= from_depth < depth, same budget and filters): the nodes of the extra levels,
+    as the groups to attach under the shallower view's leaves,
+    {
+        "name": active_node, "depth": depth, "fromDepth": from_depth,
+        "expansions": [{"name": leaf name, "children": [groups...]}, ...],
+        "totalNodesDisplayed": nodes in the deeper view,
+        "frontier": token for asking for the next level
+    }.
+    The traversal resumes from 'frontier', the shallower view's Frontier, when the caller
+    kept it; otherwise the shallower levels are walked again (without building any output).
+    When the deeper view is not a continuation of the shallower one (a type node of the
+    shallower view gains its parents, see type_members_only()), the result carries the whole
+    deeper view as "hierarchy" instead of "expansions".
+    Returns (result, Frontier of the deeper view); the result is {"error": ...} and the
+    Frontier None if active_node is unknown.
+    """
+    if not 1 <= from_depth < depth:
+        raise ValueError("fromDepth must be at least 1 and less than depth")
+    if index is None:
+        index = GraphIndex(data)
+
+    if frontier is None:
+        frontier = view_frontier(index, active_node, from_depth, max_nodes, group_limit, filters)
+        if frontier is None:
+            return {"error": f"No data found for active node: {active_node}"}, None
+
+    result = {
+        "name": active_node,
+        "depth": depth,
+        "fromDepth": from_depth,
+    }
+    token = encode_frontier_token(data_tag, active_node, depth, max_nodes, group_limit, filters.to_json())
+    next_frontier = Frontier()
+    if frontier.type_parents_deferred:
+        hierarchy = build_hierarchy(
+            data, depth, active_node, index, max_nodes=max_nodes, group_limit=group_limit,
+            data_tag=data_tag, filters=filters, frontier=next_frontier
+        )
+        result.update(hierarchy=hierarchy, totalNodesDisplayed=hierarchy["totalNodesDisplayed"], frontier=token)
+        return result, next_frontier
+
+    with stage("traversal"):
+        view = [active_node, depth, max_nodes, group_limit]
+
+        def mark_more(group, parent_name, kind, group_type, offset):
+            group["more"] = encode_cursor(
+                data_tag, parent_name, kind, group_type, offset, group_limit or max_nodes, filters.to_json(), view
+            )
+
+        expansions, total_count, truncated = expand_frontier(
+            index, frontier, depth - from_depth, _dict_group, _dict_node,
+            max_nodes=max_nodes, group_limit=group_limit, mark_more=mark_more, filters=filters,
+            next_frontier=next_frontier
+        )
+    count("nodes", total_count - frontier.total_count)
+
+    result.update(
+        expansions=[{"name": name, "children": children} for name, children in expansions],
+        totalNodesDisplayed=total_count,
+        frontier=token,
+    )
+    if truncated:
+        result["truncated"] = True
+    return result, next_frontier
+
+def view_frontier(index: GraphIndex, active_node: str, depth: int, max_nodes: int = None,
+                  group_limit: int = None, filters: HierarchyFilter = NO_FILTER) -> Frontier | None:
+    """
+    The Frontier of the view of 'active_node' at 'depth' (same budget and filters), walked
+    again without building any output; None if active_node is unknown.
+    """
+    with stage("lookup"):
+        resolved = resolve_active_node(index, active_node, indirect=False)
+    if resolved is None:
+        return None
+    active_id, is_type_node, _ = resolved
+
+    frontier = Frontier()
+    with stage("traversal"):
+        if depth == 1:
+            frontier.nodes.append((active_id, is_type_node))
+            frontier.visited = np.array([active_id])
+        else:
+            walk_hierarchy(index, depth, active_id, is_type_node, [], _bare_container, _bare_container,
+                           max_nodes=max_nodes, group_limit=group_limit, filters=filters, frontier=frontier)
+    return frontier
+
+def _bare_container(*fields):
+    # Walks that only record their Frontier do not build any output
+    return None, []
+
+def get_group_children(index: GraphIndex, cursor: str, data_tag: str = "", limit: int = None,
+                       frontier_of=view_frontier) -> dict:
+    """
+    Next page of a group that build_hierarchy cut short, from the group's "more" cursor:
+    { "parent", "groupType", "relationship", "children": [...], "more": cursor or None }.
+    The page leaves out the nodes the cursor's view already shows, taken from that view's
+    Frontier: frontier_of(index, active_node, depth, max_nodes, group_limit, filters),
+    by default walked again (see view_frontier()).
+    Raises ValueError for a bad cursor (StaleCursorError if the data changed since).
+    """
+    fields = decode_cursor(cursor, data_tag)
+    limit = limit or fields["limit"]
+    filters = HierarchyFilter.from_json(fields["filters"])
+    visited_ids = ()
+    if fields["view"] is not None:
+        frontier = frontier_of(index, *fields["view"], filters)
+        if frontier is not None:
+            visited_ids = frontier.visited
+    page = group_children_page(
+        index, fields["parent"], fields["kind"], fields["groupType"], fields["offset"], limit, _dict_node, filters,
+        visited_ids
+    )
+    if page is None:
+        raise ValueError("Invalid cursor: group not found")
+    relationship_val, nodes, next_offset = page
+    more = None
+    if next_offset is not None:
+        more = encode_cursor(
+            data_tag, fields["parent"], fields["kind"], fields["groupType"], next_offset, limit, fields["filters"],
+            fields["view"]
+        )
+    return {
+        "parent": fields["parent"],
+        "groupType": fields["groupType"],
+        "relationship": relationship_val,
+        "children": nodes,
+        "more": more,
+    }
+
+IMPACT_DIRECTIONS = ("downstream", "upstream", "both")
+
+def get_impact(index: GraphIndex, node, direction: str = "downstream", max_hops: int = None,
+               rel_types: list = None) -> dict:
+    """
+    Flat blast radius of 'node': every CI reachable from it with its hop distance,
+    following "downstream" edges (what it depends on), "upstream" edges (what depends on it)
+    or "both", optionally only up to 'max_hops' and only through the given Rel_Types.
+    Nodes come nearest first, then by name.
+    """
+    if direction not in IMPACT_DIRECTIONS:
+        raise ValueError(f"direction must be one of {', '.join(IMPACT_DIRECTIONS)}")
+    node_id = index.node_id(node)
+    if node_id is None or index.node_attributes_of(node) is None:
+        return {"error": f"No data found for node: {node}"}
+
+    node_ids, hops = index.reachable(
+        node_id, downstream=direction != "upstream", upstream=direction != "downstream",
+        max_hops=max_hops, rel_types=rel_types,
+    )
+    nodes = sorted(
+        ({"name": index.name(other_id), "type": index.node_type(other_id), "hops": hop}
+         for other_id, hop in zip(node_ids.tolist(), hops.tolist())),
+        key=lambda item: (item["hops"], str(item["name"]))
+    )
+    per_hop = np.bincount(hops, minlength=1)[1:].tolist() if len(hops) else []
+    return {
+        "name": node,
+        "type": index.node_type(node_id),
+        "direction": direction,
+        "maxHops": max_hops,
+        "relTypes": rel_types,
+        "totalReachable": len(nodes),
+        "perHop": per_hop,
+        "nodes": nodes,
+    }
+
+def get_all_assets(excel_file=DEFAULT_EXCEL_FILE):
+    """
+    Retrieves all unique assets from both 'CI_Name' and 'Dependency_Name' columns.
+    Think of this like merging two baskets (one for CI_Names and one for Dependency_Names)
+    and removing duplicates to get a complete list of unique assets.
+    """
+    data, _ = fetch_graph_data(excel_file)
+    if data is None:
+        return []
+    if not isinstance(data, pd.DataFrame):
+        return data.asset_types()['name'].tolist()
+
+    # Extract assets from each column and use a set to remove duplicates
+    ci_assets = set(data['CI_Name'].tolist())
+    dependency_assets = set(data['Dependency_Name'].tolist())
+    
+    # Combine the two sets (like merging two lists and removing duplicate items)
+    all_assets_set = ci_assets.union(dependency_assets)
+    
+    # Convert back to a list (or keep as a set if order is not important)
+    return list(all_assets_set)
+
+# print(get_all_assets())
+
+def get_grouped_assets(excel_file=DEFAULT_EXCEL_FILE, data: pd.DataFrame = None):
+    """
+    Return a dict grouping asset names by their type. E.g.:
+    {
+        "Applications": ["IT Service Management System", "Help Desk ..."],
+        "Data": [...],
+        ...
+    }
+    Pass 'data' to group an already-fetched snapshot instead of the store's current one.
+    """
+    if data is None:
+        data, _ = fetch_graph_data(excel_file)
+    if data is None:
+        return {}
+    if not isinstance(data, pd.DataFrame):
+        return _group_assets(data.asset_types())
+
+    # Unified column of names (and types) for both CI and Dependency, in row order:
+    # row 0's CI, row 0's dependency, row 1's CI, ...
+    row_count = len(data)
+    names = np.empty(2 * row_count, dtype=object)
+    names[0::2] = data['CI_Name'].to_numpy(dtype=object)
+    names[1::2] = data['Dependency_Name'].to_numpy(dtype=object)
+    types = np.empty(2 * row_count, dtype=object)
+    types[0::2] = data['CI_Type'].fillna('Unknown').to_numpy(dtype=object)
+    types[1::2] = data['Dependency_Type'].fillna('Unknown').to_numpy(dtype=object)
+    entries = pd.DataFrame({'name': names, 'type': types})
+
+    # Deduplicate by picking a single type for each asset name
+    # (If the same name appears under multiple types, we use the first that is not "Unknown")
+    assets = entries.drop_duplicates('name')
+    known = entries[entries['type'] != 'Unknown'].drop_duplicates('name').set_index('name')['type']
+    asset_types = assets['name'].map(known).fillna('Unknown')
+    assets = pd.DataFrame({'name': assets['name'].to_numpy(), 'type': asset_types.to_numpy()})
+    return _group_assets(assets)
+
+def _group_assets(assets: pd.DataFrame) -> dict:
+    # Group assets by their final type (groups in order of first appearance),
+    # with the asset names in each group sorted
+    names_by_type = assets.sort_values('name', kind='stable').groupby('type', sort=False)['name'].agg(list)
+    return {typ: names_by_type[typ] for typ in assets['type'].unique()}
+
+def get_all_dependencies(excel_file=DEFAULT_EXCEL_FILE, data: pd.DataFrame = None):
+    """
+    Reads the Excel file and returns a distinct list of dependency objects.
+    Each object contains "Dependency_Type", "Dependency_Name", and "Dependency_Descrip".
+    Uniqueness is determined by Dependency_Name (case-insensitive).
+    Pass 'data' to read an already-fetched snapshot instead of the store's current one.
+    """
+    if data is None:
+        data, _ = fetch_graph_data(excel_file)
+    if data is None:
+        return []
+    if not isinstance(data, pd.DataFrame):
+        data = data.dependency_rows()
+
+    # Ensure columns are strings and remove extra whitespace
+    # (work on local copies: 'data' is shared with every other request)
+    dep_names = data['Dependency_Name']
+    dep_types = data['Dependency_Type'].astype(str).str.strip()
+    dep_descrips = data['Dependency_Descrip'].fillna('').astype(str).str.strip()
+
+    # Keep the first row of each dependency name, compared case-insensitively
+    first_rows = ~dep_names.str.lower().duplicated()
+    results = pd.DataFrame({
+        "Dependency_Type": dep_types[first_rows],
+        "Dependency_Name": dep_names[first_rows],
+        "Dependency_Descrip": dep_descrips[first_rows],
+    })
+    return results.to_dict('records')
+
+
@@ -0,0 +1,25 @@
+"""
+Cross-process lock around building a derived file (the SQLite copy, the shared graph
+file), so that when the workbook changes one process builds the new file while the
+others (every gunicorn worker noticing the same change) wait and then open the result.
+"""
+import contextlib
+
+try:
+    import fcntl
+except ImportError:  # Windows: no lock, concurrent builds just replace each other's file
+    fcntl = None
+
+
+@contextlib.contextmanager
+def build_lock(path: str):
+    """Held while building the file at 'path', so only one process at a time builds it."""
+    if fcntl is None:
+        yield
+        return
+    with open(f"{path}.lock", 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
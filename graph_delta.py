@@ -0,0 +1,123 @@
+"""
+What changed between two loads of the workbook, and which views that can affect.
+
+When the workbook changes on disk, the new rows are diffed against the loaded ones so
+that only the cached views around the edited nodes have to be rebuilt; views of
+untouched parts of the graph keep being served from the cache across the reload.
+"""
+import numpy as np
+import pandas as pd
+from graph_index import GraphIndex
+
+# Identity of an edge; rows are otherwise compared on every column
+EDGE_KEY = ['CI_Name', 'Dependency_Name', 'Rel_Type']
+
+# Above this share of changed rows, a delta is not worth it: treat it as a full reload
+MAX_DELTA_SHARE = 0.2
+
+
+def _row_keys(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    (hash of the whole row, occurrence of that row so far) per row, so identical rows
+    are matched one-to-one and duplicated rows are counted, not collapsed.
+    """
+    hashes = pd.util.hash_pandas_object(data.astype(object), index=False).to_numpy()
+    keys = pd.DataFrame({'hash': hashes})
+    keys['occurrence'] = keys.groupby('hash', sort=False).cumcount()
+    return keys
+
+
+class GraphDelta:
+    """
+    Rows removed from the old frame and added in the new one (an edited row is both).
+    Changes are also summarized per EDGE_KEY: 'upserted' edges exist in the new data
+    and were added or modified, 'deleted' edges no longer exist at all.
+    """
+
+    def __init__(self, removed: pd.DataFrame, added: pd.DataFrame):
+        self.removed = removed
+        self.added = added
+        removed_keys = set(map(tuple, removed[EDGE_KEY].astype(object).itertuples(index=False)))
+        added_keys = set(map(tuple, added[EDGE_KEY].astype(object).itertuples(index=False)))
+        self.upserted = len(added_keys)
+        self.deleted = len(removed_keys - added_keys)
+
+    def __len__(self) -> int:
+        return len(self.removed) + len(self.added)
+
+    def touched_names(self) -> set:
+        """Every CI, dependency and type named on a changed row: their own views are stale."""
+        names = set()
+        for frame in (self.removed, self.added):
+            for column in ('CI_Name', 'Dependency_Name', 'CI_Type', 'Dependency_Type'):
+                names.update(frame[column].dropna().tolist())
+        return names
+
+
+def diff_frames(old: pd.DataFrame, new: pd.DataFrame) -> GraphDelta | None:
+    """
+    Diff two loads of the workbook row by row. Returns None when they cannot be compared
+    (different columns) or differ too much for a delta to pay off.
+    """
+    if list(old.columns) != list(new.columns):
+        return None
+    merged = _row_keys(old).reset_index().merge(
+        _row_keys(new).reset_index(), on=['hash', 'occurrence'], how='outer',
+        suffixes=('_old', '_new'), indicator=True,
+    )
+    removed_rows = merged.loc[merged['_merge'] == 'left_only', 'index_old'].astype(np.int64)
+    added_rows = merged.loc[merged['_merge'] == 'right_only', 'index_new'].astype(np.int64)
+    if len(removed_rows) + len(added_rows) > MAX_DELTA_SHARE * max(len(old), len(new), 1):
+        return None
+    return GraphDelta(old.iloc[np.sort(removed_rows)], new.iloc[np.sort(added_rows)])
+
+
+class GraphChanges:
+    """
+    A delta together with the index built after it, to work out how far from the
+    edits a cached view is.
+    """
+
+    def __init__(self, delta: GraphDelta, index: GraphIndex):
+        self.delta = delta
+        self._index = index
+        self._distances = None
+        self._radius = -1
+
+    def distances(self, radius: int) -> dict:
+        """
+        {name: hops to the nearest changed row} for every name within 'radius' hops,
+        walking edges both ways and from nodes to the types of their rows.
+        A view of depth d around a node further away than d is unchanged.
+
+        Walking the new graph is enough: an edge that only existed before the edit
+        belongs to a removed row, whose names are all at distance 0 already.
+        """
+        if radius <= self._radius:
+            return self._distances
+        index = self._index
+        touched = self.delta.touched_names()
+        hops = np.full(len(index.names), -1, dtype=np.int32)
+        frontier = np.array(
+            [node_id for node_id in map(index.node_id, touched) if node_id is not None], dtype=np.int32
+        )
+        hops[frontier] = 0
+        for hop in range(1, radius + 1):
+            if not len(frontier):
+                break
+            related = index.related_ids(frontier)
+            frontier = related[hops[related] == -1]
+            hops[frontier] = hop
+
+        distances = {name: 0 for name in touched}  # including names that no longer exist
+        for node_id in np.flatnonzero(hops > 0).tolist():
+            distances[index.name(node_id)] = int(hops[node_id])
+        self._distances, self._radius = distances, radius
+        return distances
+
+    def affects(self, active_node, depth: int) -> bool:
+        """Whether the hierarchy of 'active_node' at 'depth' may differ after the delta."""
+        # A view shows nodes up to depth-1 hops away plus their parents (indirectRelationships);
+        # depth <= 0 expands like depth 2
+        radius = depth if depth >= 1 else 2
+        return self.distances(radius).get(active_node, radius + 1) <= radius
@@ -0,0 +1,470 @@
+import time
+import numpy as np
+import pandas as pd
+from request_timing import add_stage
+
+NO_DESCRIPTION = "No description available."
+
+# Id stored for an empty cell
+MISSING = -1
+
+
+class InternTable:
+    """
+    Maps each distinct value to a dense int id and back.
+    The graph stores these ids in int32 arrays; values are only looked up
+    again when a node is turned into JSON.
+    """
+
+    def __init__(self):
+        self.values = []
+        self._ids = {}
+        self._nan_id = None
+
+    def intern(self, value) -> int:
+        if isinstance(value, float) and value != value:  # NaN never equals itself
+            if self._nan_id is None:
+                self._nan_id = len(self.values)
+                self.values.append(value)
+            return self._nan_id
+        value_id = self._ids.get(value)
+        if value_id is None:
+            value_id = self._ids[value] = len(self.values)
+            self.values.append(value)
+        return value_id
+
+    def intern_column(self, column: pd.Series, transform=None, keep_missing: bool = False) -> np.ndarray:
+        """
+        Intern every cell of 'column' and return the ids as an int32 array.
+        Empty cells become MISSING unless 'keep_missing', in which case NaN is interned too.
+        'transform' is applied to each distinct value before interning.
+        """
+        codes, uniques = pd.factorize(column, use_na_sentinel=not keep_missing)
+        remap = np.empty(len(uniques) + 1, dtype=np.int32)
+        remap[-1] = MISSING  # code -1 (empty cell) lands here
+        for position, value in enumerate(uniques.tolist()):
+            remap[position] = self.intern(transform(value) if transform else value)
+        return remap[codes]
+
+    def id_of(self, value) -> int | None:
+        if isinstance(value, float) and value != value:
+            return self._nan_id
+        try:
+            return self._ids.get(value)
+        except TypeError:  # unhashable values are never interned
+            return None
+
+    def __getitem__(self, value_id: int):
+        return self.values[value_id]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class _Adjacency:
+    """
+    CSR layout of edges grouped by a key node: the edges of node k live in
+    positions ptr[k]:ptr[k+1] of the 'other', 'desc', 'rel' and 'group' columns,
+    already sorted by group (type name order, as DataFrame.groupby() produced) and then row.
+    Each run of one key's edges in one group starts at a position listed in 'run_start',
+    and the runs of node k are run_start[run_ptr[k]:run_ptr[k+1]].
+    """
+
+    # Every array attribute, as listed by GraphIndex.arrays()
+    FIELDS = ("ptr", "rows", "other", "desc", "rel", "group", "run_start", "run_ptr")
+
+    def __init__(self, key: np.ndarray, group: np.ndarray, other: np.ndarray, desc: np.ndarray,
+                 rel: np.ndarray, group_rank: np.ndarray, node_count: int):
+        rows = np.arange(len(key), dtype=np.int32)
+        order = np.lexsort((rows, group_rank[group], key)).astype(np.int32)
+        self.ptr = np.zeros(node_count + 1, dtype=np.int32)
+        np.cumsum(np.bincount(key, minlength=node_count), out=self.ptr[1:])
+        self.rows = rows[order]
+        self.other = other[order]
+        self.desc = desc[order]
+        self.rel = rel[order]
+        self.group = group[order]
+        new_run = np.ones(len(key), dtype=bool)
+        sorted_key = key[order]
+        new_run[1:] = (sorted_key[1:] != sorted_key[:-1]) | (self.group[1:] != self.group[:-1])
+        self.run_start = np.flatnonzero(new_run).astype(np.int32)
+        self.run_ptr = np.searchsorted(self.run_start, self.ptr).astype(np.int32)
+
+    @classmethod
+    def from_arrays(cls, arrays: dict) -> "_Adjacency":
+        adjacency = cls.__new__(cls)
+        for field in cls.FIELDS:
+            setattr(adjacency, field, arrays[field])
+        return adjacency
+
+    def runs(self, key_id: int) -> list:
+        """Start positions of the groups of 'key_id', followed by the end of its slice."""
+        first, last = self.run_ptr[key_id], self.run_ptr[key_id + 1]
+        return [*self.run_start[first:last].tolist(), int(self.ptr[key_id + 1])]
+
+    def slice(self, key_id: int) -> tuple[int, int]:
+        return int(self.ptr[key_id]), int(self.ptr[key_id + 1])
+
+    def positions(self, key_ids: np.ndarray) -> np.ndarray:
+        """Positions of the edges of every key in 'key_ids', concatenated."""
+        starts = self.ptr[key_ids].astype(np.int64)
+        lengths = self.ptr[key_ids + 1] - starts
+        total = int(lengths.sum())
+        # Each position is its slice's start plus its offset within that slice
+        offsets = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        return np.repeat(starts, lengths) + offsets
+
+
+def group_members(names, labels, group: np.ndarray, other: np.ndarray, desc: np.ndarray, rel: np.ndarray,
+                  edge_filter=None, bounds: list = None) -> list:
+    """
+    [(group_type, relationship_of_first_member, other_ids, description_ids, relationship_ids), ...]
+    for edges given as id columns already sorted by group, with 'names' / 'labels' mapping ids
+    to values. Each group's members stay slices of the id columns: traversals only look up
+    the names and labels of the members they actually emit.
+    'bounds' are the groups' start positions followed by the end, when already known.
+    'edge_filter(rel, group)' (see hierarchy_filter.py) picks the edges to keep.
+    """
+    if edge_filter is not None:
+        keep = edge_filter(rel, group)
+        group, other, desc, rel = group[keep], other[keep], desc[keep], rel[keep]
+        bounds = None
+    if not len(group):
+        return []
+    if bounds is None:
+        bounds = [0, *(np.flatnonzero(group[1:] != group[:-1]) + 1).tolist(), len(group)]
+    starts = bounds[:-1]
+    return [
+        (names[group_id], labels[rel_id], other[start:end], desc[start:end], rel[start:end])
+        for group_id, rel_id, start, end in zip(group[starts].tolist(), rel[starts].tolist(), starts, bounds[1:])
+    ]
+
+
+class GraphIndex:
+    """
+    Interned, array-backed adjacency index for the workbook, built once per data load.
+    build_hierarchy() looks nodes up here instead of filtering the DataFrame
+    for every node it visits.
+
+    Node names and type names share one InternTable ('names'), so a type can be
+    visited like any other node; descriptions and relationship labels live in 'labels'.
+    Edges are int32 columns in CSR order, so memory per row is a handful of ints
+    instead of Python tuples and strings. Members keep the row order of the
+    workbook, so traversals produce exactly the same output as the row scans did.
+    """
+
+    # Array attributes, as listed by arrays(): the adjacencies and the per-node / per-row columns
+    _ADJACENCIES = ("_parents", "_children", "_type_parents", "_type_members")
+    _COLUMNS = (
+        "is_type", "_first_ci_row", "_first_dep_row", "_node_type",
+        "_src_type", "_dst_type", "_src_desc", "_dst_desc", "_rel",
+    )
+
+    def __init__(self, data: pd.DataFrame):
+        names = self.names = InternTable()
+        labels = self.labels = InternTable()
+
+        src = names.intern_column(data['CI_Name'])
+        dst = names.intern_column(data['Dependency_Name'])
+        src_type = names.intern_column(data['CI_Type'])
+        dst_type = names.intern_column(data['Dependency_Type'])
+        unknown = names.intern("Unknown")
+
+        # Relationship keeps the "Rel_Type or None" semantics; descriptions fall back to NO_DESCRIPTION
+        rel = labels.intern_column(data['Rel_Type'], transform=lambda value: value or None, keep_missing=True)
+        src_desc = labels.intern_column(data['CI_Descrip'].fillna(NO_DESCRIPTION))
+        dst_desc = labels.intern_column(data['Dependency_Descrip'].fillna(NO_DESCRIPTION))
+        node_count = len(names)
+
+        # Which names are known types (appear in CI_Type or Dependency_Type)
+        self.is_type = np.zeros(node_count, dtype=bool)
+        self.is_type[src_type[src_type != MISSING]] = True
+        self.is_type[dst_type[dst_type != MISSING]] = True
+        self.all_types = {names[type_id] for type_id in np.flatnonzero(self.is_type).tolist()}
+
+        # Rows are grouped under their type, "Unknown" when it is empty
+        src_group = np.where(src_type != MISSING, src_type, unknown).astype(np.int32)
+        dst_group = np.where(dst_type != MISSING, dst_type, unknown).astype(np.int32)
+        group_ids = np.unique(np.concatenate([src_group, dst_group])).tolist()
+        group_rank = np.zeros(node_count, dtype=np.int32)
+        group_rank[sorted(group_ids, key=names.__getitem__)] = np.arange(len(group_ids), dtype=np.int32)
+
+        # Incoming edges (who depends on a name) and outgoing edges (what a name depends on)
+        self._parents = _Adjacency(dst, src_group, src, src_desc, rel, group_rank, node_count)
+        self._children = _Adjacency(src, dst_group, dst, dst_desc, rel, group_rank, node_count)
+
+        # Rows pointing at a type, grouped by the type of the CI side
+        typed = np.flatnonzero(dst_type != MISSING)
+        self._type_parents = _Adjacency(
+            dst_type[typed], src_group[typed], src[typed], src_desc[typed], rel[typed], group_rank, node_count
+        )
+
+        # Members of each type: rows listing it as CI_Type (by their CI side), then rows
+        # listing it as Dependency_Type (by their CI side if that has the same type, else dependency side)
+        ci_rows = np.flatnonzero(src_type != MISSING)
+        dep_rows = np.flatnonzero(dst_type != MISSING)
+        same_type = src_type[dep_rows] == dst_type[dep_rows]
+        member_key = np.concatenate([src_type[ci_rows], dst_type[dep_rows]])
+        member_node = np.concatenate([src[ci_rows], np.where(same_type, src[dep_rows], dst[dep_rows])])
+        member_desc = np.concatenate([src_desc[ci_rows], np.where(same_type, src_desc[dep_rows], dst_desc[dep_rows])])
+        member_rel = np.concatenate([rel[ci_rows], rel[dep_rows]])
+        # One group per type: every member gets the same rank, so only list order counts
+        self._type_members = _Adjacency(
+            member_key, np.zeros(len(member_key), dtype=np.int32), member_node.astype(np.int32),
+            member_desc.astype(np.int32), member_rel, np.zeros(1, dtype=np.int32), node_count
+        )
+
+        # First row naming each node as a CI / as a dependency, for CI-side-first precedence
+        self._first_ci_row = self._first_rows(src, node_count)
+        self._first_dep_row = self._first_rows(dst, node_count)
+
+        # Type used to color a node: the first non-empty of its CI_Type and Dependency_Type,
+        # else the name itself when it is a known type, else "Unknown"
+        own_id = np.arange(node_count, dtype=np.int32)
+        ci_type = self._column_at(src_type, self._first_ci_row)
+        dep_type = self._column_at(dst_type, self._first_dep_row)
+        fallback = np.where(self.is_type, own_id, unknown)
+        self._node_type = np.where(
+            ci_type != MISSING, ci_type, np.where(dep_type != MISSING, dep_type, fallback)
+        ).astype(np.int32)
+
+        # Row columns still needed to describe the active node
+        self._src_type, self._dst_type = src_type, dst_type
+        self._src_desc, self._dst_desc, self._rel = src_desc, dst_desc, rel
+
+        # indirectRelationships lists, filled in lazily the first time a node is emitted
+        self._indirects = {}
+
+    def arrays(self) -> dict:
+        """
+        Every array of the index by name ("_node_type", "_parents.ptr", ...): with the 'names'
+        and 'labels' tables, all that from_arrays() needs to put the index back together.
+        """
+        arrays = {column: getattr(self, column) for column in self._COLUMNS}
+        for adjacency in self._ADJACENCIES:
+            for field in _Adjacency.FIELDS:
+                arrays[f"{adjacency}.{field}"] = getattr(getattr(self, adjacency), field)
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, names, labels, arrays: dict) -> "GraphIndex":
+        """
+        Index over already-built arrays as returned by arrays() (e.g. mapped from a file, see
+        shared_graph.py), with 'names' / 'labels' tables that behave like InternTable.
+        The arrays are used as they are, never copied or modified.
+        """
+        index = cls.__new__(cls)
+        index.names, index.labels = names, labels
+        for column in cls._COLUMNS:
+            setattr(index, column, arrays[column])
+        for adjacency in cls._ADJACENCIES:
+            setattr(index, adjacency, _Adjacency.from_arrays(
+                {field: arrays[f"{adjacency}.{field}"] for field in _Adjacency.FIELDS}
+            ))
+        index.all_types = {names[type_id] for type_id in np.flatnonzero(index.is_type).tolist()}
+        index._indirects = {}
+        return index
+
+    @staticmethod
+    def _first_rows(key: np.ndarray, node_count: int) -> np.ndarray:
+        first = np.full(node_count, MISSING, dtype=np.int32)
+        ids, positions = np.unique(key, return_index=True)
+        first[ids] = positions
+        return first
+
+    @staticmethod
+    def _column_at(column: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        return np.where(rows != MISSING, column[rows], MISSING)
+
+    # ---------------------------------------
+    # Names <-> ids
+    # ---------------------------------------
+    def node_id(self, name) -> int | None:
+        return self.names.id_of(name)
+
+    def name(self, node_id: int):
+        return self.names[node_id]
+
+    def is_type_node(self, node_id: int) -> bool:
+        return bool(self.is_type[node_id])
+
+    def searchable_ids(self) -> np.ndarray:
+        """Ids of every CI / dependency name and type (not helper values such as "Unknown")."""
+        named = (self._first_ci_row != MISSING) | (self._first_dep_row != MISSING)
+        return np.flatnonzero(named | self.is_type)
+
+    def hub_ids(self, limit: int) -> list:
+        """
+        Ids of the 'limit' nodes with the most edges (members, for a type), most first:
+        the nodes whose views are the most expensive to build.
+        """
+        degree = np.diff(self._parents.ptr) + np.diff(self._children.ptr) + np.diff(self._type_members.ptr)
+        order = np.argsort(-degree, kind="stable")[:limit]
+        return order[degree[order] > 0].tolist()
+
+    # ---------------------------------------
+    # Grouped neighbours
+    # ---------------------------------------
+    def _groups(self, adjacency: _Adjacency, key_id: int, edge_filter=None) -> list:
+        """Grouped edges of 'key_id' in 'adjacency' (see group_members())."""
+        start, end = adjacency.slice(key_id)
+        if start == end:
+            return []
+        return group_members(
+            self.names.values, self.labels.values, adjacency.group[start:end], adjacency.other[start:end],
+            adjacency.desc[start:end], adjacency.rel[start:end], edge_filter,
+            [position - start for position in adjacency.runs(key_id)]
+        )
+
+    def parents_of(self, node_id: int, edge_filter=None) -> list:
+        """Grouped rows where the node is the Dependency_Name (who depends on it)."""
+        return self._groups(self._parents, node_id, edge_filter)
+
+    def children_of(self, node_id: int, edge_filter=None) -> list:
+        """Grouped rows where the node is the CI_Name (what it depends on)."""
+        return self._groups(self._children, node_id, edge_filter)
+
+    def parents_of_type(self, type_id: int, edge_filter=None) -> list:
+        """Grouped rows whose Dependency_Type is the type."""
+        return self._groups(self._type_parents, type_id, edge_filter)
+
+    def members_of_type(self, type_id: int, edge_filter=None) -> list:
+        """Every node filed under the type, as a single group (no group at all when there are none)."""
+        # Members share one group: only their relationships can be filtered
+        return self._groups(self._type_members, type_id, edge_filter and edge_filter.by_relationship)
+
+    # ---------------------------------------
+    # Per-node attributes
+    # ---------------------------------------
+    def node_type(self, node_id: int) -> str:
+        """Best guess for the 'type' of a node, else 'Unknown'."""
+        return str(self.names[self._node_type[node_id]])
+
+    def node_attributes_of(self, name) -> tuple | None:
+        """
+        (type, description, relationship) shown when 'name' is the active node, from the first
+        row naming it as a CI, else the first row naming it as a dependency; None if neither.
+        """
+        node_id = self.node_id(name)
+        if node_id is None:
+            return None
+        row = int(self._first_ci_row[node_id])
+        if row != MISSING:
+            type_id, desc_id = self._src_type[row], self._src_desc[row]
+        else:
+            row = int(self._first_dep_row[node_id])
+            if row == MISSING:
+                return None
+            type_id, desc_id = self._dst_type[row], self._dst_desc[row]
+        node_type = self.names[type_id] if type_id != MISSING else name
+        return node_type, self.labels[desc_id], self.labels[self._rel[row]]
+
+    def related_ids(self, node_ids: np.ndarray) -> np.ndarray:
+        """
+        Ids of the nodes on the other side of the given nodes' rows, and of the types on
+        those rows: every node whose view can show one of them, one hop away.
+        """
+        parent_positions = self._parents.positions(node_ids)
+        child_positions = self._children.positions(node_ids)
+        rows = np.concatenate([self._parents.rows[parent_positions], self._children.rows[child_positions]])
+        related = np.concatenate([
+            self._parents.other[parent_positions], self._children.other[child_positions],
+            self._src_type[rows], self._dst_type[rows],
+        ])
+        return np.unique(related[related != MISSING])
+
+    def neighbor_ids(self, node_ids: np.ndarray) -> np.ndarray:
+        """Distinct ids on the other side of the given nodes' rows, in either direction."""
+        parent_positions = self._parents.positions(node_ids)
+        child_positions = self._children.positions(node_ids)
+        return np.unique(np.concatenate([
+            self._parents.other[parent_positions], self._children.other[child_positions]
+        ]))
+
+    def member_ids_of_type(self, type_id: int) -> np.ndarray:
+        """Distinct ids of the nodes filed under the type."""
+        start, end = self._type_members.slice(type_id)
+        return np.unique(self._type_members.other[start:end])
+
+    def edge_between(self, node_id: int, other_id: int) -> tuple | None:
+        """
+        (relationship, "downstream" or "upstream") of the first row linking the two nodes:
+        downstream when node_id depends on other_id. None if no row links them.
+        """
+        for adjacency, direction in ((self._children, "downstream"), (self._parents, "upstream")):
+            start, end = adjacency.slice(node_id)
+            matches = np.flatnonzero(adjacency.other[start:end] == other_id)
+            if len(matches):
+                # The slice is ordered by group, so take the earliest row among the matches
+                first = start + matches[np.argmin(adjacency.rows[start + matches])]
+                return self.labels[adjacency.rel[first]], direction
+        return None
+
+    def reachable(self, node_id: int, downstream: bool = True, upstream: bool = False,
+                  max_hops: int = None, rel_types: list = None) -> tuple:
+        """
+        Every node reachable from 'node_id' by following edges downstream (to what it depends on)
+        and/or upstream (to what depends on it), at most 'max_hops' edges away (None: no limit),
+        only through edges whose Rel_Type is in 'rel_types' (None: any).
+        Returns (node ids, hop distances) as arrays, excluding the node itself.
+        """
+        adjacencies = ([self._children] if downstream else []) + ([self._parents] if upstream else [])
+        rel_ids = None
+        if rel_types is not None:
+            rel_ids = np.array([rel_id for rel_id in map(self.labels.id_of, rel_types) if rel_id is not None],
+                               dtype=np.int32)
+
+        hops = np.full(len(self.names), -1, dtype=np.int32)
+        hops[node_id] = 0
+        frontier = np.array([node_id], dtype=np.int32)
+        hop = 0
+        while len(frontier) and (max_hops is None or hop < max_hops):
+            hop += 1
+            reached = []
+            for adjacency in adjacencies:
+                positions = adjacency.positions(frontier)
+                if rel_ids is not None:
+                    positions = positions[np.isin(adjacency.rel[positions], rel_ids)]
+                reached.append(adjacency.other[positions])
+            reached = np.unique(np.concatenate(reached)) if reached else np.empty(0, dtype=np.int32)
+            frontier = reached[hops[reached] == -1]
+            hops[frontier] = hop
+
+        found = np.flatnonzero(hops > 0)
+        return found, hops[found]
+
+    def _parent_ids(self, node_id: int) -> list:
+        """Ids of the CIs that depend on the node, in workbook row order (with repeats)."""
+        start, end = self._parents.slice(node_id)
+        ordering = np.argsort(self._parents.rows[start:end], kind='stable')
+        return self._parents.other[start:end][ordering].tolist()
+
+    def parent_names(self, node_id: int) -> list:
+        """CI_Names that depend on the node, in workbook row order (with repeats)."""
+        return [self.names[parent_id] for parent_id in self._parent_ids(node_id)]
+
+    def indirect_relationships(self, node_id: int) -> list | None:
+        """
+        If the node has multiple parents, return a list of { 'name': X, 'type': Y } for each
+        (excluding itself), or None. The list is memoized and shared: do not modify it.
+        """
+        try:
+            return self._indirects[node_id]
+        except KeyError:
+            pass
+
+        started = time.perf_counter()
+        start, end = self._parents.slice(node_id)
+        results = None
+        # If fewer than 2 references, we’re not marking it as “indirectRelationships”
+        if end - start > 1:
+            results = [
+                {"name": self.names[related_id], "type": self.node_type(related_id)}
+                for related_id in self._parent_ids(node_id)
+                # Avoid listing ourselves
+                if related_id != node_id
+            ] or None
+
+        self._indirects[node_id] = results
+        add_stage("indirects", time.perf_counter() - started)
+        return results
@@ -0,0 +1,142 @@
+"""
+Shortest connections between two nodes, to explain why they show up in the same view.
+
+Paths follow the edges build_hierarchy() walks: CI / dependency rows in either
+direction, and for a type given as an end point, the links to its members
+(as when a type is the active node). A type-named node met along the way is only
+followed through its rows, not through its members. The search is a bidirectional BFS over the
+int32 edge index that always grows the smaller frontier, so it only explores
+around both ends instead of the whole graph.
+"""
+import numpy as np
+from graph_index import GraphIndex
+
+# Hop limits for /path: default and largest accepted
+DEFAULT_MAX_HOPS = 6
+MAX_HOPS_LIMIT = 12
+
+
+class _Side:
+    """BFS state grown from one end: hop count per node id and the current frontier."""
+
+    def __init__(self, index: GraphIndex, node_id: int, is_type_node: bool):
+        self.index = index
+        self.node_id = node_id
+        self.is_type_node = is_type_node
+        self.hops = np.full(len(index.names), -1, dtype=np.int32)
+        self.hops[node_id] = 0
+        self.frontier = np.array([node_id], dtype=np.int32)
+        self.level = 0
+
+    def neighbors(self, node_ids: np.ndarray) -> np.ndarray:
+        if self.level == 0 and self.is_type_node:
+            return self.index.member_ids_of_type(self.node_id)
+        return self.index.neighbor_ids(node_ids)
+
+    def grow(self) -> np.ndarray:
+        """Advance one hop and return the newly reached ids."""
+        reached = self.neighbors(self.frontier)
+        reached = reached[self.hops[reached] == -1]
+        self.level += 1
+        self.hops[reached] = self.level
+        self.frontier = reached
+        return reached
+
+    def previous(self, node_id: int) -> list:
+        """Neighbours of 'node_id' one hop closer to this side's end."""
+        hop = int(self.hops[node_id])
+        if hop == 1 and self.is_type_node:
+            return [self.node_id]
+        candidates = self.index.neighbor_ids(np.array([node_id], dtype=np.int32))
+        return candidates[self.hops[candidates] == hop - 1].tolist()
+
+
+def _chains(side: _Side, node_id: int, limit: int) -> list:
+    """Up to 'limit' id chains from 'node_id' back to the side's end (both included)."""
+    if side.hops[node_id] == 0:
+        return [[node_id]]
+    chains = []
+    for previous_id in side.previous(node_id):
+        for chain in _chains(side, previous_id, limit - len(chains)):
+            chains.append([node_id] + chain)
+            if len(chains) >= limit:
+                return chains
+    return chains
+
+
+def _resolve(index: GraphIndex, name) -> tuple | None:
+    """(node id, whether it is expanded as a type) as resolve_active_node() decides, or None."""
+    node_id = index.node_id(name)
+    if node_id is None:
+        return None
+    if index.node_attributes_of(name) is not None:
+        return node_id, False
+    if name in index.all_types:
+        return node_id, True
+    return None
+
+
+def _describe(index: GraphIndex, path: list, type_ends: set) -> dict:
+    nodes = [{"name": index.name(node_id), "type": index.node_type(node_id)} for node_id in path]
+    edges = []
+    for node_id, next_id in zip(path, path[1:]):
+        if node_id in type_ends or next_id in type_ends:
+            relationship, direction = None, "type"
+        else:
+            relationship, direction = index.edge_between(node_id, next_id)
+        edges.append({
+            "from": index.name(node_id), "to": index.name(next_id),
+            "relationship": relationship, "direction": direction,
+        })
+    return {"nodes": nodes, "edges": edges}
+
+
+def shortest_paths(index: GraphIndex, source, target, max_hops: int = DEFAULT_MAX_HOPS, limit: int = 1) -> dict:
+    """
+    Up to 'limit' shortest paths between 'source' and 'target' of at most 'max_hops' edges:
+    {"source", "target", "found", "hops", "paths": [{"nodes": [...], "edges": [...]}, ...]}.
+    Each edge gives the relationship of the row behind it and its direction:
+    "downstream" when 'from' depends on 'to', "upstream" when 'to' depends on 'from'.
+    """
+    result = {"source": source, "target": target, "maxHops": max_hops, "found": False, "hops": None, "paths": []}
+    ends = []
+    for name in (source, target):
+        resolved = _resolve(index, name)
+        if resolved is None:
+            return {"error": f"No data found for node: {name}"}
+        ends.append(resolved)
+    (source_id, source_is_type), (target_id, target_is_type) = ends
+    type_ends = {node_id for node_id, is_type_node in ends if is_type_node}
+
+    if source_id == target_id:
+        result.update(found=True, hops=0, paths=[_describe(index, [source_id], type_ends)])
+        return result
+
+    forward = _Side(index, source_id, source_is_type)
+    backward = _Side(index, target_id, target_is_type)
+    while forward.level + backward.level < max_hops and len(forward.frontier) and len(backward.frontier):
+        # Grow whichever side has fewer nodes to expand
+        side, other = (forward, backward) if len(forward.frontier) <= len(backward.frontier) else (backward, forward)
+        reached = side.grow()
+        met = reached[other.hops[reached] != -1]
+        if not len(met):
+            continue
+
+        # Every shortest path crosses this layer exactly once, at one of the closest meeting nodes
+        total = side.level + other.hops[met]
+        length = int(total.min())
+        paths = []
+        for meeting_id in met[total == length].tolist():
+            for head in _chains(forward, meeting_id, limit - len(paths)):
+                for tail in _chains(backward, meeting_id, limit - len(paths)):
+                    paths.append(head[::-1] + tail[1:])
+                    if len(paths) >= limit:
+                        break
+                if len(paths) >= limit:
+                    break
+            if len(paths) >= limit:
+                break
+        result.update(found=True, hops=length, paths=[_describe(index, path, type_ends) for path in paths])
+        return result
+
+    return result
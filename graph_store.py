@@ -0,0 +1,206 @@
+import os
+import threading
+import pandas as pd
+from graph_delta import GraphChanges, diff_frames
+from graph_index import GraphIndex
+from search_index import SearchIndex
+from shared_graph import open_shared_graph
+from sqlite_store import SqliteGraphIndex, open_workbook
+from workbook_snapshot import read_snapshot, write_snapshot
+
+DEFAULT_EXCEL_FILE = 'data/network_diagram.xlsx'
+
+# Where the loaded workbook lives: "memory" (a DataFrame plus GraphIndex per process),
+# "sqlite" (an indexed SQLite copy shared by every process, see sqlite_store.py)
+# or "shared" (one memory-mapped GraphIndex shared by every process, see shared_graph.py)
+GRAPH_BACKENDS = ("memory", "sqlite", "shared")
+
+
+def read_workbook(excel_file: str) -> pd.DataFrame:
+    """
+    Parse the workbook into a DataFrame with normalized 'CI_Name' / 'Dependency_Name' columns.
+    This is the only place the Excel file is actually read (see load_workbook()).
+    """
+    data = pd.read_excel(excel_file)
+    # Normalize 'CI_Name' and 'Dependency_Name' by stripping spaces
+    data['CI_Name'] = data['CI_Name'].astype(str).str.strip()
+    data['Dependency_Name'] = data['Dependency_Name'].astype(str).str.strip()
+    return data
+
+
+def load_workbook(excel_file: str, signature: tuple) -> pd.DataFrame:
+    """
+    Return the normalized workbook contents, from the binary sidecar snapshot when it was
+    built from this exact version of the file, else by parsing the Excel file (and then
+    writing a fresh sidecar so the next worker or reload can skip the parse).
+    """
+    data = read_snapshot(excel_file, signature)
+    if data is None:
+        data = read_workbook(excel_file)
+        write_snapshot(data, excel_file, signature)
+    return data
+
+
+class GraphSnapshot:
+    """
+    One immutable, fully-built view of the workbook.
+    Requests grab a snapshot once and use it for their whole lifetime, so a reload
+    happening in the middle of a request never changes the data under their feet.
+    Treat 'data' as read-only: it is shared by every request in the process.
+    With the SQLite backend 'data' is the SqliteWorkbook and 'index' its SqliteGraphIndex,
+    with the shared backend 'data' is the SharedGraph and 'index' the GraphIndex it maps.
+
+    'changes' describes what differs from the previous snapshot (a GraphChanges) while
+    reload listeners run, so they can keep whatever the edit did not affect; it is
+    None for the first load and for reloads that were not worth diffing.
+    """
+
+    def __init__(self, data, version: int, signature: tuple, index=None):
+        self.data = data
+        self.changes = None
+        self.index = index if index is not None else GraphIndex(data)
+        # Name lookups for /search: built with the rest of the snapshot when it is all in
+        # memory anyway, else only once /search is used (see search_index)
+        self._search_index = SearchIndex(self.index) if isinstance(data, pd.DataFrame) else None
+        self._search_lock = threading.Lock()
+        if isinstance(data, pd.DataFrame):
+            self.active_node = data.loc[0, 'CI_Name'] if not data.empty else None
+        else:
+            self.active_node = data.default_active_node()
+        self.version = version
+        self.signature = signature
+        # Identifies the workbook contents independently of this process's reload counter,
+        # so every worker derives the same ETags for the same file
+        self.data_tag = f"{signature[0]:x}-{signature[1]:x}"
+
+    @property
+    def search_index(self) -> SearchIndex:
+        """
+        The /search index of this snapshot. With the SQLite and shared backends it is built
+        on first use: it holds every name and description on the process's own heap, and
+        building it reads the attributes of every node, so processes that never serve
+        /search should not pay for it at every load.
+        """
+        if self._search_index is None:
+            with self._search_lock:
+                if self._search_index is None:
+                    self._search_index = SearchIndex(self.index)
+        return self._search_index
+
+
+class GraphStore:
+    """
+    Process-wide holder of the current GraphSnapshot for one workbook.
+    The workbook is parsed once and only re-read when its mtime or size changes.
+    The lock makes sure only one thread rebuilds, and the new snapshot is swapped
+    in with a single assignment once it is complete.
+    'backend' is one of GRAPH_BACKENDS, by default the GRAPH_BACKEND variable (else "memory").
+    """
+
+    def __init__(self, excel_file: str = DEFAULT_EXCEL_FILE, backend: str = None):
+        backend = backend or os.getenv("GRAPH_BACKEND", "memory")
+        if backend not in GRAPH_BACKENDS:
+            raise ValueError(f"GRAPH_BACKEND must be one of {', '.join(GRAPH_BACKENDS)}")
+        self.excel_file = excel_file
+        self.backend = backend
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._version = 0
+        self._reload_listeners = []
+
+    def add_reload_listener(self, callback):
+        """
+        Register 'callback(snapshot)' to run every time a new snapshot is swapped in,
+        e.g. to drop caches that were built from the previous one.
+        """
+        self._reload_listeners.append(callback)
+
+    def _file_signature(self) -> tuple | None:
+        try:
+            stat = os.stat(self.excel_file)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def get(self) -> GraphSnapshot | None:
+        """
+        Return the current snapshot, reloading first if the file changed on disk.
+        If a reload fails we keep serving the last good snapshot (if any).
+        """
+        signature = self._file_signature()
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.signature == signature:
+            return snapshot
+
+        with self._lock:
+            # Another thread may have finished the reload while we waited
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot.signature == signature:
+                return snapshot
+            try:
+                if signature is None:
+                    raise FileNotFoundError(f"{self.excel_file} not found.")
+                # The version only moves on once the new snapshot loaded
+                new_snapshot = self._load(signature, self._version + 1)
+                if snapshot is not None:
+                    self._diff(snapshot, new_snapshot)
+                self._version = new_snapshot.version
+                self._snapshot = new_snapshot
+            except Exception as e:
+                print(f"An error occurred while loading {self.excel_file}: {e}")
+                return self._snapshot
+
+            for callback in self._reload_listeners:
+                try:
+                    callback(new_snapshot)
+                except Exception as e:
+                    print(f"Reload listener failed: {e}")
+            return new_snapshot
+
+    def _load(self, signature: tuple, version: int) -> GraphSnapshot:
+        if self.backend == "sqlite":
+            workbook = open_workbook(self.excel_file, signature)
+            return GraphSnapshot(workbook, version, signature, index=SqliteGraphIndex(workbook))
+        if self.backend == "shared":
+            graph = open_shared_graph(self.excel_file, signature, lambda: load_workbook(self.excel_file, signature))
+            if graph is not None:
+                return GraphSnapshot(graph, version, signature, index=graph.index)
+            # The workbook holds values the shared file cannot store: keep it in this process
+        data = load_workbook(self.excel_file, signature)
+        return GraphSnapshot(data, version, signature)
+
+    def _diff(self, old: GraphSnapshot, new: GraphSnapshot):
+        """Attach what changed since 'old' to 'new', unless it is easier to treat as a full reload."""
+        if not isinstance(new.data, pd.DataFrame):
+            # The SQLite and shared backends never hold both versions' rows: always a full reload
+            print(f"Reloaded {self.excel_file} (full reload)")
+            return
+        try:
+            delta = diff_frames(old.data, new.data)
+        except Exception as e:
+            print(f"Could not diff {self.excel_file} against the loaded data: {e}")
+            return
+        if delta is None:
+            print(f"Reloaded {self.excel_file} (full reload)")
+            return
+        print(f"Reloaded {self.excel_file}: {delta.upserted} edges added or modified, {delta.deleted} deleted")
+        new.changes = GraphChanges(delta, new.index)
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_graph_store(excel_file: str = DEFAULT_EXCEL_FILE) -> GraphStore:
+    """
+    Return the shared GraphStore for 'excel_file', creating it on first use.
+    """
+    key = os.path.abspath(excel_file)
+    store = _stores.get(key)
+    if store is None:
+        with _stores_lock:
+            store = _stores.get(key)
+            if store is None:
+                store = GraphStore(excel_file)
+                _stores[key] = store
+    return store
@@ -0,0 +1,55 @@
+"""
+Production entry point:
+    gunicorn -c gunicorn.conf.py
+
+The app (and with it the workbook and its graph index) is loaded once in the master
+before the workers are forked, so every worker starts out sharing those pages
+copy-on-write instead of each parsing the workbook itself, with the warm-up views
+(warmup.py) already in their hierarchy cache. Heavy traversals are
+limited per worker by traversal_pool.TraversalPool (TRAVERSAL_* variables).
+
+Once the workbook changes, every worker reloads it into private memory of its own.
+With GRAPH_BACKEND=shared (shared_graph.py) the graph index is instead built once into a
+file that the master and all workers map read-only: after a change the first worker to
+notice rebuilds the file while the others wait, then they all switch to the new mapping,
+so adding workers does not add copies of the graph.
+"""
+import gc
+import multiprocessing
+import os
+
+wsgi_app = "main:app"
+bind = f"0.0.0.0:{os.getenv('PORT', 5000)}"
+
+# Load main.py (and the graph) in the master, then fork
+preload_app = True
+
+workers = int(os.getenv("WEB_CONCURRENCY", min(multiprocessing.cpu_count(), 4)))
+# Threads let cheap requests be served while a worker is busy with a traversal
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", 8))
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 60))
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle workers now and then so a reloaded workbook's private copies do not pile up
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 5000))
+max_requests_jitter = max_requests // 10
+
+accesslog = "-"
+errorlog = "-"
+
+
+def child_exit(server, worker):
+    # With PROMETHEUS_MULTIPROC_DIR set, drop the live gauges of workers that exit
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
+
+
+def when_ready(server):
+    # Move everything loaded so far out of the garbage collector's reach, so its
+    # passes in the workers do not touch (and so copy) the shared pages
+    gc.collect()
+    gc.freeze()
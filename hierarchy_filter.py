@@ -0,0 +1,124 @@
+"""
+Include/exclude filters for hierarchy views:
+    /?relType=A&excludeRelType=B&nodeType=C&excludeNodeType=D&indirect=0
+
+The filters are applied by the traversal itself rather than to the finished tree:
+edges with a filtered-out Rel_Type and groups of a filtered-out node type are never
+followed, so nothing behind them is walked, serialized or sent. indirect=0 leaves out
+the indirectRelationships lists, which are then not gathered at all.
+"""
+import numpy as np
+from graph_index import GraphIndex
+
+# Query arguments (and /batch-hierarchy query fields) holding lists of values
+FILTER_LISTS = ("relType", "excludeRelType", "nodeType", "excludeNodeType")
+
+
+def _values(values) -> tuple | None:
+    """Distinct non-empty values in a canonical order, or None when there are none."""
+    values = {value for value in values or () if value not in (None, "")}
+    return tuple(sorted(values, key=str)) if values else None
+
+
+class HierarchyFilter:
+    """
+    Which edges and groups a hierarchy view keeps. An include list keeps only the
+    listed values, an exclude list drops them; None means no restriction.
+    Filters compare (and hash) by value, so they can be part of cache keys.
+    """
+
+    def __init__(self, rel_types=None, exclude_rel_types=None, node_types=None,
+                 exclude_node_types=None, indirect: bool = True):
+        self.rel_types = _values(rel_types)
+        self.exclude_rel_types = _values(exclude_rel_types)
+        self.node_types = _values(node_types)
+        self.exclude_node_types = _values(exclude_node_types)
+        self.indirect = bool(indirect)
+
+    @classmethod
+    def from_lists(cls, get_list, indirect) -> "HierarchyFilter":
+        """
+        Filter from 'get_list(name)' (the values given for each of FILTER_LISTS) and the
+        'indirect' flag as sent by the client ("0" / "false" / False switch it off).
+        """
+        if isinstance(indirect, str):
+            indirect = indirect.strip().lower() not in ("0", "false", "no", "off")
+        return cls(*(get_list(name) for name in FILTER_LISTS), indirect=indirect is None or bool(indirect))
+
+    def key(self) -> tuple:
+        return (self.rel_types, self.exclude_rel_types, self.node_types, self.exclude_node_types, self.indirect)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, HierarchyFilter) and self.key() == other.key()
+
+    def __hash__(self) -> int:
+        return hash(self.key())
+
+    def __repr__(self) -> str:
+        return f"HierarchyFilter{self.key()!r}"
+
+    def filters_edges(self) -> bool:
+        """Whether any edge or group can be dropped (as opposed to only leaving out indirects)."""
+        return any(values is not None for values in self.key()[:4])
+
+    def to_json(self) -> list | None:
+        """Compact form for cursors; None when nothing is filtered."""
+        if not self.filters_edges() and self.indirect:
+            return None
+        return [list(values) if values is not None else None for values in self.key()[:4]] + [self.indirect]
+
+    @classmethod
+    def from_json(cls, value) -> "HierarchyFilter":
+        if value is None:
+            return NO_FILTER
+        *lists, indirect = value
+        return cls(*lists, indirect=indirect)
+
+    def edge_filter(self, index: GraphIndex) -> "EdgeFilter | None":
+        """The filter resolved against the ids of 'index', or None if it keeps every edge."""
+        return EdgeFilter(self, index) if self.filters_edges() else None
+
+
+NO_FILTER = HierarchyFilter()
+
+
+class EdgeFilter:
+    """
+    A HierarchyFilter in terms of one GraphIndex: relationship label ids and type name ids,
+    so whole adjacency slices can be masked at once.
+    """
+
+    def __init__(self, hierarchy_filter: HierarchyFilter, index: GraphIndex):
+        def ids(values, id_of):
+            if values is None:
+                return None
+            # Values the data does not contain match nothing
+            return np.array([value_id for value_id in map(id_of, values) if value_id is not None], dtype=np.int32)
+
+        self.rel_ids = ids(hierarchy_filter.rel_types, index.labels.id_of)
+        self.exclude_rel_ids = ids(hierarchy_filter.exclude_rel_types, index.labels.id_of)
+        self.type_ids = ids(hierarchy_filter.node_types, index.node_id)
+        self.exclude_type_ids = ids(hierarchy_filter.exclude_node_types, index.node_id)
+
+    def __call__(self, rel: np.ndarray, group: np.ndarray = None) -> np.ndarray:
+        """Which of the edges with relationship ids 'rel' (and group type ids 'group') to keep."""
+        keep = np.ones(len(rel), dtype=bool)
+        if self.rel_ids is not None:
+            keep &= np.isin(rel, self.rel_ids)
+        if self.exclude_rel_ids is not None:
+            keep &= ~np.isin(rel, self.exclude_rel_ids)
+        if group is not None:
+            if self.type_ids is not None:
+                keep &= np.isin(group, self.type_ids)
+            if self.exclude_type_ids is not None:
+                keep &= ~np.isin(group, self.exclude_type_ids)
+        return keep
+
+    def by_relationship(self, rel: np.ndarray, group: np.ndarray = None) -> np.ndarray:
+        """Like calling the filter, but ignoring node types."""
+        return self(rel)
+
+    def allows_type(self, type_id: int) -> bool:
+        if self.type_ids is not None and type_id not in self.type_ids:
+            return False
+        return self.exclude_type_ids is None or type_id not in self.exclude_type_ids
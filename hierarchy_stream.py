@@ -0,0 +1,144 @@
+"""
+Streaming variant of build_hierarchy() for very large views.
+
+Instead of building the nested dicts and then one big JSON string, the traversal
+fills compact tuples and the JSON is written out in chunks as it is generated.
+The active node's own fields are sent before the traversal starts, so the first
+bytes go out immediately whatever the size of the graph.
+"""
+import json
+import pandas as pd
+from data_extractor import resolve_active_node, walk_hierarchy
+from graph_index import GraphIndex
+from hierarchy_filter import NO_FILTER, HierarchyFilter
+from pagination import encode_cursor
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the standard library encoder works too
+    orjson = None
+
+# Chunks handed to the WSGI server are at least this big (except the first and last)
+CHUNK_SIZE = 64 * 1024
+
+
+def dumps(value) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+# Compact containers filled by walk_hierarchy():
+#   group: [groupType, relationship, children, more] (a list, so a "more" cursor can be set)
+#   node:  (name, parent, type, relationship, description, indirectRelationships, children)
+def _tuple_group(group_type, relationship):
+    children = []
+    return [group_type, relationship, children, None], children
+
+
+def _tuple_node(name, parent_name, node_type, relationship, description, indirects):
+    children = []
+    return (name, parent_name, node_type, relationship, description, indirects, children), children
+
+
+def _push_children(stack: list, children: list, closing: bytes):
+    # Items are popped from the end, so push the closing bracket first and the children reversed
+    stack.append(closing)
+    for position in range(len(children) - 1, -1, -1):
+        stack.append(children[position])
+        if position:
+            stack.append(b",")
+
+
+def _encode_groups(groups: list):
+    """Yield the JSON pieces of a list of groups, depth-first, without recursion."""
+    stack = []
+    _push_children(stack, groups, b"")
+    while stack:
+        item = stack.pop()
+        if isinstance(item, bytes):
+            if item:
+                yield item
+        elif len(item) == 4:
+            group_type, relationship, children, more = item
+            yield b'{"groupType":%b,"relationship":%b,' % (dumps(group_type), dumps(relationship))
+            if more is not None:
+                yield b'"more":%b,' % dumps(more)
+            yield b'"children":['
+            _push_children(stack, children, b"]}")
+        else:
+            name, parent_name, node_type, relationship, description, indirects, children = item
+            yield b'{"name":%b,"parent":%b,"type":%b,"relationship":%b,"description":%b' % (
+                dumps(name), dumps(parent_name), dumps(node_type), dumps(relationship), dumps(description)
+            )
+            if indirects is not None:
+                yield b',"indirectRelationships":%b' % dumps(indirects)
+            yield b',"children":['
+            _push_children(stack, children, b"]}")
+
+
+def _chunked(pieces):
+    buffer = []
+    size = 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= CHUNK_SIZE:
+            yield b"".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+def _call(fn, *args, **kwargs):
+    return fn(*args, **kwargs)
+
+
+def stream_hierarchy(data: pd.DataFrame, depth: int, active_node: str, index: GraphIndex = None,
+                     max_nodes: int = None, group_limit: int = None, data_tag: str = "",
+                     filters: HierarchyFilter = NO_FILTER, run=None):
+    """
+    Generator of JSON byte chunks describing the same hierarchy as build_hierarchy()
+    (same keys and values; key order and whitespace may differ), including its
+    max_nodes / group_limit budget and its filters.
+    'run(fn, *args, **kwargs)' runs the traversal itself, e.g. on a traversal pool slot
+    (see traversal_pool.Reservation); by default it runs right here.
+    """
+    if index is None:
+        index = GraphIndex(data)
+
+    resolved = resolve_active_node(index, active_node, filters.indirect)
+    if resolved is None:
+        yield dumps({"error": f"No data found for active node: {active_node}"})
+        return
+    active_id, is_type_node, active_node_relationships = resolved
+
+    # The active node's own fields are known before the traversal: send them right away
+    header = [b"{"]
+    for key, value in active_node_relationships.items():
+        if key != "children":
+            header.append(b'"%b":%b,' % (key.encode("utf-8"), dumps(value)))
+    header.append(b'"children":[')
+    yield b"".join(header)
+
+    view = [active_node, depth, max_nodes, group_limit]
+
+    def mark_more(group, parent_name, kind, group_type, offset):
+        group[3] = encode_cursor(
+            data_tag, parent_name, kind, group_type, offset, group_limit or max_nodes, filters.to_json(), view
+        )
+
+    total_count, truncated = 1, False
+    # If user asked for depth=1, return just the single node
+    if depth != 1:
+        root_children = []
+        total_count, truncated = (run or _call)(
+            walk_hierarchy, index, depth, active_id, is_type_node, root_children, _tuple_group, _tuple_node,
+            max_nodes=max_nodes, group_limit=group_limit, mark_more=mark_more, filters=filters
+        )
+        yield from _chunked(_encode_groups(root_children))
+
+    yield b'],'
+    if truncated:
+        yield b'"truncated":true,'
+    yield b'"totalNodesDisplayed":%d}' % total_count
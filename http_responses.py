@@ -0,0 +1,118 @@
+import gzip
+import hashlib
+from flask import current_app, request
+from request_timing import stage
+from response_cache import LRUCache
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; without it we only offer gzip
+    brotli = None
+
+# Bodies smaller than this are sent as-is: compressing them costs more than it saves
+MIN_COMPRESS_SIZE = 1024
+
+
+def make_etag(*parts) -> str:
+    """
+    Strong ETag (without quotes) for a response identified by 'parts',
+    e.g. the snapshot's data_tag plus the route and query arguments.
+    """
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+
+
+def _encoders() -> dict:
+    encoders = {"gzip": lambda body: gzip.compress(body, compresslevel=6)}
+    if brotli is not None:
+        encoders["br"] = lambda body: brotli.compress(body, quality=5)
+    return encoders
+
+
+ENCODERS = _encoders()
+
+
+def choose_encoding(body: bytes) -> str | None:
+    """Pick the best content-coding the client accepts for 'body', or None to send it raw."""
+    if len(body) < MIN_COMPRESS_SIZE:
+        return None
+    accepted = request.accept_encodings
+    for encoding in ("br", "gzip"):
+        if encoding in ENCODERS and accepted[encoding]:
+            return encoding
+    return None
+
+
+def _variant_etag(etag: str, encoding: str | None) -> str:
+    # Each content-coding is a different representation, so it gets its own strong tag
+    return f"{etag}-{encoding}" if encoding else etag
+
+
+def _matching_etag(etag: str) -> str | None:
+    """Return whichever representation of 'etag' the client sent in If-None-Match, if any."""
+    if_none_match = request.if_none_match
+    if not if_none_match:
+        return None
+    for encoding in (None, *ENCODERS):
+        variant = _variant_etag(etag, encoding)
+        if if_none_match.star_tag or if_none_match.contains(variant):
+            return variant
+    return None
+
+
+def not_modified_response(etag: str):
+    """
+    Return a 304 response if the client already holds a representation of 'etag',
+    else None. Call this before building the body to skip that work entirely.
+    """
+    matched = _matching_etag(etag)
+    if matched is None:
+        return None
+    response = current_app.response_class(status=304)
+    response.set_etag(matched)
+    response.headers["Cache-Control"] = "no-cache"
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+def json_response(body: bytes, etag: str, encoded_cache: LRUCache):
+    """
+    Build the response for serialized JSON 'body': 304 if the client's copy is current,
+    otherwise the body, compressed when worthwhile. Compressed variants are kept in
+    'encoded_cache' so each one is only compressed once per data version.
+    """
+    response = not_modified_response(etag)
+    if response is not None:
+        return response
+
+    encoding = choose_encoding(body)
+    if encoding is not None:
+        cache_key = (etag, encoding)
+        encoded = encoded_cache.get(cache_key)
+        if encoded is None:
+            with stage("compress"):
+                encoded = ENCODERS[encoding](body)
+            encoded_cache.put(cache_key, encoded)
+        body = encoded
+
+    response = current_app.response_class(body, mimetype=current_app.json.mimetype)
+    if encoding is not None:
+        response.headers["Content-Encoding"] = encoding
+    response.set_etag(_variant_etag(etag, encoding))
+    # Let browsers keep the body but always revalidate it with If-None-Match
+    response.headers["Cache-Control"] = "no-cache"
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+def streamed_json_response(chunks, etag: str, on_close=None):
+    """
+    Response that sends JSON produced piece by piece by the 'chunks' generator.
+    Streamed bodies are neither cached nor compressed here, but still revalidate by ETag.
+    'on_close()' is called once the response is closed, whether or not it was sent in full.
+    """
+    response = current_app.response_class(chunks, mimetype=current_app.json.mimetype)
+    if on_close is not None:
+        response.call_on_close(on_close)
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
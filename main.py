@@ -1,55 +1,500 @@
-from flask import Flask, jsonify, render_template, request
-from data_extractor import build_hierarchy
-from data_extractor import fetch_graph_data
-from data_extractor import get_grouped_assets
-from data_extractor import get_all_dependencies
-import os
-
-
-app = Flask(__name__)
-
-@app.route("/", methods=["GET"])
-def index():
-    if request.headers.get("Accept") == "application/json":
-        try:
-            # Get depth and activeNode from query parameters
-            depth = int(request.args.get('depth', 2))  # Default to 2
-            requested_active_node = request.args.get('activeNode', None)  # Value sent from JS
-
-            # Fetch graph data and backend default active node
-            data, backend_default_active_node = fetch_graph_data()
-
-            if data is None or backend_default_active_node is None:
-                return jsonify({"error": "Unable to load data"}), 500
-
-            # Use the requested active node if provided; otherwise, fallback to backend default
-            active_node = requested_active_node if requested_active_node else backend_default_active_node
-
-            # Build the hierarchy based on depth and active node
-            hierarchy = build_hierarchy(data, depth, active_node)
-
-            # Return the JSON response
-            return jsonify(hierarchy)
-        except Exception as e:
-            print(f"Error in index route: {e}")
-            return jsonify({"error": str(e)}), 500
-    else:
-        # Render the HTML page for non-JSON requests
-        return render_template('index.html')
-    
-@app.route('/all-dependencies', methods=['GET'])
-def all_dependencies():
-    try:
-        dependencies_list = get_all_dependencies()  # returns list of {Dependency_Type, Dependency_Name, Dependency_Descrip}
-        return jsonify(dependencies_list)
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/all-assets', methods=['GET'])
-def all_assets():
-    groups = get_grouped_assets()
-    return jsonify(groups)
-
-if __name__ == "__main__":
-    port = int(os.getenv("PORT", 5000))  # Default to 5000 if PORT is not set
-    app.run(host="0.0.0.0", port=port, debug=True)
+from flask import Flask, jsonify, render_template, request
+from data_extractor import Frontier
+from data_extractor import build_hierarchy
+from data_extractor import build_hierarchy_delta
+from data_extractor import fetch_graph_data
+from data_extractor import fetch_graph_snapshot
+from data_extractor import get_grouped_assets
+from data_extractor import get_all_dependencies
+from data_extractor import get_group_children
+from data_extractor import get_impact
+from data_extractor import view_frontier
+from graph_paths import DEFAULT_MAX_HOPS, MAX_HOPS_LIMIT, shortest_paths
+from graph_store import get_graph_store
+from hierarchy_filter import NO_FILTER, HierarchyFilter
+from hierarchy_stream import stream_hierarchy
+from http_responses import json_response, make_etag, not_modified_response, streamed_json_response
+from metrics import init_metrics
+from pagination import StaleCursorError, decode_frontier_token
+from request_timing import stage
+from response_cache import LRUCache
+from traversal_pool import PoolBusyError, traversal_pool_from_env
+from warmup import RequestCounter, hierarchy_warmer_from_env
+import os
+
+
+app = Flask(__name__)
+
+# Serialized /?depth=N&activeNode=X responses, keyed by
+# (active node, depth, maxNodes, groupLimit, filters, data version).
+# Sized/aged via HIERARCHY_CACHE_SIZE (entries) and HIERARCHY_CACHE_TTL (seconds).
+hierarchy_cache = LRUCache(
+    max_size=int(os.getenv("HIERARCHY_CACHE_SIZE", 256)),
+    ttl=float(os.getenv("HIERARCHY_CACHE_TTL", 300)),
+)
+# Where recently built views stopped, keyed like hierarchy_cache, so the next depth
+# resumes from there (see build_hierarchy_delta); FRONTIER_CACHE_SIZE entries
+frontier_cache = LRUCache(max_size=int(os.getenv("FRONTIER_CACHE_SIZE", 64)), ttl=0)
+# /all-assets and /all-dependencies bodies (identical for every user), keyed by ETag
+payload_cache = LRUCache(max_size=16, ttl=0)
+# gzip/brotli variants of any of the above, keyed by (ETag, encoding)
+encoded_cache = LRUCache(max_size=int(os.getenv("ENCODED_CACHE_SIZE", 256)), ttl=0)
+
+# Most views one /batch-hierarchy request may ask for
+MAX_BATCH_QUERIES = int(os.getenv("BATCH_MAX_QUERIES", 100))
+
+# Bounded pool for building hierarchies that are not cached yet (see traversal_pool.py)
+traversal_pool = traversal_pool_from_env()
+
+def carry_over_hierarchy_cache(snapshot):
+    """
+    On reload, keep the cached views the edit could not have changed (re-keyed to the
+    new data version) unless they carry "more" cursors, and drop the rest; drop
+    everything after a full reload.
+    """
+    changes = snapshot.changes
+    if changes is None:
+        hierarchy_cache.clear()
+        return
+    # Walk out from the edits once, as far as the deepest cached view needs
+    depths = [key[1] for key in hierarchy_cache.keys()]
+    changes.distances(max([2, *depths]))
+
+    def carry_over(key, body):
+        *view, version = key
+        # A filtered view only shows part of the unfiltered one, so the same radius applies
+        if version != snapshot.version - 1 or changes.affects(view[0], view[1]):
+            return None
+        # "more" cursors are tied to the old data version: /group-children would refuse them
+        if b'"more"' in body:
+            return None
+        return (*view, snapshot.version)
+
+    hierarchy_cache.rekey(carry_over)
+
+# Request/stage timings and cache statistics at /metrics
+init_metrics(app, {"hierarchy": hierarchy_cache, "payload": payload_cache, "encoded": encoded_cache}, traversal_pool)
+
+# Entries built from an old workbook are useless once it reloads,
+# except the hierarchies away from what changed
+get_graph_store().add_reload_listener(carry_over_hierarchy_cache)
+for cache in (frontier_cache, payload_cache, encoded_cache):
+    get_graph_store().add_reload_listener(cache.clear)
+
+# Load the workbook into the shared graph store once at startup;
+# later requests reuse it until the file changes on disk.
+fetch_graph_data()
+
+# Which active nodes get asked for, so the warm-up can favour them
+request_counter = RequestCounter()
+
+def warm_hierarchy(snapshot, active_node, depth: int):
+    with app.app_context():
+        hierarchy_body(snapshot, active_node, depth, VIEW_MAX_NODES, VIEW_GROUP_LIMIT)
+
+# Prebuild the landing page and the heaviest views (see warmup.py) in the background
+# after every reload; the first load is warmed at the end of this module
+hierarchy_warmer = hierarchy_warmer_from_env(warm_hierarchy, request_counter)
+get_graph_store().add_reload_listener(hierarchy_warmer.start)
+
+def positive_int(name: str, value) -> int | None:
+    """'value' as a positive integer, or None when it is absent or empty."""
+    if value is None or value == '':
+        return None
+    value = int(value)
+    if value < 1:
+        raise ValueError(f"{name} must be a positive integer")
+    return value
+
+# Budget the page asks for with every view (VIEW_MAX_NODES nodes in total, VIEW_GROUP_LIMIT
+# per group; empty means unbounded), so the warm-up builds the views the page will ask for
+VIEW_MAX_NODES = positive_int("VIEW_MAX_NODES", os.getenv("VIEW_MAX_NODES", 2000))
+VIEW_GROUP_LIMIT = positive_int("VIEW_GROUP_LIMIT", os.getenv("VIEW_GROUP_LIMIT", 50))
+
+def optional_int_arg(name: str) -> int | None:
+    """Positive integer query argument, or None when it is absent or empty."""
+    return positive_int(name, request.args.get(name, ''))
+
+def list_field(query: dict, name: str) -> list:
+    """A /batch-hierarchy query field holding one value or a list of them."""
+    value = query.get(name)
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value]
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise ValueError(f"{name} must be a string or a list of strings")
+    return value
+
+def hierarchy_body(snapshot, active_node, depth: int, max_nodes: int = None, group_limit: int = None,
+                   filters: HierarchyFilter = NO_FILTER) -> bytes:
+    """
+    Serialized hierarchy for one view of 'snapshot', from the cache when possible,
+    else built on the traversal pool and cached.
+    """
+    cache_key = (active_node, depth, max_nodes, group_limit, filters, snapshot.version)
+    body = hierarchy_cache.get(cache_key)
+    if body is None:
+        # Build the hierarchy based on depth and active node
+        frontier = Frontier()
+        hierarchy = traversal_pool.run(
+            build_hierarchy, snapshot.data, depth, active_node, snapshot.index,
+            max_nodes=max_nodes, group_limit=group_limit, data_tag=snapshot.data_tag, filters=filters,
+            frontier=frontier
+        )
+        body = cache_hierarchy(cache_key, hierarchy, frontier)
+    return body
+
+def cache_hierarchy(cache_key: tuple, hierarchy: dict, frontier: Frontier) -> bytes:
+    """
+    Serialize a view just built under 'cache_key' (as in hierarchy_body) into hierarchy_cache,
+    keeping where its traversal stopped in frontier_cache.
+    """
+    depth = cache_key[1]
+    if depth >= 1 and "error" not in hierarchy:
+        frontier_cache.put(cache_key, frontier)
+    with stage("serialize"):
+        body = jsonify(hierarchy).get_data()
+    hierarchy_cache.put(cache_key, body)
+    return body
+
+def hierarchy_delta_response(snapshot):
+    """
+    /?activeNode=X&depth=D&fromDepth=F (plus the view's maxNodes, groupLimit and filters),
+    or /?frontier=<token>[&depth=D]: only what depth D adds to the view at depth F (the
+    token's view), resumed from where that view's traversal stopped when this worker has it.
+    """
+    try:
+        token = request.args.get('frontier')
+        if token:
+            fields = decode_frontier_token(token, snapshot.data_tag)
+            active_node, from_depth = fields["activeNode"], fields["depth"]
+            max_nodes, group_limit = fields["maxNodes"], fields["groupLimit"]
+            filters = HierarchyFilter.from_json(fields["filters"])
+        else:
+            active_node = request.args.get('activeNode') or snapshot.active_node
+            from_depth = optional_int_arg('fromDepth')
+            max_nodes = optional_int_arg('maxNodes')
+            group_limit = optional_int_arg('groupLimit')
+            filters = HierarchyFilter.from_lists(request.args.getlist, request.args.get('indirect'))
+        depth = int(request.args.get('depth') or from_depth + 1)
+        if not 1 <= from_depth < depth:
+            raise ValueError("fromDepth must be at least 1 and less than depth")
+    except StaleCursorError as e:
+        return jsonify({"error": str(e)}), 410
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+
+    etag = make_etag(snapshot.data_tag, "/", "delta", active_node, depth, from_depth, max_nodes, group_limit, filters)
+    response = not_modified_response(etag)
+    if response is not None:
+        return response
+
+    view = (max_nodes, group_limit, filters, snapshot.version)
+    result, frontier = traversal_pool.run(
+        build_hierarchy_delta, snapshot.data, depth, active_node, from_depth, snapshot.index,
+        frontier=frontier_cache.get((active_node, from_depth, *view)),
+        max_nodes=max_nodes, group_limit=group_limit, data_tag=snapshot.data_tag, filters=filters
+    )
+    if frontier is not None:
+        frontier_cache.put((active_node, depth, *view), frontier)
+    with stage("serialize"):
+        body = jsonify(result).get_data()
+    return json_response(body, etag, encoded_cache)
+
+def cached_view_frontier(snapshot, index, active_node, depth: int, max_nodes: int, group_limit: int,
+                         filters: HierarchyFilter):
+    """The Frontier of one view of 'snapshot', as cached by the view itself or else walked again on the pool."""
+    key = (active_node, depth, max_nodes, group_limit, filters, snapshot.version)
+    frontier = frontier_cache.get(key)
+    if frontier is None:
+        frontier = traversal_pool.run(view_frontier, index, active_node, depth, max_nodes, group_limit, filters)
+        if frontier is not None:
+            frontier_cache.put(key, frontier)
+    return frontier
+
+def pool_busy_response(error: PoolBusyError):
+    response = jsonify({"error": str(error)})
+    response.headers["Retry-After"] = "1"
+    return response, 503
+
+@app.route("/", methods=["GET"])
+def index():
+    if request.headers.get("Accept") == "application/json":
+        try:
+            # Get depth and activeNode from query parameters
+            depth = int(request.args.get('depth', 2))  # Default to 2
+            requested_active_node = request.args.get('activeNode', None)  # Value sent from JS
+            # stream=1 sends very large hierarchies in chunks instead of one big body
+            stream = request.args.get('stream', '').lower() in ('1', 'true')
+            # Optional budget: maxNodes in total, groupLimit children per group;
+            # groups cut short carry a "more" cursor for /group-children
+            max_nodes = optional_int_arg('maxNodes')
+            group_limit = optional_int_arg('groupLimit')
+            # Optional filters, applied while traversing (see hierarchy_filter.py):
+            # relType / excludeRelType / nodeType / excludeNodeType (repeatable), indirect=0
+            filters = HierarchyFilter.from_lists(request.args.getlist, request.args.get('indirect'))
+
+            # Fetch graph data, its prebuilt index and the backend default active node
+            snapshot = fetch_graph_snapshot()
+
+            if snapshot is None or snapshot.active_node is None:
+                return jsonify({"error": "Unable to load data"}), 500
+            backend_default_active_node = snapshot.active_node
+
+            # Delta mode: only the nodes a deeper view adds to one the client already has
+            if request.args.get('fromDepth') or request.args.get('frontier'):
+                return hierarchy_delta_response(snapshot)
+
+            # Use the requested active node if provided; otherwise, fallback to backend default
+            active_node = requested_active_node if requested_active_node else backend_default_active_node
+
+            request_counter.record(active_node)
+
+            # Nothing to send if the browser already has this view of this data version
+            etag = make_etag(snapshot.data_tag, "/", active_node, depth, stream, max_nodes, group_limit, filters)
+            response = not_modified_response(etag)
+            if response is not None:
+                return response
+
+            if stream:
+                # The traversal slot is taken up front, so a full pool still gets a 503; it is
+                # given back once the walk is done, or when the response closes without it
+                reservation = traversal_pool.reserve()
+                chunks = stream_hierarchy(
+                    snapshot.data, depth, active_node, snapshot.index, max_nodes=max_nodes,
+                    group_limit=group_limit, data_tag=snapshot.data_tag, filters=filters, run=reservation.run
+                )
+                return streamed_json_response(chunks, etag, on_close=reservation.release)
+
+            # Serve popular views straight from the cache
+            body = hierarchy_body(snapshot, active_node, depth, max_nodes, group_limit, filters)
+
+            # Return the JSON response
+            return json_response(body, etag, encoded_cache)
+        except PoolBusyError as e:
+            return pool_busy_response(e)
+        except Exception as e:
+            print(f"Error in index route: {e}")
+            return jsonify({"error": str(e)}), 500
+    else:
+        # Render the HTML page for non-JSON requests
+        return render_template('index.html', maxNodes=VIEW_MAX_NODES, groupLimit=VIEW_GROUP_LIMIT)
+    
+def cached_payload_response(snapshot, route: str, build):
+    """
+    Respond with the JSON produced by 'build()' for a payload that only depends on
+    the data version, reusing the serialized (and compressed) body between requests.
+    """
+    etag = make_etag(snapshot.data_tag, route)
+    response = not_modified_response(etag)
+    if response is not None:
+        return response
+
+    body = payload_cache.get(etag)
+    if body is None:
+        body = jsonify(build()).get_data()
+        payload_cache.put(etag, body)
+    return json_response(body, etag, encoded_cache)
+
+@app.route('/batch-hierarchy', methods=['POST'])
+def batch_hierarchy():
+    """
+    Many views in one round trip, all from the same data snapshot:
+        POST {"queries": [{"activeNode": "X", "depth": 2, "maxNodes": 500, "groupLimit": 50,
+                           "excludeRelType": ["Hosts"], "indirect": false}, ...],
+              "parallel": true}
+    Each query takes the same (optional) parameters as /. The response is
+    {"results": [...]} with, in query order, exactly what / returns for each view.
+    Repeated queries are built once; "parallel" builds the uncached ones concurrently.
+    """
+    payload = request.get_json(silent=True) or {}
+    queries = payload.get("queries")
+    if not isinstance(queries, list) or not queries:
+        return jsonify({"error": "Expected a non-empty list of queries"}), 400
+    if len(queries) > MAX_BATCH_QUERIES:
+        return jsonify({"error": f"At most {MAX_BATCH_QUERIES} queries per batch"}), 400
+
+    snapshot = fetch_graph_snapshot()
+    if snapshot is None or snapshot.active_node is None:
+        return jsonify({"error": "Unable to load data"}), 500
+
+    try:
+        views = []
+        for query in queries:
+            if not isinstance(query, dict):
+                raise ValueError("Each query must be an object")
+            views.append((
+                query.get("activeNode") or snapshot.active_node,
+                int(query.get("depth", 2)),
+                positive_int("maxNodes", query.get("maxNodes")),
+                positive_int("groupLimit", query.get("groupLimit")),
+                HierarchyFilter.from_lists(lambda name: list_field(query, name), query.get("indirect")),
+            ))
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        bodies = {}
+        unique_views = list(dict.fromkeys(views))
+        if payload.get("parallel"):
+            # Build the views that are not cached yet side by side on the traversal pool
+            missing = [view for view in unique_views if (*view, snapshot.version) not in hierarchy_cache]
+            frontiers = [Frontier() for _ in missing]
+            built = traversal_pool.run_all([
+                (build_hierarchy, (snapshot.data, depth, active_node, snapshot.index),
+                 {"max_nodes": max_nodes, "group_limit": group_limit, "data_tag": snapshot.data_tag,
+                  "filters": filters, "frontier": frontier})
+                for (active_node, depth, max_nodes, group_limit, filters), frontier in zip(missing, frontiers)
+            ])
+            for view, hierarchy, frontier in zip(missing, built, frontiers):
+                bodies[view] = cache_hierarchy((*view, snapshot.version), hierarchy, frontier)
+        for view in unique_views:
+            if view not in bodies:
+                bodies[view] = hierarchy_body(snapshot, *view)
+    except PoolBusyError as e:
+        return pool_busy_response(e)
+
+    body = b'{"results":[%b]}\n' % b",".join(bodies[view].rstrip(b"\n") for view in views)
+    etag = make_etag(snapshot.data_tag, '/batch-hierarchy', tuple(views))
+    return json_response(body, etag, encoded_cache)
+
+@app.route('/impact', methods=['GET'])
+def impact():
+    """
+    Blast radius of a CI as a flat list with hop distances:
+    /impact?node=X&direction=upstream|downstream|both&maxHops=N&relType=A&relType=B
+    """
+    snapshot = fetch_graph_snapshot()
+    if snapshot is None:
+        return jsonify({"error": "Unable to load data"}), 500
+    node = request.args.get('node') or snapshot.active_node
+    direction = request.args.get('direction', 'downstream')
+    rel_types = request.args.getlist('relType') or None
+    try:
+        max_hops = optional_int_arg('maxHops')
+        etag = make_etag(snapshot.data_tag, '/impact', node, direction, max_hops, rel_types)
+        response = not_modified_response(etag)
+        if response is not None:
+            return response
+        result = traversal_pool.run(get_impact, snapshot.index, node, direction, max_hops, rel_types)
+    except PoolBusyError as e:
+        return pool_busy_response(e)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if "error" in result:
+        return jsonify(result), 404
+    return json_response(jsonify(result).get_data(), etag, encoded_cache)
+
+@app.route('/path', methods=['GET'])
+def path():
+    """
+    Why do two nodes show up together? Shortest connection(s) between them:
+    /path?source=A&target=B&maxHops=N&limit=K
+    Paths only follow CI / dependency rows (plus the members of a type given as source or
+    target). A type-named node in the middle of a path is not expanded into its members the
+    way the hierarchy views expand it, so two nodes linked only through such a node are
+    reported as unconnected.
+    """
+    snapshot = fetch_graph_snapshot()
+    if snapshot is None:
+        return jsonify({"error": "Unable to load data"}), 500
+    source = request.args.get('source', '')
+    target = request.args.get('target', '')
+    if not source or not target:
+        return jsonify({"error": "Both source and target are required"}), 400
+    try:
+        max_hops = min(optional_int_arg('maxHops') or DEFAULT_MAX_HOPS, MAX_HOPS_LIMIT)
+        limit = min(optional_int_arg('limit') or 1, 20)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    etag = make_etag(snapshot.data_tag, '/path', source, target, max_hops, limit)
+    response = not_modified_response(etag)
+    if response is not None:
+        return response
+    try:
+        result = traversal_pool.run(shortest_paths, snapshot.index, source, target, max_hops, limit)
+    except PoolBusyError as e:
+        return pool_busy_response(e)
+    if "error" in result:
+        return jsonify(result), 404
+    return json_response(jsonify(result).get_data(), etag, encoded_cache)
+
+@app.route('/all-dependencies', methods=['GET'])
+def all_dependencies():
+    try:
+        snapshot = fetch_graph_snapshot()
+        if snapshot is None:
+            return jsonify([])
+        # returns list of {Dependency_Type, Dependency_Name, Dependency_Descrip}
+        return cached_payload_response(
+            snapshot, '/all-dependencies', lambda: get_all_dependencies(data=snapshot.data)
+        )
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/all-assets', methods=['GET'])
+def all_assets():
+    snapshot = fetch_graph_snapshot()
+    if snapshot is None:
+        return jsonify({})
+    return cached_payload_response(snapshot, '/all-assets', lambda: get_grouped_assets(data=snapshot.data))
+
+@app.route('/group-children', methods=['GET'])
+def group_children():
+    """Next page of a group that / cut short: /group-children?cursor=<more>&limit=N"""
+    snapshot = fetch_graph_snapshot()
+    if snapshot is None:
+        return jsonify({"error": "Unable to load data"}), 500
+    cursor = request.args.get('cursor', '')
+    try:
+        limit = optional_int_arg('limit')
+        etag = make_etag(snapshot.data_tag, '/group-children', cursor, limit)
+        response = not_modified_response(etag)
+        if response is not None:
+            return response
+        page = get_group_children(snapshot.index, cursor, snapshot.data_tag, limit,
+                                  frontier_of=lambda *view: cached_view_frontier(snapshot, *view))
+    except StaleCursorError as e:
+        return jsonify({"error": str(e)}), 410
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except PoolBusyError as e:
+        return pool_busy_response(e)
+    return json_response(jsonify(page).get_data(), etag, encoded_cache)
+
+@app.route('/search', methods=['GET'])
+def search():
+    """Autocomplete: /search?q=<text>&limit=N -> best matching names with their type and description."""
+    snapshot = fetch_graph_snapshot()
+    if snapshot is None:
+        return jsonify([])
+    query = request.args.get('q', '')
+    try:
+        limit = min(optional_int_arg('limit') or 10, 100)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    etag = make_etag(snapshot.data_tag, '/search', query, limit)
+    response = not_modified_response(etag)
+    if response is not None:
+        return response
+    matches = snapshot.search_index.search(query, limit)
+    return json_response(jsonify(matches).get_data(), etag, encoded_cache)
+
+def warm_up_first_load():
+    """
+    Warm the first load before serving, so with gunicorn's preload every worker
+    is forked with those views already cached.
+    """
+    snapshot = fetch_graph_snapshot()
+    if snapshot is not None:
+        hierarchy_warmer.warm(snapshot)
+
+warm_up_first_load()
+
+if __name__ == "__main__":
+    # Development server; in production run: gunicorn -c gunicorn.conf.py
+    port = int(os.getenv("PORT", 5000))  # Default to 5000 if PORT is not set
+    app.run(host="0.0.0.0", port=port, debug=True)
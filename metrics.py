@@ -0,0 +1,117 @@
+"""
+Prometheus metrics for the app, served at /metrics.
+
+Every request is timed per route (and per depth for hierarchy views), along with the
+stages recorded through request_timing (load, lookup, traversal, indirects,
+serialize, compress), the node count of built hierarchies, and the hit ratios of the
+response caches.
+
+Under gunicorn with several workers, set PROMETHEUS_MULTIPROC_DIR to an empty directory
+so the counters of all workers are added up (cache statistics stay per worker,
+labelled with its pid). SERVER_TIMING=1 also reports the stages of each response
+in a Server-Timing header, for the browser devtools.
+"""
+import os
+from flask import Flask, Response, request
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Histogram, generate_latest
+from prometheus_client import multiprocess
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+import request_timing
+
+REQUEST_SECONDS = Histogram(
+    "network_diagram_request_seconds", "Time to build each response (up to the first byte when streamed)",
+    ["route", "depth", "status"],
+)
+STAGE_SECONDS = Histogram(
+    "network_diagram_stage_seconds", "Time spent per pipeline stage in each request",
+    ["route", "stage"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+HIERARCHY_NODES = Histogram(
+    "network_diagram_hierarchy_nodes", "Nodes in each hierarchy that had to be built",
+    ["depth"], buckets=(1, 10, 50, 100, 500, 1000, 5000, 10000, 50000, 100000),
+)
+
+# Depths reported as their own label value; anything else is "other"
+DEPTH_LABELS = {str(depth) for depth in range(-1, 11)}
+
+SERVER_TIMING = os.getenv("SERVER_TIMING", "0").lower() in ("1", "true")
+
+
+class CacheCollector:
+    """Size, hits, misses and hit ratio of the LRUCaches, read when /metrics is scraped."""
+
+    def __init__(self, caches: dict, pool=None):
+        self.caches = caches
+        self.pool = pool
+
+    def collect(self):
+        worker = str(os.getpid())
+        size = GaugeMetricFamily("network_diagram_cache_entries", "Entries per cache", labels=["cache", "worker"])
+        ratio = GaugeMetricFamily("network_diagram_cache_hit_ratio", "Hit ratio per cache", labels=["cache", "worker"])
+        hits = CounterMetricFamily("network_diagram_cache_hits", "Cache hits", labels=["cache", "worker"])
+        misses = CounterMetricFamily("network_diagram_cache_misses", "Cache misses", labels=["cache", "worker"])
+        for name, cache in self.caches.items():
+            stats = cache.stats()
+            size.add_metric([name, worker], stats["size"])
+            ratio.add_metric([name, worker], stats["hitRatio"])
+            hits.add_metric([name, worker], stats["hits"])
+            misses.add_metric([name, worker], stats["misses"])
+        yield from (size, ratio, hits, misses)
+        if self.pool is not None:
+            rejected = CounterMetricFamily(
+                "network_diagram_traversals_rejected", "Traversals refused because the pool was full", labels=["worker"]
+            )
+            rejected.add_metric([worker], self.pool.rejected)
+            yield rejected
+
+
+def _depth_label() -> str:
+    if request.url_rule is None or request.url_rule.rule != "/":
+        return ""
+    depth = request.args.get("depth", "2")
+    return depth if depth in DEPTH_LABELS else "other"
+
+
+def _server_timing(timings: request_timing.Timings) -> str:
+    parts = [f"{name};dur={seconds * 1000:.2f}" for name, seconds in timings.stages.items()]
+    parts.append(f"total;dur={timings.elapsed() * 1000:.2f}")
+    return ", ".join(parts)
+
+
+def init_metrics(app: Flask, caches: dict, pool=None):
+    """Time every request of 'app' and serve the metrics at /metrics."""
+    cache_collector = CacheCollector(caches, pool)
+
+    @app.before_request
+    def start_timing():
+        request_timing.start()
+
+    @app.after_request
+    def record_timing(response):
+        timings = request_timing.current()
+        if timings is None or request.endpoint == "metrics":
+            return response
+        route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+        status = str(response.status_code)
+        REQUEST_SECONDS.labels(route, _depth_label(), status).observe(timings.elapsed())
+        for name, seconds in timings.stages.items():
+            STAGE_SECONDS.labels(route, name).observe(seconds)
+        if "nodes" in timings.counts:
+            HIERARCHY_NODES.labels(_depth_label() or "batch").observe(timings.counts["nodes"])
+        if SERVER_TIMING:
+            response.headers["Server-Timing"] = _server_timing(timings)
+        return response
+
+    REGISTRY.register(cache_collector)
+
+    @app.route("/metrics", methods=["GET"])
+    def metrics():
+        if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+            # Add up what every worker wrote to the shared directory
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+            registry.register(cache_collector)
+        else:
+            registry = REGISTRY
+        return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
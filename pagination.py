@@ -0,0 +1,105 @@
+"""
+Opaque cursors pointing at the rest of a group that was cut short by a node budget,
+and frontier tokens pointing at the edge of a view that a deeper view continues from.
+
+A cursor records which group it belongs to (the node it hangs off, which side of
+that node, and the group type), where to resume, the page size, the view's filters
+(see hierarchy_filter.py) and the data version it was issued for, so a page is never
+served from a different workbook. It also names the view that cut the group short
+(active node, depth and budget), so a page can leave out the nodes that view already shows.
+"""
+import base64
+import json
+
+# Which list of a node a group comes from
+GROUP_KINDS = ("parents", "children", "type-parents", "members")
+
+
+class StaleCursorError(ValueError):
+    """The cursor was issued for a workbook version that is no longer loaded."""
+
+
+def encode_cursor(data_tag: str, parent_name, kind: str, group_type, offset: int, limit: int,
+                  filters: list = None, view: list = None) -> str:
+    payload = {"t": data_tag, "n": parent_name, "k": kind, "g": group_type, "o": offset, "l": limit}
+    if filters is not None:
+        payload["f"] = filters
+    if view is not None:
+        payload["v"] = view
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, data_tag: str) -> dict:
+    """
+    Return the cursor's fields as {"parent", "kind", "groupType", "offset", "limit", "filters", "view"},
+    'view' being [active node, depth, maxNodes, groupLimit] or None.
+    Raises ValueError for a malformed cursor and StaleCursorError for one from another data version.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        fields = {
+            "parent": payload["n"],
+            "kind": payload["k"],
+            "groupType": payload["g"],
+            "offset": int(payload["o"]),
+            "limit": int(payload["l"]),
+            "filters": payload.get("f"),
+            "view": payload.get("v"),
+        }
+        if fields["view"] is not None:
+            if not isinstance(fields["view"], list):
+                raise TypeError("view must be a list")
+            active_node, depth, max_nodes, group_limit = fields["view"]
+            fields["view"] = [active_node, int(depth),
+                              None if max_nodes is None else int(max_nodes),
+                              None if group_limit is None else int(group_limit)]
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {e}") from e
+    if fields["kind"] not in GROUP_KINDS or fields["offset"] < 0 or fields["limit"] < 1:
+        raise ValueError("Invalid cursor")
+    if fields["filters"] is not None and not (isinstance(fields["filters"], list) and len(fields["filters"]) == 5):
+        raise ValueError("Invalid cursor")
+    if fields["view"] is not None and fields["view"][1] < 1:
+        raise ValueError("Invalid cursor")
+    if payload.get("t") != data_tag:
+        raise StaleCursorError("The data changed since this cursor was issued; reload the view.")
+    return fields
+
+
+def encode_frontier_token(data_tag: str, active_node, depth: int, max_nodes: int, group_limit: int,
+                          filters: list = None) -> str:
+    payload = {"t": data_tag, "n": active_node, "d": depth, "m": max_nodes, "g": group_limit, "f": filters}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_frontier_token(token: str, data_tag: str) -> dict:
+    """
+    Return the token's fields as {"activeNode", "depth", "maxNodes", "groupLimit", "filters"}.
+    Raises ValueError for a malformed token and StaleCursorError for one from another data version.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+        fields = {
+            "activeNode": payload["n"],
+            "depth": int(payload["d"]),
+            "maxNodes": payload["m"],
+            "groupLimit": payload["g"],
+            "filters": payload["f"],
+        }
+        for name in ("maxNodes", "groupLimit"):
+            if fields[name] is not None:
+                fields[name] = int(fields[name])
+                if fields[name] < 1:
+                    raise ValueError(f"{name} must be a positive integer")
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid frontier token: {e}") from e
+    if fields["depth"] < 1 or not (fields["filters"] is None or
+                                   (isinstance(fields["filters"], list) and len(fields["filters"]) == 5)):
+        raise ValueError("Invalid frontier token")
+    if payload.get("t") != data_tag:
+        raise StaleCursorError("The data changed since this token was issued; reload the view.")
+    return fields
@@ -0,0 +1,67 @@
+"""
+Per-request stage timers.
+
+A request starts a Timings object (see metrics.py); code anywhere below it adds
+the time it spends under a stage name, without having to pass the object around:
+
+    with stage("traversal"):
+        ...
+
+Outside a request (scripts, benchmarks) the timers do nothing.
+"""
+import contextvars
+import time
+from contextlib import contextmanager
+
+_current = contextvars.ContextVar("request_timings", default=None)
+
+
+class Timings:
+    """Seconds spent per stage, plus free-form counts (e.g. nodes in the result)."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages = {}
+        self.counts = {}
+
+    def add(self, name: str, seconds: float):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+
+def start() -> Timings:
+    """Begin timing the current request (context)."""
+    timings = Timings()
+    _current.set(timings)
+    return timings
+
+
+def current() -> Timings | None:
+    return _current.get()
+
+
+def add_stage(name: str, seconds: float):
+    timings = _current.get()
+    if timings is not None:
+        timings.add(name, seconds)
+
+
+def count(name: str, value: int):
+    timings = _current.get()
+    if timings is not None:
+        timings.counts[name] = timings.counts.get(name, 0) + value
+
+
+@contextmanager
+def stage(name: str):
+    """Add the time spent in the block to stage 'name' of the current request."""
+    if _current.get() is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_stage(name, time.perf_counter() - started)
@@ -0,0 +1,84 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    Small thread-safe LRU cache with an optional time-to-live per entry.
+    Used to keep serialized JSON responses so popular views are served
+    without re-traversing or re-serializing the graph.
+    """
+
+    def __init__(self, max_size: int = 256, ttl: float = 300):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Return the cached value for 'key', or None if it is missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def __contains__(self, key) -> bool:
+        """Whether 'key' has a live entry; unlike get(), not counted as a hit or miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and (entry[0] is None or entry[0] > time.monotonic())
+
+    def put(self, key, value):
+        """Store 'value' under 'key', evicting the least recently used entries if full."""
+        if self.max_size <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl and self.ttl > 0 else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self, *args):
+        """Drop every entry (extra arguments are ignored so it can be used as a callback)."""
+        with self._lock:
+            self._entries.clear()
+
+    def rekey(self, transform):
+        """
+        Replace every key with transform(key, value), or drop the entry when that returns None,
+        e.g. to carry entries that are still valid over to a new data version.
+        """
+        with self._lock:
+            entries = self._entries
+            self._entries = OrderedDict()
+            for key, entry in entries.items():
+                new_key = transform(key, entry[1])
+                if new_key is not None:
+                    self._entries[new_key] = entry
+
+    def keys(self) -> list:
+        with self._lock:
+            return list(self._entries)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxSize": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRatio": (self.hits / lookups) if lookups else 0.0,
+            }
@@ -0,0 +1,167 @@
+"""
+In-memory name index behind the /search autocomplete endpoint, built once per data load.
+
+Every CI / dependency name and every type is searchable. Matches are ranked:
+    exact      the whole name equals the query (ignoring case)
+    prefix     the name starts with the query
+    word       a later word of the name starts with the query
+    substring  the query appears somewhere inside the name
+    fuzzy      the name shares most of the query's trigrams (typos, transpositions)
+and, within a tier, shorter names first, then alphabetically.
+"""
+import bisect
+import re
+import numpy as np
+from graph_index import GraphIndex
+
+MATCH_TIERS = ("exact", "prefix", "word", "substring", "fuzzy")
+
+# Share of the query's trigrams a name must contain to count as a fuzzy match
+FUZZY_THRESHOLD = 0.5
+
+_WORD_SPLIT = re.compile(r"[\s\-_/.,:;()\[\]]+")
+
+
+def normalize(text) -> str:
+    return str(text).casefold().strip()
+
+
+def trigrams(text: str) -> set:
+    # Padded so that short queries and word boundaries still produce trigrams
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchIndex:
+    """Prefix and trigram lookups over the names of one GraphIndex."""
+
+    def __init__(self, index: GraphIndex):
+        self.entries = []  # (name, type, description) per entry id
+        keys = []          # normalized name per entry id
+
+        for node_id in index.searchable_ids().tolist():
+            name = index.name(node_id)
+            node_attributes = index.node_attributes_of(name)
+            if node_attributes is not None:
+                node_type, description, _ = node_attributes
+            else:
+                # A type that is not also a CI name, described like the active type node
+                node_type, description = name, f"{name}"
+            self.entries.append((name, str(node_type), description))
+            keys.append(normalize(name))
+
+        self._keys = keys
+        # Ranking within a tier: (length, name) order, precomputed as one rank per entry
+        order = sorted(range(len(keys)), key=lambda entry_id: (len(keys[entry_id]), keys[entry_id]))
+        self._rank = np.empty(len(keys), dtype=np.int32)
+        self._rank[order] = np.arange(len(keys), dtype=np.int32)
+
+        # Sorted keys with their entry ids, for whole-name and per-word prefix lookups:
+        # all the keys starting with a prefix form one contiguous range
+        self._names = self._sorted_keys((key, entry_id) for entry_id, key in enumerate(keys))
+        self._words = self._sorted_keys(
+            (word, entry_id)
+            for entry_id, key in enumerate(keys)
+            for word in set(_WORD_SPLIT.split(key)[1:]) if word
+        )
+
+        # Trigram -> sorted int32 array of entry ids whose key contains it
+        postings = {}
+        for entry_id, key in enumerate(keys):
+            for gram in trigrams(key):
+                postings.setdefault(gram, []).append(entry_id)
+        self._postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @staticmethod
+    def _sorted_keys(pairs) -> tuple:
+        pairs = sorted(pairs)
+        return [key for key, _ in pairs], np.array([entry_id for _, entry_id in pairs], dtype=np.int32)
+
+    @staticmethod
+    def _prefix_range(sorted_keys: tuple, query: str) -> tuple:
+        """(start of the keys equal to 'query', start of the longer ones, end) in 'sorted_keys'."""
+        keys, _ = sorted_keys
+        start = bisect.bisect_left(keys, query)
+        longer = bisect.bisect_right(keys, query, lo=start)
+        end = bisect.bisect_left(keys, query + "\U0010ffff", lo=longer)
+        return start, longer, end
+
+    def _best(self, ids: np.ndarray, limit: int) -> np.ndarray:
+        """The 'limit' best-ranked of 'ids', in rank order."""
+        if len(ids) > limit:
+            ids = ids[np.argpartition(self._rank[ids], limit - 1)[:limit]]
+        return ids[np.argsort(self._rank[ids], kind='stable')]
+
+    def _gram_counts(self, grams: set) -> tuple:
+        """(entry ids, how many of 'grams' each contains) for the entries containing any."""
+        lists = [self._postings[gram] for gram in grams if gram in self._postings]
+        if not lists:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int64)
+        counts = np.bincount(np.concatenate(lists), minlength=len(self._keys))
+        ids = np.flatnonzero(counts)
+        return ids, counts[ids]
+
+    def _substring_ids(self, query: str) -> np.ndarray:
+        if len(query) < 3:
+            # Too short for trigrams: scan the names
+            ids = [entry_id for entry_id, key in enumerate(self._keys) if query in key]
+        else:
+            # Names containing the query contain every trigram inside it
+            inner = {query[i:i + 3] for i in range(len(query) - 2)}
+            candidates, counts = self._gram_counts(inner)
+            ids = [entry_id for entry_id in candidates[counts == len(inner)].tolist() if query in self._keys[entry_id]]
+        return np.array(ids, dtype=np.int32)
+
+    def _fuzzy_ids(self, query: str) -> np.ndarray:
+        """Entries holding at least FUZZY_THRESHOLD of the query's trigrams, best share first."""
+        grams = trigrams(query)
+        ids, counts = self._gram_counts(grams)
+        scores = counts / len(grams)
+        keep = scores >= FUZZY_THRESHOLD
+        ids, scores = ids[keep], scores[keep]
+        order = np.lexsort((self._rank[ids], -scores))
+        return ids[order]
+
+    def search(self, query: str, limit: int = 10) -> list:
+        """
+        Top 'limit' matches for 'query' as
+        [{"name", "type", "description", "match"}, ...], best first.
+        """
+        query = normalize(query)
+        if not query or limit < 1:
+            return []
+
+        start, longer, end = self._prefix_range(self._names, query)
+        word_start, _, word_end = self._prefix_range(self._words, query)
+        tiers = {
+            "exact": self._names[1][start:longer],
+            "prefix": self._names[1][longer:end],
+            "word": self._words[1][word_start:word_end],
+        }
+        # The slower tiers are only needed when the cheap ones do not fill the page
+        if sum(len(ids) for ids in tiers.values()) < limit:
+            tiers["substring"] = self._substring_ids(query)
+            if len(query) >= 3:
+                tiers["fuzzy"] = self._fuzzy_ids(query)
+
+        results = []
+        seen = set()
+        for tier in MATCH_TIERS:
+            ids = tiers.get(tier)
+            if ids is None:
+                continue
+            if tier != "fuzzy":
+                # Enough to fill the page even if some were listed by an earlier tier
+                ids = self._best(ids, limit + len(seen))
+            for entry_id in ids.tolist():
+                if entry_id in seen:
+                    continue
+                seen.add(entry_id)
+                name, node_type, description = self.entries[entry_id]
+                results.append({"name": name, "type": node_type, "description": description, "match": tier})
+                if len(results) >= limit:
+                    return results
+        return results
@@ -0,0 +1,335 @@
+"""
+Shared graph backend: one memory-mapped copy of the graph index for every worker process.
+
+With GRAPH_BACKEND=shared the workbook is loaded once and its GraphIndex written into a
+file next to it (e.g. data/network_diagram.graph, or GRAPH_SHARED_PATH) as flat arrays
+plus two string tables (names and labels). Every process maps that file read-only and
+traverses the mapped arrays directly, so the graph's pages live once in the OS page
+cache however many workers there are, instead of once per worker in private memory.
+
+The file layout is:
+    magic       b"NDGRAPH1"
+    length      uint64, length of the header
+    header      JSON: format, the (mtime_ns, size) of the workbook it was built from, and
+                for each array its dtype, offset (from the start of the data) and length
+    data        the arrays, each starting at a multiple of ALIGNMENT bytes
+
+Each string table is four arrays: the UTF-8 (or, for numbers and empty cells, JSON)
+bytes of every value back to back, where each value starts in those bytes, which kind
+of value each one is, and the ids of the text values in byte order for lookups by value.
+
+When the workbook changes, the first process to notice builds the new file under a lock
+(the others wait for it and then map the result) into a temporary file that is swapped
+in with os.replace(). Processes still serving the previous version keep their mapping of
+the old file until they switch over, so the swap is atomic for everyone. With gunicorn's
+preload_app the master builds or maps the file before forking, and the workers inherit
+the mapping. The file can also be built ahead of time:
+    python shared_graph.py [path/to/workbook.xlsx]
+"""
+import bisect
+import json
+import mmap
+import os
+import sys
+import numpy as np
+import pandas as pd
+from file_lock import build_lock
+from graph_index import MISSING, GraphIndex
+
+SHARED_FORMAT = 1
+SHARED_SUFFIX = '.graph'
+MAGIC = b"NDGRAPH1"
+
+# Arrays start on cache-line boundaries
+ALIGNMENT = 64
+
+# Decoded names and labels kept per process (up to GRAPH_SHARED_CACHE of each)
+LOOKUP_CACHE_SIZE = int(os.getenv("GRAPH_SHARED_CACHE", 100_000))
+
+# How a string table stores each value: as UTF-8 text, or as JSON (numbers, booleans, None, NaN)
+TEXT, JSON = 0, 1
+
+
+def shared_graph_path(excel_file: str) -> str:
+    return os.getenv("GRAPH_SHARED_PATH") or os.path.splitext(excel_file)[0] + SHARED_SUFFIX
+
+
+def _string_table(values: list) -> dict | None:
+    """The arrays storing 'values' (see the module docstring), or None if one cannot be stored, e.g. a date."""
+    kinds = np.zeros(len(values), dtype=np.uint8)
+    chunks = []
+    for value_id, value in enumerate(values):
+        if isinstance(value, str):
+            chunks.append(value.encode('utf-8'))
+            continue
+        if value is not None and not isinstance(value, (int, float)):
+            return None
+        kinds[value_id] = JSON
+        chunks.append(json.dumps(value).encode('utf-8'))
+    offsets = np.zeros(len(values) + 1, dtype=np.int64)
+    np.cumsum([len(chunk) for chunk in chunks], out=offsets[1:])
+    text_ids = sorted(np.flatnonzero(kinds == TEXT).tolist(), key=chunks.__getitem__)
+    return {
+        "offsets": offsets,
+        "kinds": kinds,
+        "bytes": np.frombuffer(b"".join(chunks), dtype=np.uint8),
+        "order": np.array(text_ids, dtype=np.int32),
+    }
+
+
+def write_shared_graph(data: pd.DataFrame, path: str, signature: tuple, index: GraphIndex = None) -> bool:
+    """
+    Write the shared file for 'data' (the workbook with this (mtime_ns, size) signature) to
+    'path', building its GraphIndex unless given. Returns False (and writes nothing) if a
+    cell holds a value that cannot be stored, e.g. a date.
+    """
+    index = index if index is not None else GraphIndex(data)
+    arrays = index.arrays()
+    # Every value is interned already; the raw descriptions keep empty cells as MISSING
+    arrays["ci_name"] = index.names.intern_column(data['CI_Name'])
+    arrays["dependency_name"] = index.names.intern_column(data['Dependency_Name'])
+    arrays["dependency_descrip"] = index.labels.intern_column(data['Dependency_Descrip'])
+    for table in ("names", "labels"):
+        table_arrays = _string_table(getattr(index, table).values)
+        if table_arrays is None:
+            print(f"Not writing {path}: unsupported cell value in the {table}")
+            return False
+        arrays.update((f"{table}.{name}", array) for name, array in table_arrays.items())
+
+    layout = {}
+    offset = 0
+    for name, array in arrays.items():
+        layout[name] = [array.dtype.str, offset, len(array)]
+        offset += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+    header = json.dumps({
+        "format": SHARED_FORMAT,
+        "source_signature": list(signature),
+        "arrays": layout,
+    }).encode('utf-8')
+    data_start = -(-(len(MAGIC) + 8 + len(header)) // ALIGNMENT) * ALIGNMENT
+
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(MAGIC + len(header).to_bytes(8, 'little') + header)
+            for name, array in arrays.items():
+                f.seek(data_start + layout[name][1])
+                f.write(np.ascontiguousarray(array).data)
+            f.truncate(data_start + offset)
+        # Processes only ever map a complete file
+        os.replace(temp_path, path)
+    except OSError as e:
+        print(f"Could not write {path}: {e}")
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return False
+    return True
+
+
+def attach_shared_graph(path: str, signature: tuple) -> "SharedGraph | None":
+    """
+    Map the shared file at 'path' if it was built from the workbook version with this
+    signature; None if it is missing, stale or unreadable.
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if buffer[:len(MAGIC)] != MAGIC:
+            raise ValueError("not a shared graph file")
+        header_length = int.from_bytes(buffer[len(MAGIC):len(MAGIC) + 8], 'little')
+        header = json.loads(buffer[len(MAGIC) + 8:len(MAGIC) + 8 + header_length])
+        if header.get("format") != SHARED_FORMAT or tuple(header.get("source_signature", ())) != tuple(signature):
+            buffer.close()
+            return None
+        data_start = -(-(len(MAGIC) + 8 + header_length) // ALIGNMENT) * ALIGNMENT
+        positions = {name: data_start + offset for name, (_, offset, _) in header["arrays"].items()}
+        arrays = {
+            name: np.frombuffer(buffer, dtype=np.dtype(dtype), count=length, offset=positions[name])
+            for name, (dtype, _, length) in header["arrays"].items()
+        }
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"Ignoring unreadable shared graph {path}: {e}")
+        return None
+    return SharedGraph(path, buffer, arrays, positions)
+
+
+def open_shared_graph(excel_file: str, signature: tuple, load, path: str = None) -> "SharedGraph | None":
+    """
+    The shared graph of 'excel_file', building its file first (from the DataFrame 'load()'
+    returns) unless it is up to date. None if the workbook cannot be stored that way.
+    """
+    path = path or shared_graph_path(excel_file)
+    graph = attach_shared_graph(path, signature)
+    if graph is not None:
+        return graph
+    with build_lock(path):
+        # Another process may have built it while we waited for the lock
+        graph = attach_shared_graph(path, signature)
+        if graph is None and write_shared_graph(load(), path, signature):
+            graph = attach_shared_graph(path, signature)
+    return graph
+
+
+class _DecodedValues(dict):
+    """
+    Values of a _MappedTable by id, decoded on first use and kept, so repeated lookups
+    cost a dict hit. Emptied whenever it reaches LOOKUP_CACHE_SIZE values, so the copies
+    each process keeps stay bounded.
+    """
+
+    def __init__(self, decode):
+        super().__init__()
+        self._decode = decode
+
+    def __missing__(self, value_id: int):
+        if len(self) >= LOOKUP_CACHE_SIZE:
+            self.clear()
+        value = self[value_id] = self._decode(value_id)
+        return value
+
+
+class _MappedTable:
+    """
+    One string table of the mapped file, with the interface of graph_index.InternTable
+    (table[id], id_of(value), len(table)). Values are decoded from the mapping when first
+    looked up; the table itself copies nothing into the process but the few non-text values.
+    """
+
+    def __init__(self, buffer: mmap.mmap, arrays: dict, positions: dict, table: str):
+        self._buffer = buffer
+        # Slicing the mmap itself is the cheapest way to get a value's bytes
+        self._start = positions[f"{table}.bytes"]
+        self._offsets = memoryview(arrays[f"{table}.offsets"]).cast('B').cast('q')
+        self._order = memoryview(arrays[f"{table}.order"]).cast('B').cast('i')
+        self._length = len(arrays[f"{table}.kinds"])
+        self._json_ids = set(np.flatnonzero(arrays[f"{table}.kinds"] != TEXT).tolist())
+        # GraphIndex indexes InternTable.values directly, so that is where decoded values are kept
+        self.values = _DecodedValues(self._decode)
+        # Numbers, booleans and None by value (first id wins, as in InternTable), and NaN
+        self._others = {}
+        self._nan_id = None
+        for value_id in sorted(self._json_ids):
+            value = self[value_id]
+            if isinstance(value, float) and value != value:
+                if self._nan_id is None:
+                    self._nan_id = value_id
+            else:
+                self._others.setdefault(value, value_id)
+
+    def _encoded(self, value_id: int) -> bytes:
+        start = self._start
+        return self._buffer[start + self._offsets[value_id]:start + self._offsets[value_id + 1]]
+
+    def id_of(self, value) -> int | None:
+        if isinstance(value, str):
+            encoded = value.encode('utf-8')
+            position = bisect.bisect_left(self._order, encoded, key=self._encoded)
+            if position < len(self._order) and self._encoded(self._order[position]) == encoded:
+                return self._order[position]
+            return None
+        if isinstance(value, float) and value != value:
+            return self._nan_id
+        try:
+            return self._others.get(value)
+        except TypeError:  # unhashable values are never stored
+            return None
+
+    def _decode(self, value_id: int):
+        encoded = self._encoded(value_id)
+        if value_id in self._json_ids:
+            return json.loads(encoded)
+        return encoded.decode('utf-8')
+
+    def __getitem__(self, value_id: int):
+        return self.values[value_id]
+
+    def __len__(self) -> int:
+        return self._length
+
+
+class SharedGraph:
+    """
+    One mapped version of the shared file: 'index' is a GraphIndex over its arrays, so
+    build_hierarchy(), the streamed views, /impact, /path and /search work unchanged, and the
+    row queries behind /all-assets and /all-dependencies are answered from its row columns.
+    """
+
+    def __init__(self, path: str, buffer: mmap.mmap, arrays: dict, positions: dict):
+        self.path = path
+        self._arrays = arrays
+        names = _MappedTable(buffer, arrays, positions, "names")
+        labels = _MappedTable(buffer, arrays, positions, "labels")
+        self.index = GraphIndex.from_arrays(names, labels, arrays)
+
+    def default_active_node(self):
+        ci_name = self._arrays["ci_name"]
+        return self.index.name(int(ci_name[0])) if len(ci_name) else None
+
+    def asset_types(self) -> pd.DataFrame:
+        """
+        Every CI / dependency name with its type, in order of first appearance
+        (row by row, CI side first), as get_grouped_assets() needs them: the type is the
+        first one listed for the name that is not empty or "Unknown", else "Unknown".
+        """
+        arrays, names = self._arrays, self.index.names
+        row_count = len(arrays["ci_name"])
+        name_ids = np.empty(2 * row_count, dtype=np.int32)
+        name_ids[0::2], name_ids[1::2] = arrays["ci_name"], arrays["dependency_name"]
+        type_ids = np.empty(2 * row_count, dtype=np.int32)
+        type_ids[0::2], type_ids[1::2] = arrays["_src_type"], arrays["_dst_type"]
+
+        asset_ids, first_seen = np.unique(name_ids, return_index=True)
+        asset_ids = asset_ids[np.argsort(first_seen)]
+        unknown = names.id_of("Unknown")
+        known = np.flatnonzero((type_ids != MISSING) & (type_ids != unknown))
+        known_ids, first_known = np.unique(name_ids[known], return_index=True)
+        asset_types = np.full(len(names), unknown, dtype=np.int32)
+        asset_types[known_ids] = type_ids[known[first_known]]
+        return pd.DataFrame({
+            'name': [names[asset_id] for asset_id in asset_ids.tolist()],
+            'type': [names[type_id] for type_id in asset_types[asset_ids].tolist()],
+        }, dtype=object)
+
+    def dependency_rows(self) -> pd.DataFrame:
+        """
+        Dependency_Type, Dependency_Name and Dependency_Descrip of the first row naming each
+        dependency, in row order: enough rows for get_all_dependencies() to pick the first
+        one per name compared case-insensitively.
+        """
+        arrays, names, labels = self._arrays, self.index.names, self.index.labels
+        _, first_rows = np.unique(arrays["dependency_name"], return_index=True)
+        first_rows = np.sort(first_rows)
+        missing = float("nan")
+        return pd.DataFrame({
+            'Dependency_Type': [
+                names[type_id] if type_id != MISSING else missing
+                for type_id in arrays["_dst_type"][first_rows].tolist()
+            ],
+            'Dependency_Name': [names[name_id] for name_id in arrays["dependency_name"][first_rows].tolist()],
+            'Dependency_Descrip': [
+                labels[label_id] if label_id != MISSING else missing
+                for label_id in arrays["dependency_descrip"][first_rows].tolist()
+            ],
+        }).infer_objects()
+
+
+def build_shared_graph(excel_file: str) -> bool:
+    """Load 'excel_file' and (re)write its shared file (see shared_graph_path())."""
+    # Imported here: graph_store itself uses this module when loading
+    from graph_store import load_workbook
+    stat = os.stat(excel_file)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    path = shared_graph_path(excel_file)
+    with build_lock(path):
+        return write_shared_graph(load_workbook(excel_file, signature), path, signature)
+
+
+if __name__ == "__main__":
+    from graph_store import DEFAULT_EXCEL_FILE
+    workbook = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_EXCEL_FILE
+    if build_shared_graph(workbook):
+        print(f"Wrote {shared_graph_path(workbook)}")
+    else:
+        sys.exit(1)
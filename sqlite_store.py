@@ -0,0 +1,547 @@
+"""
+SQLite storage backend, for workbooks too big to keep as a DataFrame (plus its index)
+in every worker process.
+
+With GRAPH_BACKEND=sqlite the workbook is ingested once into a SQLite file next to it
+(e.g. data/network_diagram.sqlite, or GRAPH_SQLITE_PATH), streaming the sheet row by row
+so it is never held in memory as a whole. Names, types and labels (descriptions and
+relationships) are interned into lookup tables, every row is stored as ids, and the rows
+are indexed on CI_Name, Dependency_Name, CI_Type and Dependency_Type. Workers open the
+file read-only and answer neighbour, type-member and asset queries as indexed lookups,
+sharing its pages through the OS cache instead of each holding private copies:
+
+    SqliteGraphIndex   the same interface as graph_index.GraphIndex, so build_hierarchy(),
+                       the streamed views, /impact, /path and /search work unchanged
+    SqliteWorkbook     the row queries behind /all-assets and /all-dependencies
+
+The file records the (mtime_ns, size) of the workbook it was built from and is rebuilt
+(into a temporary file that is then swapped in) whenever the workbook changes, by the
+first process to notice while the others wait for it (file_lock.py). It can also be
+built ahead of time:
+    python sqlite_store.py [path/to/workbook.xlsx]
+"""
+import functools
+import json
+import os
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from file_lock import build_lock
+from graph_index import MISSING, NO_DESCRIPTION, group_members
+
+# Ids computed with numpy are bound as plain integers
+for _integer in (np.int32, np.int64):
+    sqlite3.register_adapter(_integer, int)
+
+SQLITE_FORMAT = 1
+SQLITE_SUFFIX = '.sqlite'
+
+COLUMNS = ['CI_Type', 'CI_Name', 'CI_Descrip', 'Rel_Type', 'Dependency_Type', 'Dependency_Name', 'Dependency_Descrip']
+
+# Rows are written in batches of this many
+INSERT_BATCH = 10_000
+
+# Lookups (names, labels, per-node attributes) memoized per open file
+LOOKUP_CACHE_SIZE = int(os.getenv("GRAPH_SQLITE_CACHE", 200_000))
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE names (id INTEGER PRIMARY KEY, name, is_type INTEGER NOT NULL, is_node INTEGER NOT NULL);
+CREATE TABLE labels (id INTEGER PRIMARY KEY, label);
+CREATE TABLE edges (
+    row INTEGER PRIMARY KEY,
+    CI_Type INTEGER, CI_Name INTEGER NOT NULL, CI_Descrip INTEGER, Rel_Type INTEGER,
+    Dependency_Type INTEGER, Dependency_Name INTEGER NOT NULL, Dependency_Descrip INTEGER
+);
+"""
+
+INDEXES = """
+CREATE INDEX edges_ci_name ON edges (CI_Name);
+CREATE INDEX edges_dependency_name ON edges (Dependency_Name);
+CREATE INDEX edges_ci_type ON edges (CI_Type);
+CREATE INDEX edges_dependency_type ON edges (Dependency_Type);
+CREATE INDEX names_name ON names (name);
+CREATE INDEX labels_label ON labels (label);
+"""
+
+
+def sqlite_path(excel_file: str) -> str:
+    return os.getenv("GRAPH_SQLITE_PATH") or os.path.splitext(excel_file)[0] + SQLITE_SUFFIX
+
+
+def _name(value) -> str:
+    # Same normalization as graph_store.read_workbook(): astype(str).str.strip()
+    return "nan" if value is None else str(value).strip()
+
+
+def _sheet_rows(excel_file: str):
+    """Yield each data row of the workbook's first sheet as a dict of COLUMNS, without loading the sheet."""
+    from openpyxl import load_workbook
+    workbook = load_workbook(excel_file, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = [str(cell) if cell is not None else '' for cell in next(rows, ())]
+        missing = [column for column in COLUMNS if column not in header]
+        if missing:
+            raise ValueError(f"{excel_file} is missing the columns {', '.join(missing)}")
+        positions = [header.index(column) for column in COLUMNS]
+        for row in rows:
+            cells = [row[position] if position < len(row) else None for position in positions]
+            # Blank rows (e.g. formatted but empty ones at the end of the sheet) are skipped
+            if any(cell is not None for cell in cells):
+                yield dict(zip(COLUMNS, cells))
+    finally:
+        workbook.close()
+
+
+def ingest_workbook(excel_file: str, signature: tuple, path: str):
+    """
+    (Re)build the SQLite file at 'path' from 'excel_file', whose file signature is (mtime_ns, size).
+    Written to a temporary file first, so readers only ever open a complete database.
+    """
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+    db = sqlite3.connect(temp_path)
+    try:
+        db.executescript("PRAGMA journal_mode = OFF; PRAGMA synchronous = OFF;" + SCHEMA)
+        names, labels = {}, {}
+        is_type, is_node = [], []
+
+        def name_id(value, node: bool = False, type_: bool = False) -> int:
+            value_id = names.get(value)
+            if value_id is None:
+                value_id = names[value] = len(is_type)
+                is_type.append(False)
+                is_node.append(False)
+            is_node[value_id] |= node
+            is_type[value_id] |= type_
+            return value_id
+
+        def label_id(value) -> int:
+            value_id = labels.get(value)
+            if value_id is None:
+                value_id = labels[value] = len(labels)
+            return value_id
+
+        # Values every index needs to be able to name
+        name_id("Unknown")
+        label_id(NO_DESCRIPTION)
+
+        batch = []
+        insert = "INSERT INTO edges VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+        for row_number, row in enumerate(_sheet_rows(excel_file)):
+            ci_type, dep_type = row['CI_Type'], row['Dependency_Type']
+            rel = row['Rel_Type']
+            batch.append((
+                row_number,
+                name_id(ci_type, type_=True) if ci_type is not None else None,
+                name_id(_name(row['CI_Name']), node=True),
+                label_id(row['CI_Descrip']) if row['CI_Descrip'] is not None else None,
+                # An empty cell stays missing (NaN in the DataFrame); other falsy values become None
+                label_id(rel or None) if rel is not None else None,
+                name_id(dep_type, type_=True) if dep_type is not None else None,
+                name_id(_name(row['Dependency_Name']), node=True),
+                label_id(row['Dependency_Descrip']) if row['Dependency_Descrip'] is not None else None,
+            ))
+            if len(batch) >= INSERT_BATCH:
+                db.executemany(insert, batch)
+                batch = []
+        db.executemany(insert, batch)
+
+        db.executemany(
+            "INSERT INTO names VALUES (?, ?, ?, ?)",
+            ((value_id, value, is_type[value_id], is_node[value_id]) for value, value_id in names.items())
+        )
+        db.executemany("INSERT INTO labels VALUES (?, ?)", ((value_id, value) for value, value_id in labels.items()))
+        db.executescript(INDEXES)
+        meta = {"format": SQLITE_FORMAT, "source_signature": list(signature)}
+        db.executemany("INSERT INTO meta VALUES (?, ?)", ((key, json.dumps(value)) for key, value in meta.items()))
+        db.commit()
+    except BaseException:
+        db.close()
+        os.remove(temp_path)
+        raise
+    db.close()
+    os.replace(temp_path, path)
+
+
+def _built_from(path: str, signature: tuple) -> bool:
+    """Whether the SQLite file at 'path' was built from the workbook version with this signature."""
+    if not os.path.exists(path):
+        return False
+    try:
+        db = sqlite3.connect(Path(path).resolve().as_uri() + "?mode=ro", uri=True)
+        try:
+            meta = {key: json.loads(value) for key, value in db.execute("SELECT key, value FROM meta")}
+        finally:
+            db.close()
+    except (sqlite3.Error, ValueError) as e:
+        print(f"Ignoring unreadable database {path}: {e}")
+        return False
+    return meta.get("format") == SQLITE_FORMAT and tuple(meta.get("source_signature", ())) == tuple(signature)
+
+
+def open_workbook(excel_file: str, signature: tuple, path: str = None) -> "SqliteWorkbook":
+    """The SQLite copy of 'excel_file', ingesting it first unless it is up to date."""
+    path = path or sqlite_path(excel_file)
+    if not _built_from(path, signature):
+        with build_lock(path):
+            # Another process may have ingested it while we waited for the lock
+            if not _built_from(path, signature):
+                ingest_workbook(excel_file, signature, path)
+    return SqliteWorkbook(path)
+
+
+class SqliteWorkbook:
+    """
+    One read-only SQLite copy of the workbook. Each thread gets its own connection
+    (opened lazily, and again after a fork), so the file can be shared by every worker.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._uri = Path(path).resolve().as_uri() + "?mode=ro"
+        self._local = threading.local()
+
+    def db(self) -> sqlite3.Connection:
+        local = self._local
+        if getattr(local, "pid", None) != os.getpid():
+            local.connection = sqlite3.connect(self._uri, uri=True, check_same_thread=False)
+            local.pid = os.getpid()
+        return local.connection
+
+    def execute(self, sql: str, params=()) -> sqlite3.Cursor:
+        return self.db().execute(sql, params)
+
+    def default_active_node(self):
+        row = self.execute(
+            "SELECT n.name FROM edges e JOIN names n ON n.id = e.CI_Name ORDER BY e.row LIMIT 1"
+        ).fetchone()
+        return row[0] if row else None
+
+    def asset_types(self) -> pd.DataFrame:
+        """
+        Every CI / dependency name with its type, in order of first appearance
+        (row by row, CI side first), as get_grouped_assets() needs them: the type is the
+        first one listed for the name that is not empty or "Unknown", else "Unknown".
+        """
+        rows = self.execute("""
+            WITH occurrences AS (
+                SELECT CI_Name AS name, CI_Type AS type, row * 2 AS position FROM edges
+                UNION ALL
+                SELECT Dependency_Name, Dependency_Type, row * 2 + 1 FROM edges
+            ),
+            first_seen AS (
+                SELECT name, MIN(position) AS position FROM occurrences GROUP BY name
+            ),
+            known AS (
+                -- SQLite takes the bare 'type' from the row holding MIN(position)
+                SELECT name, type, MIN(position) FROM occurrences
+                WHERE type IS NOT NULL AND type != (SELECT id FROM names WHERE name = 'Unknown')
+                GROUP BY name
+            )
+            SELECT n.name, t.name
+            FROM first_seen f
+            JOIN names n ON n.id = f.name
+            LEFT JOIN known k ON k.name = f.name
+            LEFT JOIN names t ON t.id = k.type
+            ORDER BY f.position
+        """).fetchall()
+        assets = pd.DataFrame(rows, columns=['name', 'type'], dtype=object)
+        assets['type'] = assets['type'].fillna('Unknown')
+        return assets
+
+    def dependency_rows(self) -> pd.DataFrame:
+        """
+        Dependency_Type, Dependency_Name and Dependency_Descrip of the first row naming each
+        dependency, in row order: enough rows for get_all_dependencies() to pick the first
+        one per name compared case-insensitively, without reading every row into memory.
+        """
+        rows = self.execute("""
+            SELECT t.name, n.name, d.label, MIN(e.row)
+            FROM edges e
+            JOIN names n ON n.id = e.Dependency_Name
+            LEFT JOIN names t ON t.id = e.Dependency_Type
+            LEFT JOIN labels d ON d.id = e.Dependency_Descrip
+            GROUP BY e.Dependency_Name
+            ORDER BY 4
+        """).fetchall()
+        return pd.DataFrame(
+            [row[:3] for row in rows], columns=['Dependency_Type', 'Dependency_Name', 'Dependency_Descrip']
+        ).infer_objects()
+
+
+class _LookupTable:
+    """
+    Id <-> value lookups against the 'names' or 'labels' table, with the interface of
+    graph_index.InternTable (table[id], id_of(value), len(table)).
+    """
+
+    def __init__(self, workbook: SqliteWorkbook, table: str, column: str, missing=None):
+        self._workbook = workbook
+        self._table, self._column = table, column
+        self._missing = missing
+        self._length = workbook.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        self._value = functools.lru_cache(LOOKUP_CACHE_SIZE)(self._lookup_value)
+        self._id = functools.lru_cache(LOOKUP_CACHE_SIZE)(self._lookup_id)
+
+    def _lookup_value(self, value_id: int):
+        if value_id == MISSING:
+            return self._missing
+        row = self._workbook.execute(
+            f"SELECT {self._column} FROM {self._table} WHERE id = ?", (value_id,)
+        ).fetchone()
+        if row is None:
+            raise IndexError(value_id)
+        return row[0]
+
+    def _lookup_id(self, value) -> int | None:
+        try:
+            row = self._workbook.execute(
+                f"SELECT id FROM {self._table} WHERE {self._column} IS ? ORDER BY id LIMIT 1", (value,)
+            ).fetchone()
+        except sqlite3.Error:  # values SQLite cannot bind are never stored
+            return None
+        return row[0] if row else None
+
+    def id_of(self, value) -> int | None:
+        try:
+            return self._id(value)
+        except TypeError:  # unhashable values are never stored
+            return None
+
+    def __getitem__(self, value_id: int):
+        return self._value(value_id)
+
+    def __len__(self) -> int:
+        return self._length
+
+
+def _id_list(node_ids) -> str:
+    # Many ids go to SQLite as one JSON array parameter, read back with json_each()
+    return json.dumps(np.asarray(node_ids).tolist())
+
+
+class SqliteGraphIndex:
+    """
+    GraphIndex over a SqliteWorkbook: every neighbour, type-member and attribute lookup is
+    an indexed query, so only what traversals actually touch is ever loaded (and memoized).
+    Groups and members come back in the same order as from GraphIndex, so views are identical.
+    """
+
+    def __init__(self, workbook: SqliteWorkbook):
+        self.workbook = workbook
+        execute = workbook.execute
+        self.names = _LookupTable(workbook, "names", "name")
+        # A missing Rel_Type reads as NaN, like the empty cell in the DataFrame
+        self.labels = _LookupTable(workbook, "labels", "label", missing=float("nan"))
+        self.all_types = {name for name, in execute("SELECT name FROM names WHERE is_type")}
+        self._type_ids = {type_id for type_id, in execute("SELECT id FROM names WHERE is_type")}
+        self._unknown = self.names.id_of("Unknown")
+        self._no_description = self.labels.id_of(NO_DESCRIPTION)
+
+        self.node_type = functools.lru_cache(LOOKUP_CACHE_SIZE)(self._node_type)
+        self.indirect_relationships = functools.lru_cache(LOOKUP_CACHE_SIZE)(self._indirect_relationships)
+
+    def _groups(self, sql: str, params: tuple, edge_filter=None) -> list:
+        rows = self.workbook.execute(sql, params).fetchall()
+        if not rows:
+            return []
+        columns = (np.array(column, dtype=np.int32) for column in zip(*rows))
+        return group_members(self.names, self.labels, *columns, edge_filter)
+
+    def _side_groups(self, key_column: str, side: str, key_id: int, edge_filter=None) -> list:
+        """Rows whose 'key_column' is 'key_id', as members on the 'side' ("CI" / "Dependency") grouped by their type."""
+        return self._groups(f"""
+            SELECT COALESCE(e.{side}_Type, :unknown), e.{side}_Name,
+                   COALESCE(e.{side}_Descrip, :no_description), COALESCE(e.Rel_Type, {MISSING})
+            FROM edges e JOIN names g ON g.id = COALESCE(e.{side}_Type, :unknown)
+            WHERE e.{key_column} = :key
+            ORDER BY g.name, e.row
+        """, {"unknown": self._unknown, "no_description": self._no_description, "key": key_id}, edge_filter)
+
+    # ---------------------------------------
+    # Names <-> ids
+    # ---------------------------------------
+    def node_id(self, name) -> int | None:
+        return self.names.id_of(name)
+
+    def name(self, node_id: int):
+        return self.names[node_id]
+
+    def is_type_node(self, node_id: int) -> bool:
+        return node_id in self._type_ids
+
+    def searchable_ids(self) -> np.ndarray:
+        ids = [node_id for node_id, in self.workbook.execute("SELECT id FROM names WHERE is_node OR is_type ORDER BY id")]
+        return np.array(ids, dtype=np.int64)
+
+    def hub_ids(self, limit: int) -> list:
+        rows = self.workbook.execute("""
+            SELECT id FROM (
+                SELECT CI_Name AS id, COUNT(*) AS edges FROM edges GROUP BY CI_Name
+                UNION ALL SELECT Dependency_Name, COUNT(*) FROM edges GROUP BY Dependency_Name
+                UNION ALL SELECT CI_Type, COUNT(*) FROM edges WHERE CI_Type IS NOT NULL GROUP BY CI_Type
+                UNION ALL SELECT Dependency_Type, COUNT(*) FROM edges WHERE Dependency_Type IS NOT NULL GROUP BY Dependency_Type
+            )
+            GROUP BY id ORDER BY SUM(edges) DESC, id LIMIT ?
+        """, (limit,))
+        return [node_id for node_id, in rows]
+
+    # ---------------------------------------
+    # Grouped neighbours
+    # ---------------------------------------
+    def parents_of(self, node_id: int, edge_filter=None) -> list:
+        return self._side_groups("Dependency_Name", "CI", node_id, edge_filter)
+
+    def children_of(self, node_id: int, edge_filter=None) -> list:
+        return self._side_groups("CI_Name", "Dependency", node_id, edge_filter)
+
+    def parents_of_type(self, type_id: int, edge_filter=None) -> list:
+        return self._side_groups("Dependency_Type", "CI", type_id, edge_filter)
+
+    def members_of_type(self, type_id: int, edge_filter=None) -> list:
+        # Rows listing it as CI_Type (by their CI side), then rows listing it as Dependency_Type
+        # (by their CI side if that has the same type, else their dependency side)
+        return self._groups(f"""
+            SELECT 0, member, COALESCE(description, :no_description), COALESCE(Rel_Type, {MISSING}) FROM (
+                SELECT CI_Name AS member, CI_Descrip AS description, Rel_Type, 0 AS part, row
+                FROM edges WHERE CI_Type = :type
+                UNION ALL
+                SELECT CASE WHEN CI_Type = Dependency_Type THEN CI_Name ELSE Dependency_Name END,
+                       CASE WHEN CI_Type = Dependency_Type THEN CI_Descrip ELSE Dependency_Descrip END,
+                       Rel_Type, 1, row
+                FROM edges WHERE Dependency_Type = :type
+            )
+            ORDER BY part, row
+        """, {"no_description": self._no_description, "type": type_id},
+            edge_filter and edge_filter.by_relationship)
+
+    # ---------------------------------------
+    # Per-node attributes
+    # ---------------------------------------
+    def _first_row(self, side: str, node_id: int) -> tuple | None:
+        """(type id or None, description id, relationship id) of the first row naming the node on 'side'."""
+        return self.workbook.execute(f"""
+            SELECT {side}_Type, COALESCE({side}_Descrip, ?), COALESCE(Rel_Type, {MISSING})
+            FROM edges WHERE {side}_Name = ? ORDER BY row LIMIT 1
+        """, (self._no_description, node_id)).fetchone()
+
+    def _node_type(self, node_id: int) -> str:
+        for side in ("CI", "Dependency"):
+            row = self._first_row(side, node_id)
+            if row is not None and row[0] is not None:
+                return str(self.names[row[0]])
+        return str(self.names[node_id if self.is_type_node(node_id) else self._unknown])
+
+    def node_attributes_of(self, name) -> tuple | None:
+        node_id = self.node_id(name)
+        if node_id is None:
+            return None
+        row = self._first_row("CI", node_id) or self._first_row("Dependency", node_id)
+        if row is None:
+            return None
+        type_id, desc_id, rel_id = row
+        node_type = self.names[type_id] if type_id is not None else name
+        return node_type, self.labels[desc_id], self.labels[rel_id]
+
+    def _parent_ids(self, node_id: int) -> list:
+        return [parent_id for parent_id, in self.workbook.execute(
+            "SELECT CI_Name FROM edges WHERE Dependency_Name = ? ORDER BY row", (node_id,)
+        )]
+
+    def parent_names(self, node_id: int) -> list:
+        return [self.names[parent_id] for parent_id in self._parent_ids(node_id)]
+
+    def _indirect_relationships(self, node_id: int) -> list | None:
+        parent_ids = self._parent_ids(node_id)
+        if len(parent_ids) < 2:
+            return None
+        return [
+            {"name": self.names[related_id], "type": self.node_type(related_id)}
+            for related_id in parent_ids if related_id != node_id
+        ] or None
+
+    # ---------------------------------------
+    # Bulk neighbourhoods
+    # ---------------------------------------
+    def _ids(self, sql: str, params: tuple) -> np.ndarray:
+        ids = np.array([value for row in self.workbook.execute(sql, params) for value in row if value is not None],
+                       dtype=np.int64)
+        return np.unique(ids)
+
+    def related_ids(self, node_ids: np.ndarray) -> np.ndarray:
+        ids = _id_list(node_ids)
+        return self._ids("""
+            SELECT Dependency_Name, CI_Type, Dependency_Type FROM edges WHERE CI_Name IN (SELECT value FROM json_each(?))
+            UNION ALL
+            SELECT CI_Name, CI_Type, Dependency_Type FROM edges WHERE Dependency_Name IN (SELECT value FROM json_each(?))
+        """, (ids, ids))
+
+    def neighbor_ids(self, node_ids: np.ndarray) -> np.ndarray:
+        ids = _id_list(node_ids)
+        return self._ids("""
+            SELECT Dependency_Name FROM edges WHERE CI_Name IN (SELECT value FROM json_each(?))
+            UNION ALL
+            SELECT CI_Name FROM edges WHERE Dependency_Name IN (SELECT value FROM json_each(?))
+        """, (ids, ids))
+
+    def member_ids_of_type(self, type_id: int) -> np.ndarray:
+        groups = self.members_of_type(type_id)
+        return np.unique(groups[0][2]) if groups else np.empty(0, dtype=np.int32)
+
+    def edge_between(self, node_id: int, other_id: int) -> tuple | None:
+        for (key, other), direction in ((("CI_Name", "Dependency_Name"), "downstream"),
+                                        (("Dependency_Name", "CI_Name"), "upstream")):
+            row = self.workbook.execute(
+                f"SELECT COALESCE(Rel_Type, {MISSING}) FROM edges WHERE {key} = ? AND {other} = ? ORDER BY row LIMIT 1",
+                (node_id, other_id)
+            ).fetchone()
+            if row is not None:
+                return self.labels[row[0]], direction
+        return None
+
+    def reachable(self, node_id: int, downstream: bool = True, upstream: bool = False,
+                  max_hops: int = None, rel_types: list = None) -> tuple:
+        sides = ([("CI_Name", "Dependency_Name")] if downstream else []) + \
+                ([("Dependency_Name", "CI_Name")] if upstream else [])
+        rel_filter, rel_ids = "", None
+        if rel_types is not None:
+            rel_filter = " AND Rel_Type IN (SELECT value FROM json_each(?))"
+            rel_ids = json.dumps([rel_id for rel_id in map(self.labels.id_of, rel_types) if rel_id is not None])
+
+        hops = np.full(len(self.names), -1, dtype=np.int32)
+        hops[node_id] = 0
+        frontier = np.array([node_id], dtype=np.int64)
+        hop = 0
+        while len(frontier) and sides and (max_hops is None or hop < max_hops):
+            hop += 1
+            ids = _id_list(frontier)
+            queries = [f"SELECT {other} FROM edges WHERE {key} IN (SELECT value FROM json_each(?)){rel_filter}"
+                       for key, other in sides]
+            params = [ids, rel_ids] if rel_ids is not None else [ids]
+            reached = self._ids(" UNION ALL ".join(queries), tuple(params * len(sides)))
+            frontier = reached[hops[reached] == -1]
+            hops[frontier] = hop
+
+        found = np.flatnonzero(hops > 0)
+        return found, hops[found]
+
+
+def build_database(excel_file: str) -> str:
+    """Ingest 'excel_file' into its SQLite file (see sqlite_path()) and return the file's path."""
+    stat = os.stat(excel_file)
+    path = sqlite_path(excel_file)
+    with build_lock(path):
+        ingest_workbook(excel_file, (stat.st_mtime_ns, stat.st_size), path)
+    return path
+
+
+if __name__ == "__main__":
+    from graph_store import DEFAULT_EXCEL_FILE
+    workbook = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_EXCEL_FILE
+    print(f"Wrote {build_database(workbook)}")
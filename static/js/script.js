@@ -47,31 +47,33 @@ $(document).ready(function() {
     const onHomeButton = document.getElementById('homeButton');
     const onRefreshButton = document.getElementById('refreshButton');
 
+    // Budget the server sets for every view (VIEW_MAX_NODES / VIEW_GROUP_LIMIT); empty means unbounded
+    const graphContainer = document.querySelector('.graph-container');
+    const maxNodes = graphContainer.dataset.maxNodes;
+    const groupLimit = graphContainer.dataset.groupLimit;
+    // Groups cut short by the budget get their next page from /group-children, this many per click
+    const loadMoreGroups = 10;
+    const loadMore = document.querySelector('.load-more');
+    const loadMoreText = document.getElementById('loadMoreText');
+    const loadMoreButton = document.getElementById('loadMoreButton');
+
     const dropdown = document.createElement('div');
     dropdown.className = 'search-menu';
     searchInput.parentNode.appendChild(dropdown);
 
-    let allNodes = []; // Holds all node names and group types
     // -----------------------------------------------------
-    // Fetch all assets for autocomplete from /all-assets
+    // Server-side search: /search returns the best matching names
     // -----------------------------------------------------
-    function fetchAllAssetsForAutocomplete() {
-        fetch('/all-assets', { headers: { 'Accept': 'application/json' } })
-            .then(response => response.json())
-            .then(grouped => {
-                let assetNames = [];
-                for (const type in grouped) {
-                    if (grouped.hasOwnProperty(type)) {
-                        assetNames = assetNames.concat(grouped[type]);
-                    }
+    function fetchSearchMatches(query, limit, signal) {
+        const url = `/search?q=${encodeURIComponent(query)}&limit=${limit}`;
+        return fetch(url, { headers: { 'Accept': 'application/json' }, signal: signal })
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error(`HTTP error! Status: ${response.status}`);
                 }
-                // Merge the fetched asset names with any names already in allNodes
-                allNodes = [...new Set([...allNodes, ...assetNames])];
-            })
-            .catch(err => console.error('Error fetching all assets for auto complete:', err));
+                return response.json();
+            });
     }
-    // Call it once on page load
-    fetchAllAssetsForAutocomplete();
 
     // -----------------------------------------------------
     // Left/Right Pane Toggle
@@ -273,42 +275,29 @@ $(document).ready(function() {
         }, 3000);
     }
 
-    function populateNodeList(data) {
-        function traverse(node) {
-            if (typeof node.name === 'string') {
-                allNodes.push(node.name);
-            }
-            if (typeof node.groupType === 'string') {
-                allNodes.push(node.groupType);
-            }
-            if (node.children) {
-                node.children.forEach(traverse);
-            }
-        }
-        traverse(data);
-        allNodes = [...new Set(allNodes)]; // Remove duplicates
-    }
-
     function searchNode() {
-        var input = searchInput.value.trim().toLowerCase();
+        var input = searchInput.value.trim();
         var dropdown = document.getElementById('autocompleteSuggestions');
     
-        if (input) {
-            var matchingNode = allNodes.find(node =>
-                typeof node === 'string' && node.toLowerCase() === input
-            );
-            if (matchingNode) {
-                fetchAndRenderGraph(depthSlider.value, matchingNode);
-                searchInput.value = '';  // Clear input after search
-                clearButton.style.display = 'none'; // Hide clear button
-                dropdown.style.display = 'none'; // Hide dropdown
-                dropdown.innerHTML = ''; // Clear dropdown content
-            } else {
-                showInvalidSearchMessage(searchInput.value);
-            }
-        } else {
-            showInvalidSearchMessage(searchInput.value);
+        if (!input) {
+            showInvalidSearchMessage(input);
+            return;
         }
+        // Only an exact (case-insensitive) name match opens a node
+        fetchSearchMatches(input, 1)
+            .then(matches => {
+                var matchingNode = matches.length && matches[0].match === 'exact' ? matches[0].name : null;
+                if (matchingNode) {
+                    fetchAndRenderGraph(depthSlider.value, matchingNode);
+                    searchInput.value = '';  // Clear input after search
+                    clearButton.style.display = 'none'; // Hide clear button
+                    dropdown.style.display = 'none'; // Hide dropdown
+                    dropdown.innerHTML = ''; // Clear dropdown content
+                } else {
+                    showInvalidSearchMessage(input);
+                }
+            })
+            .catch(err => console.error('Error searching for node:', err));
     }    
 
     function limitToFiveItems(containerSelector) {
@@ -352,20 +341,11 @@ $(document).ready(function() {
     // -----------------------------------------------------
     // Autocomplete
     // -----------------------------------------------------
-    searchInput.addEventListener('input', () => {
-        var input = searchInput.value.toLowerCase();
-        var dropdown = document.getElementById('autocompleteSuggestions');
-        dropdown.innerHTML = '';
-
-        if (!input) {
-            dropdown.style.display = 'none';
-            return;
-        }
-
-        var matches = allNodes.filter(item =>
-            typeof item === 'string' && item.toLowerCase().includes(input)
-        );
+    let autocompleteTimer = null;
+    let autocompleteRequest = null; // AbortController of the /search call in flight
 
+    function showSuggestions(dropdown, matches) {
+        dropdown.innerHTML = '';
         if (matches.length === 0) {
             var noMatch = document.createElement('div');
             noMatch.className = 'autocomplete-suggestions';
@@ -375,9 +355,10 @@ $(document).ready(function() {
             matches.forEach(match => {
                 var item = document.createElement('div');
                 item.className = 'autocomplete-suggestions';
-                item.textContent = match;
+                item.textContent = match.name;
+                item.title = match.type;
                 item.addEventListener('click', () => {
-                    searchInput.value = match;
+                    searchInput.value = match.name;
                     searchNode();
                     dropdown.innerHTML = '';
                     dropdown.style.border = 'none';
@@ -386,6 +367,33 @@ $(document).ready(function() {
             });
         }
         dropdown.style.display = 'block';
+    }
+
+    searchInput.addEventListener('input', () => {
+        var input = searchInput.value.trim();
+        var dropdown = document.getElementById('autocompleteSuggestions');
+        clearTimeout(autocompleteTimer);
+
+        if (!input) {
+            dropdown.innerHTML = '';
+            dropdown.style.display = 'none';
+            return;
+        }
+
+        // Wait for a pause in typing, and drop the answer to an older query
+        autocompleteTimer = setTimeout(() => {
+            if (autocompleteRequest) {
+                autocompleteRequest.abort();
+            }
+            autocompleteRequest = new AbortController();
+            fetchSearchMatches(input, 20, autocompleteRequest.signal)
+                .then(matches => showSuggestions(dropdown, matches))
+                .catch(err => {
+                    if (err.name !== 'AbortError') {
+                        console.error('Error fetching search suggestions:', err);
+                    }
+                });
+        }, 150);
     });
 
     // -----------------------------------------------------
@@ -594,8 +602,36 @@ $(document).ready(function() {
     // -----------------------------------------------------
     // Fetch & Render
     // -----------------------------------------------------
+    // Last hierarchy fetched, as sent by the server (before any of the display tweaks below),
+    // so a deeper view of the same node only needs the levels it adds
+    let lastView = null;
+
     function fetchAndRenderGraph(depth = depthSlider.value, activeNodeParam = searchInput.value.trim()) {
+        depth = Number(depth);
         var url = `/?depth=${depth}&activeNode=${encodeURIComponent(activeNodeParam)}`;
+        // Let the server skip the groups switched off instead of sending and then hiding them
+        var filterParams = '';
+        Object.keys(visibleGroups).forEach(group => {
+            if (!visibleGroups[group]) {
+                filterParams += `&excludeNodeType=${encodeURIComponent(group)}`;
+            }
+        });
+        url += filterParams;
+        if (maxNodes) {
+            url += `&maxNodes=${maxNodes}`;
+        }
+        if (groupLimit) {
+            url += `&groupLimit=${groupLimit}`;
+        }
+
+        // Deeper view of the node on screen: fetch only the new levels
+        var base = null;
+        if (lastView && lastView.activeNode === activeNodeParam && lastView.filterParams === filterParams &&
+            lastView.depth >= 1 && depth > lastView.depth) {
+            base = lastView;
+            url += `&fromDepth=${base.depth}`;
+        }
+
         fetch(url, { headers: { 'Accept': 'application/json' } })
             .then(response => {
                 if (!response.ok) {
@@ -604,32 +640,149 @@ $(document).ready(function() {
                 return response.json();
             })
             .then(data => {
-                if (!rootNode) {
-                    rootNode = data;
+                if (base && data.expansions) {
+                    data = applyHierarchyDelta(structuredClone(base.data), data);
                 }
-                graphData = data;
+                lastView = { activeNode: activeNodeParam, depth: depth, filterParams: filterParams, data: structuredClone(data) };
+                displayGraph(data);
+            })
+            .catch(error => {
+                console.error('Error fetching graph data:', error);
+            });
+    }
 
-                const hasIndirectRelationships = containsIndirectRelationships(data);
-                const indirectSwitch = document.querySelector('.indirectRelationshipSwitch');
-                if (hasIndirectRelationships) {
-                    indirectSwitch.style.display = 'block';
-                } else {
-                    indirectSwitch.style.display = 'none';
-                }
+    function displayGraph(data) {
+        if (!rootNode) {
+            rootNode = data;
+        }
+        graphData = data;
+
+        const hasIndirectRelationships = containsIndirectRelationships(data);
+        const indirectSwitch = document.querySelector('.indirectRelationshipSwitch');
+        if (hasIndirectRelationships) {
+            indirectSwitch.style.display = 'block';
+        } else {
+            indirectSwitch.style.display = 'none';
+        }
+
+        getAllChildren(data);
+        showGroupToggles();
+
+        updateLoadMore(data);
+        mergeSameGroupNodes(data);
+        initializeGroupToggles(data);
+        renderGraph(data);
+    }
+
+    // Groups of the view (as sent by the server) that the budget cut short
+    function groupsWithMore(node, groups = []) {
+        if (node.more) {
+            groups.push(node);
+        }
+        (node.children || []).forEach(child => groupsWithMore(child, groups));
+        return groups;
+    }
 
-                getAllChildren(data);
-                showGroupToggles();
+    function updateLoadMore(data) {
+        var hasMore = groupsWithMore(data).length > 0;
+        if (!hasMore && !data.truncated) {
+            loadMore.style.display = 'none';
+            return;
+        }
+        loadMoreText.textContent = data.truncated
+            ? `Showing the first ${data.totalNodesDisplayed} nodes`
+            : `Showing ${data.totalNodesDisplayed} nodes`;
+        loadMoreButton.style.display = hasMore ? '' : 'none';
+        loadMore.style.display = 'flex';
+    }
 
-                mergeSameGroupNodes(data);
-                populateNodeList(data);
-                initializeGroupToggles(data);
-                renderGraph(data);
+    // Next page of the first groups cut short, added to the view on screen
+    function loadMoreChildren() {
+        var view = lastView;
+        if (!view) return;
+        var shown = new Set();
+        (function collect(node) {
+            if (node.name !== undefined && !node.groupType) {
+                shown.add(node.name);
+            }
+            (node.children || []).forEach(collect);
+        })(view.data);
+
+        loadMoreButton.disabled = true;
+        var pages = groupsWithMore(view.data).slice(0, loadMoreGroups).map(group =>
+            fetch(`/group-children?cursor=${encodeURIComponent(group.more)}`)
+                .then(response => {
+                    if (!response.ok) {
+                        const error = new Error(`HTTP error! Status: ${response.status}`);
+                        error.status = response.status;
+                        throw error;
+                    }
+                    return response.json();
+                })
+                .then(page => ({ group: group, page: page }))
+        );
+        Promise.all(pages)
+            .then(results => {
+                // Another view replaced this one meanwhile
+                if (view !== lastView) return;
+                results.forEach(({ group, page }) => {
+                    // A page never repeats the view's own nodes, but two groups can share members
+                    page.children.forEach(child => {
+                        if (!shown.has(child.name)) {
+                            shown.add(child.name);
+                            group.children.push(child);
+                            view.data.totalNodesDisplayed += 1;
+                        }
+                    });
+                    if (page.more) {
+                        group.more = page.more;
+                    } else {
+                        delete group.more;
+                    }
+                });
+                displayGraph(structuredClone(view.data));
             })
             .catch(error => {
-                console.error('Error fetching graph data:', error);
+                console.error('Error loading more children:', error);
+                // The data changed since the view was fetched: fetch it again
+                if (error.status === 410 && view === lastView) {
+                    lastView = null;
+                    fetchAndRenderGraph(view.depth, view.activeNode);
+                }
+            })
+            .finally(() => {
+                loadMoreButton.disabled = false;
             });
     }
 
+    loadMoreButton.addEventListener('click', loadMoreChildren);
+
+    function applyHierarchyDelta(data, delta) {
+        // Some deeper views are not a continuation of the shallower one: then the whole view is sent
+        if (delta.hierarchy) {
+            return delta.hierarchy;
+        }
+        // Attach the new groups under the leaves they hang off (every node name appears once)
+        var leaves = {};
+        (function collect(node) {
+            if (node.name !== undefined && !node.groupType && !(node.name in leaves)) {
+                leaves[node.name] = node;
+            }
+            (node.children || []).forEach(collect);
+        })(data);
+        delta.expansions.forEach(expansion => {
+            var leaf = leaves[expansion.name];
+            if (leaf) {
+                leaf.children = expansion.children;
+            }
+        });
+        data.totalNodesDisplayed = delta.totalNodesDisplayed;
+        if (delta.truncated) {
+            data.truncated = true;
+        }
+        return data;
+    }
+
     function getAllChildren(data) {
         if (data.children) {
             data.children.forEach(child => {
@@ -653,6 +806,12 @@ $(document).ready(function() {
 
     function initializeGroupToggles(data) {
         allGroups = Array.from(getUniqueGroups(data));
+        // Groups switched off are no longer in the data, but keep their toggles
+        Object.keys(visibleGroups).forEach(group => {
+            if (!visibleGroups[group] && !allGroups.includes(group)) {
+                allGroups.push(group);
+            }
+        });
         allGroups.sort((a, b) => a.localeCompare(b));
         if (Object.keys(visibleGroups).length === 0) {
             allGroups.forEach(group => {
@@ -0,0 +1,127 @@
+"""
+Bounded pool for CPU-heavy hierarchy traversals.
+
+Only a few traversals run at once per worker process, and only a few more may wait
+for a slot. Anything beyond that is refused straight away (PoolBusyError, sent to the
+client as 503 + Retry-After). Deep queries therefore queue against each other instead
+of tying up every request thread, and cheap requests such as /all-assets or cached
+views keep being served.
+"""
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class PoolBusyError(RuntimeError):
+    """Every traversal slot is taken and the wait queue is full."""
+
+
+class TraversalPool:
+    def __init__(self, max_workers: int = 2, max_queue: int = 8, queue_timeout: float = 5.0):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        # Running plus waiting calls; acquiring a slot is the admission check
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._pid = None
+        # Calls refused with PoolBusyError, counted from any request thread
+        self.rejected = 0
+        self._rejected_lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Threads do not survive fork(): start them lazily, in the process that uses them
+        with self._executor_lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="traversal")
+                self._pid = os.getpid()
+            return self._executor
+
+    def _acquire(self):
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            with self._rejected_lock:
+                self.rejected += 1
+            raise PoolBusyError("Too many hierarchy requests in progress, try again shortly.")
+
+    def _submit(self, fn, *args, **kwargs):
+        # Run in a copy of the caller's context, so its request timers keep counting
+        return self._get_executor().submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        Queue fn(*args, **kwargs) on a pool thread and return its Future.
+        Raises PoolBusyError if no slot frees up within queue_timeout seconds.
+        """
+        self._acquire()
+        try:
+            future = self._submit(fn, *args, **kwargs)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def run(self, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) on a pool thread and return its result (see submit())."""
+        return self.submit(fn, *args, **kwargs).result()
+
+    def reserve(self) -> "Reservation":
+        """
+        Take a slot now for a traversal that runs later, e.g. while a streamed response is
+        being sent: a full pool is then still refused with PoolBusyError before the response
+        starts. See Reservation.
+        """
+        self._acquire()
+        return Reservation(self)
+
+    def run_all(self, calls: list) -> list:
+        """
+        Run every (fn, args, kwargs) in 'calls' on the pool, as many at once as there are
+        free slots, and return their results in order.
+        """
+        futures = []
+        try:
+            for fn, args, kwargs in calls:
+                futures.append(self.submit(fn, *args, **kwargs))
+        except PoolBusyError:
+            for future in futures:
+                future.cancel()
+            raise
+        return [future.result() for future in futures]
+
+
+class Reservation:
+    """
+    A slot taken with TraversalPool.reserve(). run() uses it for one traversal and gives it
+    back when the traversal is done; release() gives it back unused (safe to call again).
+    """
+
+    def __init__(self, pool: TraversalPool):
+        self._pool = pool
+        self._lock = threading.Lock()
+        self._held = True
+
+    def run(self, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) on a pool thread under this slot and return its result."""
+        try:
+            return self._pool._submit(fn, *args, **kwargs).result()
+        finally:
+            self.release()
+
+    def release(self):
+        with self._lock:
+            if not self._held:
+                return
+            self._held = False
+        self._pool._slots.release()
+
+
+def traversal_pool_from_env() -> TraversalPool:
+    """Pool sized by TRAVERSAL_WORKERS, TRAVERSAL_QUEUE and TRAVERSAL_QUEUE_TIMEOUT (seconds)."""
+    return TraversalPool(
+        max_workers=int(os.getenv("TRAVERSAL_WORKERS", 2)),
+        max_queue=int(os.getenv("TRAVERSAL_QUEUE", 8)),
+        queue_timeout=float(os.getenv("TRAVERSAL_QUEUE_TIMEOUT", 5)),
+    )
@@ -0,0 +1,109 @@
+"""
+Hierarchy cache warm-up after every data load.
+
+The views that are both the most requested and the most expensive to build (the
+landing page, big hubs such as "OIT", type nodes such as "Applications") would
+otherwise be built by whichever user asks for them first after a (re)load. The warm-up
+builds them ahead of time: the default active node, then the nodes requested most
+often so far, then the nodes with the most edges, WARMUP_NODES of them in all, at each
+of WARMUP_DEPTHS (default 2 and 3).
+
+Views that are still cached (e.g. carried over from the previous version) cost nothing
+to "rebuild", and a warm-up stops as soon as a newer load has started its own.
+"""
+import os
+import threading
+import time
+from collections import Counter
+
+
+class RequestCounter:
+    """
+    How often each active node has been requested. Counts are halved whenever more than
+    'max_entries' names are tracked, so rarely requested names drop out and recent
+    traffic outweighs old traffic.
+    """
+
+    def __init__(self, max_entries: int = 10_000):
+        self.max_entries = max_entries
+        self._counts = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, name):
+        with self._lock:
+            self._counts[name] += 1
+            if len(self._counts) > self.max_entries:
+                self._counts = Counter({key: value // 2 for key, value in self._counts.items() if value > 1})
+
+    def most_common(self, n: int) -> list:
+        with self._lock:
+            return [name for name, _ in self._counts.most_common(n)]
+
+
+def warm_up_nodes(snapshot, counter: RequestCounter, limit: int) -> list:
+    """
+    Up to 'limit' node names of 'snapshot' to warm, most important first: the default
+    active node, the most requested nodes it contains, then the ones with the most edges.
+    """
+    index = snapshot.index
+    nodes = [snapshot.active_node] if snapshot.active_node is not None else []
+    requested = [name for name in counter.most_common(limit) if index.node_id(name) is not None]
+    hubs = [index.name(node_id) for node_id in index.hub_ids(limit)]
+    for name in requested + hubs:
+        if len(nodes) >= limit:
+            break
+        if name not in nodes:
+            nodes.append(name)
+    return nodes
+
+
+class HierarchyWarmer:
+    """
+    Calls 'build(snapshot, node, depth)' (which caches the view) for the warm-up nodes of a
+    snapshot at each of 'depths'. warm() does so right away, start() on a background thread.
+    """
+
+    def __init__(self, build, counter: RequestCounter, limit: int = 8, depths: tuple = (2, 3)):
+        self.build = build
+        self.counter = counter
+        self.limit = limit
+        self.depths = depths
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def start(self, snapshot):
+        """Warm 'snapshot' on a daemon thread, superseding any warm-up still running."""
+        if self.limit <= 0:
+            return
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+        threading.Thread(
+            target=self.warm, args=(snapshot, generation), name="hierarchy-warmup", daemon=True
+        ).start()
+
+    def warm(self, snapshot, generation: int = None) -> int:
+        """Build the warm-up views of 'snapshot' and return how many were built."""
+        if self.limit <= 0:
+            return 0
+        started = time.perf_counter()
+        built = 0
+        for node in warm_up_nodes(snapshot, self.counter, self.limit):
+            for depth in self.depths:
+                if generation is not None and generation != self._generation:
+                    return built
+                try:
+                    self.build(snapshot, node, depth)
+                except Exception as e:
+                    # e.g. the traversal pool is busy with real requests: they come first
+                    print(f"Warm-up of {node!r} at depth {depth} stopped: {e}")
+                    return built
+                built += 1
+        print(f"Warmed {built} hierarchy views in {(time.perf_counter() - started) * 1000:.0f} ms")
+        return built
+
+
+def hierarchy_warmer_from_env(build, counter: RequestCounter) -> HierarchyWarmer:
+    """Warmer sized by WARMUP_NODES (0 turns it off) and WARMUP_DEPTHS (comma-separated)."""
+    depths = tuple(int(depth) for depth in os.getenv("WARMUP_DEPTHS", "2,3").split(",") if depth.strip())
+    return HierarchyWarmer(build, counter, limit=int(os.getenv("WARMUP_NODES", 8)), depths=depths)
@@ -0,0 +1,123 @@
+"""
+Compact columnar sidecar for the workbook, so starting a worker or reloading
+does not have to go through pandas/openpyxl Excel parsing.
+
+The sidecar (e.g. data/network_diagram.snapshot.npz next to data/network_diagram.xlsx)
+is an uncompressed numpy archive holding:
+    meta     JSON: format version, column names and the source file's (mtime_ns, size)
+    values   JSON array of every distinct cell value (the interned value table)
+    col_<i>  one int32 array per column with indexes into 'values' (-1 = empty cell)
+
+It is written automatically after the workbook is parsed, or ahead of time with:
+    python workbook_snapshot.py [path/to/workbook.xlsx]
+"""
+import json
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+SNAPSHOT_FORMAT = 1
+SNAPSHOT_SUFFIX = '.snapshot.npz'
+
+
+def snapshot_path(excel_file: str) -> str:
+    return os.path.splitext(excel_file)[0] + SNAPSHOT_SUFFIX
+
+
+def _json_bytes(obj) -> np.ndarray:
+    return np.frombuffer(json.dumps(obj).encode('utf-8'), dtype=np.uint8)
+
+
+def _json_value(value):
+    # numpy scalars -> plain Python so they can go through json
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def write_snapshot(data: pd.DataFrame, excel_file: str, signature: tuple) -> bool:
+    """
+    Write the sidecar for 'data', parsed from 'excel_file' whose file signature is
+    (mtime_ns, size). Returns False (and writes nothing) if a cell holds a value that
+    cannot be stored, e.g. a date; the workbook is then simply parsed every time.
+    """
+    values = []
+    value_ids = {}
+    arrays = {}
+    for position, column in enumerate(data.columns):
+        codes, uniques = pd.factorize(data[column])  # empty cells get code -1
+        remap = np.empty(len(uniques) + 1, dtype=np.int32)
+        remap[-1] = -1
+        for unique_position, value in enumerate(uniques.tolist()):
+            value = _json_value(value)
+            if not isinstance(value, (str, int, float, bool)):
+                print(f"Not writing a snapshot for {excel_file}: unsupported cell value {value!r}")
+                return False
+            key = (type(value), value)
+            code = value_ids.get(key)
+            if code is None:
+                code = value_ids[key] = len(values)
+                values.append(value)
+            remap[unique_position] = code
+        arrays[f'col_{position}'] = remap[codes]
+
+    meta = {
+        "format": SNAPSHOT_FORMAT,
+        "columns": [str(column) for column in data.columns],
+        "source_signature": list(signature),
+    }
+    path = snapshot_path(excel_file)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'wb') as f:
+            np.savez(f, meta=_json_bytes(meta), values=_json_bytes(values), **arrays)
+        # Readers only ever see a complete file
+        os.replace(temp_path, path)
+    except OSError as e:
+        print(f"Could not write snapshot {path}: {e}")
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return False
+    return True
+
+
+def read_snapshot(excel_file: str, signature: tuple) -> pd.DataFrame | None:
+    """
+    Load the sidecar for 'excel_file' if it was built from the file with this exact
+    (mtime_ns, size) signature; return None if it is missing, stale or unreadable.
+    """
+    path = snapshot_path(excel_file)
+    if not os.path.exists(path):
+        return None
+    try:
+        with np.load(path, allow_pickle=False) as archive:
+            meta = json.loads(archive['meta'].tobytes())
+            if meta.get("format") != SNAPSHOT_FORMAT or tuple(meta.get("source_signature", ())) != tuple(signature):
+                return None
+            # One trailing NaN so that code -1 maps to an empty cell
+            values = np.array(json.loads(archive['values'].tobytes()) + [np.nan], dtype=object)
+            columns = {
+                column: values[archive[f'col_{position}']]
+                for position, column in enumerate(meta["columns"])
+            }
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Ignoring unreadable snapshot {path}: {e}")
+        return None
+    return pd.DataFrame(columns).infer_objects()
+
+
+def build_snapshot(excel_file: str) -> bool:
+    """Parse 'excel_file' and (re)write its sidecar snapshot."""
+    # Imported here: graph_store itself uses this module when loading
+    from graph_store import read_workbook
+    stat = os.stat(excel_file)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    return write_snapshot(read_workbook(excel_file), excel_file, signature)
+
+
+if __name__ == "__main__":
+    from graph_store import DEFAULT_EXCEL_FILE
+    workbook = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_EXCEL_FILE
+    if build_snapshot(workbook):
+        print(f"Wrote {snapshot_path(workbook)}")
+    else:
+        sys.exit(1)